@@ -0,0 +1,98 @@
+"""Benchmark tag_classifier against the previous one-regex-per-tag code.
+
+Builds long articles from the detail fixtures plus short edge cases, checks
+that both implementations assign the same degreeLevels/fundingTypes, then
+times them.
+
+    python benchmarks/bench_classify.py --repeat 20
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tag_classifier  # noqa: E402
+from html_parsing import make_soup  # noqa: E402
+
+LEGACY_LEVELS = [
+    (r"\b(smp|mts|kelas 7|kelas 8|kelas 9)\b", "SMP"),
+    (r"\b(sma|smk|sederajat|kelas 10|kelas 11|kelas 12)\b", "SMA"),
+    (r"\b(d2|diploma 2)\b", "D2"),
+    (r"\b(d3|diploma 3)\b", "D3"),
+    (r"\b(d4|diploma 4)\b", "D4"),
+    (r"\b(s1|sarjana|undergraduate|bachelor)\b", "S1"),
+    (r"\b(s2|master|postgraduate|magister)\b", "S2"),
+    (r"\b(s3|phd|doctor|doktor)\b", "S3"),
+    (r"\b(non-degree|kursus|pelatihan singkat)\b", "Non-Degree"),
+    (r"\b(gap year)\b", "Gap Year"),
+    (r"\b(profesi|guru|dokter|akuntan)\b", "Profesi"),
+]
+LEGACY_TYPES = [
+    (r"fully funded|fully-funded|full[- ]?scholarship|dibiayai penuh|beasiswa penuh|100%", "Fully Funded"),
+    (r"partially funded|sebagian|potongan biaya|bantuan dana", "Partially Funded"),
+    (r"mentoring|pembinaan|bimbingan", "Mentoring"),
+    (r"riset|penelitian", "Riset"),
+    (r"exchange|pertukaran pelajar", "Exchange"),
+    (r"pelatihan|studi singkat|kursus|program singkat", "Pelatihan/Studi Singkat"),
+    (r"self funded|dana mandiri", "Self Funded"),
+    (r"pendanaan proyek|dana proyek", "Pendanaan Project"),
+    (r"magang|internship", "Internship"),
+]
+
+
+def legacy_classify(txt):
+    level = [tag for pattern, tag in LEGACY_LEVELS if re.search(pattern, txt)] or ["All"]
+    types = [tag for pattern, tag in LEGACY_TYPES if re.search(pattern, txt)] or ["Other"]
+    return level, types
+
+
+def load_texts(repeat):
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "fixtures", "*", "detail-*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            el = make_soup(f.read()).select_one(".entry-content, .post-content, .content")
+        text = (el.get_text(separator="\n", strip=True) if el else "").lower()
+        texts.append("\n".join([text] * repeat))
+    texts += [
+        "beasiswa asmara untuk siswa smasmk",   # keyword inside a word: no SMA
+        "program s2/s3 kelas 12 gap year",       # word boundaries at punctuation
+        "full-scholarship dan magang, 100% dibiayai",
+        "non-degree bootcamp; programnya sebagian online",
+        "",
+    ]
+    return texts
+
+
+def bench(fn, texts, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for txt in texts:
+            fn(txt)
+    return (time.perf_counter() - started) / (rounds * len(texts))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5, help="copies of each article text")
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    texts = load_texts(args.repeat)
+    for txt in texts:
+        old, new = legacy_classify(txt), tag_classifier.classify_text(txt)
+        if old != new:
+            sys.exit(f"Mismatch on {txt[:60]!r}:\n  old {old}\n  new {new}")
+    print(f"{len(texts)} texts, {sum(map(len, texts)) / len(texts) / 1000:.0f} kB on average; tags identical")
+    old = bench(legacy_classify, texts, args.rounds)
+    new = bench(tag_classifier.classify_text, texts, args.rounds)
+    print(f"regex per tag    {old * 1000:8.3f} ms/item")
+    print(f"keyword table    {new * 1000:8.3f} ms/item  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
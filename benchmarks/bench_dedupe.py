@@ -0,0 +1,84 @@
+"""Benchmark near-duplicate detection on a synthetic catalogue.
+
+Builds distinct articles by mixing sentences of the detail fixtures, adds
+syndicated copies (new title, extra intro/outro, a few edited words), then
+checks how many copies near_duplicates finds and how the time grows with
+the catalogue size.
+
+    python benchmarks/bench_dedupe.py --sizes 500 1000 2000
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import near_duplicates  # noqa: E402
+from html_parsing import make_soup  # noqa: E402
+
+
+def load_sentences():
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "fixtures", "*", "detail-*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            el = make_soup(f.read()).select_one(".entry-content, .post-content, .content")
+        if el:
+            sentences += [s for s in el.get_text(separator="\n", strip=True).split("\n") if len(s) > 20]
+    return sentences
+
+
+def syndicate(text, rng):
+    words = text.split()
+    for _ in range(len(words) // 50):
+        words[rng.randrange(len(words))] = rng.choice(["beasiswa", "program", "2025", "daftar"])
+    return "Dilansir dari situs resmi penyelenggara.\n" + " ".join(words) + "\nBaca juga: beasiswa lainnya."
+
+
+def catalogue(size, dup_rate, rng, sentences):
+    items, truth = [], {}
+    while len(items) < size:
+        i = len(items)
+        # distinct sentences per article, with numbers so articles never coincide
+        text = " ".join(f"{rng.choice(sentences)} ({i}.{k})" for k in range(30))
+        items.append({"id": f"a{i}", "title": f"Beasiswa {i}", "fullContent": text})
+        if rng.random() < dup_rate and len(items) < size:
+            items.append({"id": f"a{i}-copy", "title": f"[Update] Beasiswa {i} 2025",
+                          "fullContent": syndicate(text, rng)})
+            truth[f"a{i}-copy"] = f"a{i}"
+    return items, truth
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    ap.add_argument("--dup-rate", type=float, default=0.2, help="share of articles that get a syndicated copy")
+    ap.add_argument("--threshold", type=float, default=near_duplicates.THRESHOLD)
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    sentences = load_sentences()
+    print(f"{'items':>6} {'copies':>6} {'found':>6} {'false':>6} {'compared':>9} {'pairs':>9} {'ms':>8} {'us/item':>8}")
+    for size in args.sizes:
+        items, truth = catalogue(size, args.dup_rate, rng, sentences)
+        index = near_duplicates.NearDuplicateIndex(args.threshold)
+        started = time.perf_counter()
+        for it in items:
+            index.add(it["id"], it["title"] + "\n" + it["fullContent"], len(it["fullContent"]))
+        clusters = index.clusters()
+        elapsed = time.perf_counter() - started
+        found = wrong = 0
+        for canonical, dups in clusters:
+            for key in [canonical] + dups:
+                if key in truth and truth[key] in [canonical] + dups:
+                    found += 1
+            wrong += sum(1 for key in [canonical] + dups if key not in truth and f"{key}-copy" not in truth)
+        print(f"{len(items):>6} {len(truth):>6} {found:>6} {wrong:>6} {index.comparisons:>9} "
+              f"{len(items) * (len(items) - 1) // 2:>9} {elapsed * 1000:>8.0f} {elapsed / len(items) * 1e6:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Micro-benchmark for field_extract against the previous per-field regex code.
+
+The text of each detail fixture is repeated to build long articles, with the
+labelled fields placed near the end (the slow case for separate scans).
+Both implementations must return the same fields; the script stops if they
+differ.
+
+    python benchmarks/bench_extract.py --repeat 200
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import field_extract  # noqa: E402
+from html_parsing import make_soup  # noqa: E402
+
+CONTENT_SELECTOR = ".entry-content, .post-content, .content, .single-content, div[itemprop='articleBody'], .td-post-content"
+
+
+def legacy_extract(full_content):
+    """Organizer/deadline/location as parse_detail_page_generic() computed them before."""
+    organizer = None
+    organizer_match = re.search(r"(?:Penyelenggara|Organized by|Oleh):\s*(.*?)(?:\n|$)", full_content, re.IGNORECASE)
+    if organizer_match:
+        organizer = organizer_match.group(1).strip()
+
+    deadline = None
+    deadline_match = re.search(r"(?:Deadline|Batas waktu pendaftaran|Pendaftaran hingga|sampai dengan):\s*(\d{1,2}\s+\w+\s+\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})", full_content, re.IGNORECASE)
+    if deadline_match:
+        deadline = deadline_match.group(1).strip()
+
+    location = None
+    location_match = re.search(r"(?:Lokasi|Tempat|Negara|Kota|Wilayah):\s*(.*?)(?:\n|$)", full_content, re.IGNORECASE)
+    if location_match:
+        location = location_match.group(1).strip()
+    else:
+        lower_content = full_content.lower()
+        if "online" in lower_content or "daring" in lower_content or "virtual" in lower_content:
+            location = "Online"
+        elif "remote" in lower_content or "dari rumah" in lower_content:
+            location = "Remote"
+        elif "indonesia" in lower_content or "dalam negeri" in lower_content:
+            location = "Indonesia"
+        elif "luar negeri" in lower_content or "internasional" in lower_content:
+            location = "Internasional"
+        else:
+            for city in field_extract.CITIES:
+                if city.lower() in lower_content:
+                    location = city
+                    break
+    return {"organizer": organizer, "deadline": deadline, "location": location}
+
+
+def load_articles(repeat_text):
+    articles = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "fixtures", "*", "detail-*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            el = make_soup(f.read()).select_one(CONTENT_SELECTOR)
+        text = el.get_text(separator="\n", strip=True) if el else ""
+        body = "\n".join(line for line in text.splitlines() if ":" not in line)
+        labelled = "\n".join(line for line in text.splitlines() if ":" in line)
+        articles.append("\n".join([body] * repeat_text + [labelled]))
+        articles.append("\n".join([body] * repeat_text))  # no labels: keyword fallback
+    # edge cases the single pass must treat like the old regexes
+    articles += [
+        "Deadline: segera\nBatas waktu pendaftaran: 5 Mei 2025\nLokasi:\nKota: Bandung",
+        "Kami memperoleh: dukungan\nORGANIZED BY: Kampus X\nWilayah: Jawa Barat",
+        "Penyelenggara:\n\n  Yayasan Y\nsampai dengan: 2025-01-31 pukul 23.59",
+    ]
+    return articles
+
+
+def bench(fn, articles, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in articles:
+            fn(text)
+    return (time.perf_counter() - started) / (rounds * len(articles))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=50, help="copies of each article body")
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    articles = load_articles(args.repeat)
+    for text in articles:
+        old, new = legacy_extract(text), field_extract.extract_fields(text)
+        if old != new:
+            sys.exit(f"Mismatch on article starting {text[:60]!r}:\n  old {old}\n  new {new}")
+    avg_len = sum(map(len, articles)) / len(articles)
+    print(f"{len(articles)} articles, {avg_len / 1000:.0f} kB on average; outputs identical")
+    old = bench(legacy_extract, articles, args.rounds)
+    new = bench(field_extract.extract_fields, articles, args.rounds)
+    print(f"per-field regexes  {old * 1000:8.3f} ms/article")
+    print(f"single pass        {new * 1000:8.3f} ms/article  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Detail-page parsing throughput: html.parser vs lxml, inline vs process pool.
+
+Runs parse_detail_page_generic() over the saved detail pages in
+benchmarks/fixtures/<source>/detail-*.html.
+
+    python benchmarks/bench_parse.py --repeat 20
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the scraper writes its log relative to the repo root
+
+import html_parsing  # noqa: E402
+import scrape_scholarships_to_json as scraper  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+HAVE_LXML = html_parsing.HTML_PARSER == "lxml"
+
+
+def parse_with(parser, page):
+    html, link, source = page
+    html_parsing.HTML_PARSER = parser
+    return scraper.parse_detail_page_generic(html, link, source)
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*", "detail-*.html"))):
+        source = os.path.basename(os.path.dirname(path))
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((f.read(), "https://" + source + "/" + os.path.basename(path), source))
+    return pages
+
+
+def run(label, pages, parser, workers):
+    started = time.perf_counter()
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(parse_with, [parser] * len(pages), pages, chunksize=4))
+    else:
+        for page in pages:
+            parse_with(parser, page)
+    elapsed = time.perf_counter() - started
+    mb = sum(len(p[0]) for p in pages) / 1e6
+    print(f"{label:<28} {len(pages) / elapsed:8.1f} pages/s {mb / elapsed:8.2f} MB/s")
+    return elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=10, help="times each fixture is parsed")
+    ap.add_argument("--workers", type=int, default=html_parsing.PARSE_WORKERS or 2)
+    args = ap.parse_args()
+
+    pages = load_pages() * args.repeat
+    if not pages:
+        sys.exit(f"No detail fixtures under {FIXTURES}")
+    print(f"{len(pages)} pages, {sum(len(p[0]) for p in pages) / 1e6:.1f} MB of HTML")
+    base = run("html.parser, inline", pages, "html.parser", 0)
+    if not HAVE_LXML:
+        print("lxml is not installed; skipping the lxml runs")
+        return
+    fast = run("lxml, inline", pages, "lxml", 0)
+    pooled = run(f"lxml, {args.workers} processes", pages, "lxml", args.workers)
+    print(f"speed-up: {base / fast:.1f}x inline, {base / pooled:.1f}x pooled")
+
+
+if __name__ == "__main__":
+    main()
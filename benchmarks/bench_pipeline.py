@@ -0,0 +1,284 @@
+"""End-to-end benchmark of the scrapers against a local mock of the sites.
+
+Each stage runs one scraper in a fresh subprocess and working directory;
+its HTTP requests are routed to mock_server.MockSites, which replays
+benchmarks/fixtures/ with configurable latency and error injection. No
+request leaves the machine. Per stage it reports items/s, p50/p95 page
+latency (as seen by the scraper), parse CPU time, total CPU time and peak
+RSS. Politeness delays are switched off: the numbers measure the pipeline,
+not the crawl etiquette.
+
+    python benchmarks/bench_pipeline.py --pages 3 --latency-ms 30 --error-rate 0.02
+    python benchmarks/bench_pipeline.py --save before.json
+    python benchmarks/bench_pipeline.py --compare before.json   # exit code 1 on a regression
+
+Stages: scholarships (scrape_scholarships_to_json.scrape_all), beasiswa_id and
+indbeasiswa (the standalone scrapers) and lokerid (fetch_lokerid_jobs).
+With --warm every stage runs a second time in the same directory, so the
+HTTP cache and incremental reuse are measured as well.
+"""
+import argparse
+import functools
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_server import MockSites  # noqa: E402
+
+STAGES = ["scholarships", "beasiswa_id", "indbeasiswa", "lokerid"]
+# higher is better for these; lower is better for the rest
+HIGHER_IS_BETTER = {"items_per_s"}
+COMPARED = ["items_per_s", "p50_ms", "p95_ms", "parse_cpu_s", "peak_rss_mb"]
+
+
+# ---------------------------------------------------------------------------
+# Child side: runs one stage inside the scraper process
+# ---------------------------------------------------------------------------
+_parse_cpu = [0.0]
+_parse_lock = threading.Lock()
+_in_parse = threading.local()
+
+
+def timed_parse(fn):
+    """Adds the thread CPU time spent in `fn` to the parse total (outermost call only)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if getattr(_in_parse, "active", False):
+            return fn(*args, **kwargs)
+        _in_parse.active = True
+        started = time.thread_time()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            spent = time.thread_time() - started
+            _in_parse.active = False
+            with _parse_lock:
+                _parse_cpu[0] += spent
+    return wrapper
+
+
+def route_to_mock(port):
+    """Send every request of the shared session to the mock server, keeping the Host header."""
+    import http_client
+    from requests.adapters import HTTPAdapter
+
+    class MockAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            parts = urlsplit(request.url)
+            request.headers["Host"] = parts.netloc
+            request.url = f"http://127.0.0.1:{port}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+            return super().send(request, **kwargs)
+
+    session = http_client.get_session()
+    adapter = MockAdapter(pool_connections=http_client.POOL_CONNECTIONS, pool_maxsize=http_client.POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def record_latencies(latencies):
+    import http_client
+    real_get = http_client.get
+
+    @functools.wraps(real_get)
+    def get(url, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return real_get(url, *args, **kwargs)
+        finally:
+            if not url.endswith("/robots.txt"):
+                latencies.append(time.perf_counter() - started)
+    http_client.get = get
+
+
+def no_sleep(module):
+    """Give `module` its own `time` without sleeps."""
+    module.time = types.SimpleNamespace(**{k: getattr(time, k) for k in dir(time) if not k.startswith("_")})
+    module.time.sleep = lambda seconds: None
+
+
+def stage_scholarships(args):
+    import scrape_scholarships_to_json as scraper
+    scraper.MAX_PAGES = args.pages
+    scraper.make_soup = timed_parse(scraper.make_soup)
+    scraper.parse_detail_page_generic = timed_parse(scraper.parse_detail_page_generic)
+    scraper.parse_feed_content = timed_parse(scraper.parse_feed_content)
+    return len(scraper.scrape_all(incremental=True))
+
+
+def _standalone(module_name):
+    def stage(args):
+        import scrape_scholarships_to_json as scraper
+        module = __import__(module_name)
+        scraper.make_soup = timed_parse(scraper.make_soup)
+        scraper.parse_export_detail = timed_parse(scraper.parse_export_detail)
+        module.main()
+        with open(module.OUTPUT_FILE, "r", encoding="utf-8") as f:
+            return len(json.load(f))
+    return stage
+
+
+def stage_lokerid(args):
+    import fetch_lokerid_jobs as loker
+    loker.parse_listing = timed_parse(loker.parse_listing)
+    loker.make_soup = timed_parse(loker.make_soup)
+    loker.init_db()
+    loker.scrape_listings(max_items=args.pages * args.posts_per_page, max_pages=args.pages)
+    with sqlite3.connect(loker.DB_PATH) as conn:
+        return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+STAGE_FUNCS = {
+    "scholarships": stage_scholarships,
+    "beasiswa_id": _standalone("scrape_beasiswa_id"),
+    "indbeasiswa": _standalone("scrape_indbeasiswa"),
+    "lokerid": stage_lokerid,
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_child(args):
+    os.chdir(args.workdir)
+    for folder in ("logs", "data", "src/data"):
+        os.makedirs(folder, exist_ok=True)
+    import html_parsing
+    html_parsing.PARSE_WORKERS = args.parse_workers
+    import rate_limiter
+    no_sleep(rate_limiter)  # politeness waits and backoffs are still computed and booked, not slept
+    route_to_mock(args.port)
+    latencies = []
+    record_latencies(latencies)
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    items = STAGE_FUNCS[args.child](args)
+    html_parsing.shutdown_pool()
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    children_cpu = children.ru_utime + children.ru_stime
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, children.ru_maxrss)
+    print(json.dumps({
+        "items": items,
+        "pages": len(latencies),
+        "seconds": wall,
+        "items_per_s": items / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "parse_cpu_s": _parse_cpu[0] + children_cpu,
+        "cpu_s": cpu + children_cpu,
+        "peak_rss_mb": peak_kb / 1024,
+    }))
+
+
+# ---------------------------------------------------------------------------
+# Parent side: mock server, one subprocess per stage, report
+# ---------------------------------------------------------------------------
+def run_stage(stage, workdir, port, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", stage, "--workdir", workdir,
+           "--port", str(port), "--pages", str(args.pages), "--posts-per-page", str(args.posts_per_page),
+           "--parse-workers", str(args.parse_workers)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"Stage {stage} failed:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for name, row in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        deltas = []
+        for metric in COMPARED:
+            if not old.get(metric):
+                continue
+            change = row[metric] / old[metric] - 1
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = " !" if worse > tolerance else ""
+            if flag:
+                regressions.append(f"{name} {metric}")
+            deltas.append(f"{metric} {change:+.0%}{flag}")
+        print(f"  {name:<20} " + ", ".join(deltas))
+    if regressions:
+        print("Regressions: " + ", ".join(regressions))
+    return not regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    ap.add_argument("--pages", type=int, default=3, help="listing pages per site")
+    ap.add_argument("--posts-per-page", type=int, default=10)
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="mean server latency per request")
+    ap.add_argument("--jitter-ms", type=float, default=10.0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of pages answered with 503")
+    ap.add_argument("--parse-workers", type=int, default=0, help="PARSE_WORKERS for the stages (0 = inline)")
+    ap.add_argument("--warm", action="store_true", help="run every stage a second time with its cache and output")
+    ap.add_argument("--save", help="write the results as JSON to this file")
+    ap.add_argument("--compare", help="baseline saved with --save; exit 1 if a metric got worse")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed relative change before flagging")
+    # child mode (internal)
+    ap.add_argument("--child", choices=STAGES, help=argparse.SUPPRESS)
+    ap.add_argument("--workdir", help=argparse.SUPPRESS)
+    ap.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return run_child(args)
+
+    sites = MockSites(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                      error_rate=args.error_rate, pages=args.pages, posts_per_page=args.posts_per_page)
+    port = sites.start()
+    results = {}
+    print(f"{'stage':<20} {'items':>5} {'pages':>5} {'items/s':>8} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'parse s':>7} {'cpu s':>6} {'rss MB':>6} {'503s':>5} {'304s':>5}")
+    try:
+        for stage in args.stages:
+            workdir = tempfile.mkdtemp(prefix=f"bench-{stage}-")
+            try:
+                for run in (["", " (warm)"] if args.warm else [""]):
+                    sites.reset()
+                    row = run_stage(stage, workdir, port, args)
+                    row.update(errors=sites.counters["errors"], not_modified=sites.counters["not_modified"])
+                    results[stage + run] = row
+                    print(f"{stage + run:<20} {row['items']:>5} {row['pages']:>5} {row['items_per_s']:>8.1f} "
+                          f"{row['p50_ms']:>7.1f} {row['p95_ms']:>7.1f} {row['parse_cpu_s']:>7.2f} "
+                          f"{row['cpu_s']:>6.2f} {row['peak_rss_mb']:>6.0f} {row['errors']:>5} {row['not_modified']:>5}")
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        sites.stop()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"settings": {k: v for k, v in vars(args).items() if k not in ("child", "workdir", "port",
+                                                                                      "save", "compare")},
+                       "results": results}, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark the memory of scraped items held as dicts vs. records.
+
+Builds a synthetic crawl from the detail fixtures in the scraper's output
+schema, loads it from JSON like load_previous_items() does, and measures the
+memory held by the items as dicts and as records.RawScholarship, plus the
+cost of converting in both directions.
+
+    python benchmarks/bench_records.py --sizes 1000 5000 20000
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from html_parsing import make_soup  # noqa: E402
+from records import EXCERPT_CHARS, RawScholarship  # noqa: E402
+
+SOURCES = ["beasiswa.id", "indbeasiswa.com", "luarkampus.id", "schoters.com", "scholarshipportal.com"]
+LOCATIONS = ["Tidak diketahui", "Online", "Jakarta", "Luar Negeri", "Indonesia"]
+
+
+def load_sentences():
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "fixtures", "*", "detail-*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            el = make_soup(f.read()).select_one(".entry-content, .post-content, .content")
+        if el:
+            sentences += [s for s in el.get_text(separator="\n", strip=True).split("\n") if len(s) > 20]
+    return sentences
+
+
+def crawl_json(size, rng, sentences):
+    items = []
+    for i in range(size):
+        full = "\n".join(rng.choice(sentences) for _ in range(rng.randint(10, 40)))
+        items.append({
+            "id": f"{i:040x}",
+            "source": rng.choice(SOURCES),
+            "title": f"Beasiswa {i}",
+            "link": f"https://example.com/beasiswa/post-{i}/",
+            "date_posted": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            # feed entries carry their own summary, detail pages the start of the article
+            "excerpt": f"Ringkasan {i}" if rng.random() < 0.2 else full[:EXCERPT_CHARS],
+            "fullContent": full,
+            "organizer": rng.choice(["", "Kemendikbud", "LPDP"]),
+            "location": rng.choice(LOCATIONS),
+            "fetched_at": "2025-06-01T00:00:00",
+        })
+    return json.dumps(items, ensure_ascii=False)
+
+
+def held(build):
+    """(result of build(), bytes still allocated by it)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = ap.parse_args()
+
+    rng = random.Random(1)
+    sentences = load_sentences()
+    print(f"{'items':>6} {'text MB':>8} {'dicts MB':>9} {'records MB':>11} {'saved':>6} "
+          f"{'from us':>8} {'to us':>6}")
+    for size in args.sizes:
+        text = crawl_json(size, rng, sentences)
+        dicts, dict_bytes = held(lambda: json.loads(text))
+        started = time.perf_counter()
+        records = [RawScholarship.from_dict(it) for it in dicts]
+        from_s = time.perf_counter() - started
+        started = time.perf_counter()
+        assert [r.to_dict() for r in records] == dicts
+        to_s = time.perf_counter() - started
+        del dicts, records
+        records, record_bytes = held(lambda: [RawScholarship.from_dict(it) for it in json.loads(text)])
+        del records
+        print(f"{size:>6} {len(text.encode('utf-8')) / 1e6:>8.1f} {dict_bytes / 1e6:>9.1f} {record_bytes / 1e6:>11.1f} "
+              f"{1 - record_bytes / dict_bytes:>6.0%} {from_s / size * 1e6:>8.1f} {to_s / size * 1e6:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
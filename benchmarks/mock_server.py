@@ -0,0 +1,173 @@
+"""Local stand-in for the scraped sites, serving benchmarks/fixtures/<host>/.
+
+The site is picked from the Host header ("www." is ignored). Routes:
+
+    /robots.txt                    allows everything, never fails
+    .../post-<n>/, post-<p>-<n>/   detail-<k>.html
+    .../rss, .../feed/             RSS feed of the posts on all listing pages,
+                                   with their detail body in content:encoded
+    anything else                  listing.html as page N (from .../page/N/): the
+                                   fixture's <article> posts are repeated to
+                                   `posts_per_page` distinct posts, with a next
+                                   link until page `pages`
+
+Every response waits `latency` +- `jitter` seconds first, and with
+probability `error_rate` a page is answered with 503. Responses carry an
+ETag and If-None-Match is answered with 304, like the real sites.
+"""
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_ARTICLE = re.compile(r"<article\b.*?</article>", re.S)
+_POST_LINK = re.compile(r"post-\d+/")
+_NEXT_LINK = re.compile(r"<a\b[^>]*\bnext\b[^>]*>")
+_DETAIL = re.compile(r"post-(?:\d+-)?(\d+)/?$")
+_PAGE = re.compile(r"page/(\d+)/?$")
+_POST = re.compile(r'<a\b[^>]*href="([^"]*post-\d+-\d+/)"[^>]*>([^<]+)</a>')
+_BODY = re.compile(r"<body[^>]*>(.*)</body>", re.S | re.I)
+
+
+class MockSites:
+    def __init__(self, fixtures=FIXTURES, latency=0.02, jitter=0.01, error_rate=0.0,
+                 pages=3, posts_per_page=10, seed=1):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.pages = pages
+        self.posts_per_page = posts_per_page
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._files = {}
+        self.counters = {}
+        self.reset()
+        self._server = None
+
+    def reset(self):
+        with self._lock:
+            self.counters = {"requests": 0, "errors": 0, "not_modified": 0, "bytes": 0}
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _fixture(self, site, name):
+        key = (site, name)
+        if key not in self._files:
+            path = os.path.join(self.fixtures, site, name)
+            with open(path, "r", encoding="utf-8") as f:
+                self._files[key] = f.read()
+        return self._files[key]
+
+    def _delay(self):
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def _fails(self):
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def listing(self, site, path, page):
+        html = self._fixture(site, "listing.html")
+        blocks = _ARTICLE.findall(html)
+        if blocks:
+            posts = [_POST_LINK.sub(f"post-{page}-{i + 1}/", blocks[i % len(blocks)])
+                     for i in range(self.posts_per_page)]
+            start, end = html.index(blocks[0]), html.rindex(blocks[-1]) + len(blocks[-1])
+            html = html[:start] + "".join(posts) + html[end:]
+        base = _PAGE.sub("", path)
+        base = base if base.endswith("/") else base + "/"
+        next_tag = (f'<a class="next page-numbers" rel="next" href="{base}page/{page + 1}/">'
+                    if page < self.pages else "<a>")
+        return _NEXT_LINK.sub(next_tag, html)
+
+    def rss(self, host, site):
+        details = self._details(site)
+        items = []
+        for page in range(1, self.pages + 1):
+            posts = _POST.findall(self.listing(site, "/", page))
+            for i, (link, title) in enumerate(posts, 1):
+                body = _BODY.search(self._fixture(site, details[(i - 1) % len(details)]))
+                items.append(f"<item><title>{title.strip()}</title><link>{link}</link>"
+                             f"<description>Synthetic feed entry {page}-{i}</description>"
+                             f"<content:encoded><![CDATA[{body.group(1) if body else ''}]]></content:encoded>"
+                             f"<pubDate>{formatdate(1735689600 - page * 86400 - i * 60, usegmt=True)}</pubDate></item>")
+        return ('<?xml version="1.0" encoding="utf-8"?><rss version="2.0" '
+                'xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+                f"<title>{host}</title><link>https://{host}/</link>{''.join(items)}</channel></rss>")
+
+    def _details(self, site):
+        return sorted(n for n in os.listdir(os.path.join(self.fixtures, site)) if n.startswith("detail-"))
+
+    def respond(self, host, path):
+        """(status, content type, body) for a request, before latency/error injection."""
+        site = host.split(":")[0]
+        site = site[4:] if site.startswith("www.") else site
+        if not os.path.isdir(os.path.join(self.fixtures, site)):
+            return 404, "text/plain", "unknown site"
+        path = path.split("?")[0]
+        if path == "/robots.txt":
+            return 200, "text/plain", "User-agent: *\nAllow: /\n"
+        if path.rstrip("/").endswith(("/rss", "/feed")):
+            return 200, "application/rss+xml", self.rss(host, site)
+        m = _DETAIL.search(path)
+        if m:
+            details = self._details(site)
+            return 200, "text/html", self._fixture(site, details[(int(m.group(1)) - 1) % len(details)])
+        m = _PAGE.search(path)
+        page = int(m.group(1)) if m else 1
+        if page > self.pages:
+            return 404, "text/plain", "no such page"
+        return 200, "text/html", self.listing(site, path, page)
+
+    def start(self, port=0):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                time.sleep(sites._delay())
+                status, ctype, body = sites.respond(self.headers.get("Host", ""), self.path)
+                sites._count("requests")
+                if status == 200 and not self.path.endswith("robots.txt") and sites._fails():
+                    sites._count("errors")
+                    status, ctype, body = 503, "text/plain", "injected error"
+                data = body.encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(data).hexdigest()[:16]
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    sites._count("not_modified")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                sites._count("bytes", len(data))
+                self.send_response(status)
+                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
@@ -1,41 +1,95 @@
 import json
+import os
+import re
 from datetime import datetime
+from item_store import ItemStore
+from near_duplicates import find_clusters, duplicate_ids, cluster_report
+from search_index import SearchIndexBuilder, month_of
+from static_export import StaticExport
 
-# List of JSON files to combine.
-# These should be the intermediate files generated by your individual scraping/exporting scripts.
+STORE_PATH = "data/items.db"  # export_jobs_to_json.py and export_lokerid_to_json.py sync their DBs here
+# JSON files from sources that have no database of their own; they are synced into the store too.
 INPUT_FILES = [
-    "src/data/jobs_from_db.json",        # Data exported from your jobs.db (e.g., Lokerbandung, GetRedy, Jooble)
     "src/data/jobs_from_jobstreet.json",  # Data from JobStreet (assuming you have a script for this)
-    "src/data/jobs_from_lokerid.json"    # New: Data from Loker.id
     # Add more paths here for other sources if needed, e.g., "src/data/jobs_from_linkedin.json"
 ]
 OUTPUT_PATH = "src/data/scrapedJobsFromDB.json" # The final combined file for your React app
+CLUSTERS_PATH = "data/job_clusters.json"  # near-duplicate jobs across sources; only the canonical one is exported
+NEAR_DUP_THRESHOLD = 0.9  # title similarity; company and location must match exactly
+INDEX_PATH = "src/data/scrapedJobsFromDB.index.json"  # search tokens and facets, by position in OUTPUT_PATH
+# slim list manifest + detail shards under public/data/jobs/, loaded on demand
+STATIC_LIST_FIELDS = ("title", "date_posted", "source", "company", "location", "jobType", "workPolicy")
 
-combined_jobs_map = {} # Use a dictionary to easily handle unique IDs and prevent duplicates
+def _normalized(value):
+    return " ".join(re.findall(r"\w+", (value or "").lower()))
 
-for file_path in INPUT_FILES:
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+def job_clusters(jobs):
+    """Near-duplicate clusters of `jobs`: the same opening posted on several boards.
+
+    Only jobs with the same company and location (after normalization) are
+    compared, on their titles, so another seniority or city stays a separate
+    opening; see near_duplicates.find_clusters() for the source rule.
+    """
+    return find_clusters(jobs, lambda j: j.get("title") or "", threshold=NEAR_DUP_THRESHOLD,
+                         block_fn=lambda j: (_normalized(j.get("company")), _normalized(j.get("location"))))
+
+def main():
+    """Sync INPUT_FILES into the store and export the combined jobs if any changed.
+
+    Returns the number of jobs new or changed since the last export, or None if
+    OUTPUT_PATH was up to date.
+    """
+    store = ItemStore(STORE_PATH)
+
+    for file_path in INPUT_FILES:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            jobs = []
             for job in data:
                 if "id" in job:
-                    # Add or overwrite if ID exists. The last file in INPUT_FILES list wins for duplicates.
-                    combined_jobs_map[job["id"]] = job
+                    jobs.append(job)
                 else:
                     print(f"Warning: Job in {file_path} has no 'id' field and will be skipped.")
-    except FileNotFoundError:
-        print(f"Warning: File not found at {file_path}. Skipping this source.")
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}. Skipping this source.")
+            # Later sources win for duplicate IDs, as before; jobs no longer in the file are removed
+            store.sync("job", file_path, jobs)
+        except FileNotFoundError:
+            print(f"Warning: File not found at {file_path}. Skipping this source.")
+        except json.JSONDecodeError:
+            print(f"Error: Could not decode JSON from {file_path}. Skipping this source.")
+
+    # The combined list is rewritten only when a job changed since the last export,
+    # newest date_posted first (assuming a sortable format, e.g. YYYY-MM-DD)
+    changed = None
+    if store.pending("scrapedJobsFromDB", "job") or not os.path.exists(OUTPUT_PATH):
+        clusters = job_clusters(store.iter_items("job"))
+        os.makedirs(os.path.dirname(CLUSTERS_PATH), exist_ok=True)
+        with open(CLUSTERS_PATH, "w", encoding="utf-8") as f:
+            json.dump(cluster_report(clusters), f, ensure_ascii=False, indent=2)
+        duplicates = duplicate_ids(clusters)
+        print(f"Near-duplicates: {len(duplicates)} jobs dropped from {len(clusters)} clusters (see {CLUSTERS_PATH})")
+        index = SearchIndexBuilder(
+            lambda j: " ".join(j.get(k) or "" for k in ("title", "company", "location", "source")),
+            facets={"location": lambda j: j.get("location"), "source": lambda j: j.get("source"), "month": month_of})
+        static = StaticExport("jobs", STATIC_LIST_FIELDS)
 
-# Convert the dictionary of unique jobs back to a list
-final_jobs_list = list(combined_jobs_map.values())
+        def tap(job):
+            index.add(job)
+            static.add(job)
 
-# Sort the combined list by date_posted in descending order (newest first)
-# Assuming 'date_posted' is in a sortable format (e.g., YYYY-MM-DD)
-final_jobs_list.sort(key=lambda x: x.get("date_posted", ""), reverse=True)
+        changed = store.export_json("scrapedJobsFromDB", "job", OUTPUT_PATH, force=True,
+                                    keep=lambda j: j["id"] not in duplicates, tap=tap)
+        tokens = index.write(INDEX_PATH)
+        print(f"Search index: {tokens} tokens over {index.count} jobs written to {INDEX_PATH}")
+        print(f"Static export: list manifest {static.close()} and detail shards in {static.folder}")
+    total = store.count("job")
+    store.close()
 
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(final_jobs_list, f, ensure_ascii=False, indent=2)
+    if changed is None:
+        print(f"✅ {OUTPUT_PATH} is up to date ({total} jobs) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    else:
+        print(f"✅ {total - len(duplicates)} combined jobs ({changed} new or changed) exported to {OUTPUT_PATH} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return changed
 
-print(f"✅ {len(final_jobs_list)} combined jobs exported to {OUTPUT_PATH} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
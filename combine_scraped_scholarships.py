@@ -1,8 +1,24 @@
-import json, os, re
+import json, os, argparse
 from datetime import datetime
-from dateutil import parser as dateparser # Import dateparser
+import date_normalize
+from date_normalize import normalize_date
+from tag_classifier import classify_text
+from ndjson_io import NdjsonWriter, iter_items, write_json_array, write_sorted
+from records import Scholarship
+from item_store import ItemStore, VOLATILE_FIELDS
+from fingerprint_cache import FingerprintCache, record_fingerprint
+from near_duplicates import find_clusters, duplicate_ids, cluster_report
+from search_index import SearchIndexBuilder, month_of
+from static_export import StaticExport
 
 RAW = "data/beasiswa_all.json"
+RAW_NDJSON = "data/beasiswa_all.jsonl"  # written by scrape_scholarships_to_json.py --ndjson
+STORE_PATH = "data/items.db"  # raw items are upserted here by the scraper
+FINGERPRINT_PATH = "data/fingerprints.db"  # normalized record per raw-content hash, keeps scraped_at stable
+CLUSTERS_OUT = "data/scholarship_clusters.json"  # near-duplicate groups; only the canonical item goes to OUT
+INDEX_OUT = "src/data/scrapedScholarships.index.json"  # search tokens and facets, by position in OUT
+# slim list manifest + detail shards under public/data/scholarships/, loaded on demand
+STATIC_LIST_FIELDS = ("title", "date_posted", "source", "organizer", "location", "degreeLevels", "fundingTypes")
 OUT = "src/data/scrapedScholarships.json"
 
 def normalize_item(it):
@@ -12,51 +28,19 @@ def normalize_item(it):
     source = it.get("source","").strip()
     date_posted = it.get("date_posted","") or ""
     # normalize date YYYY-MM-DD if possible
-    try:
-        if date_posted and date_posted != "Tidak diketahui":
-            date_posted = dateparser.parse(date_posted, fuzzy=True).date().isoformat()
-        else:
-            date_posted = "" # Ensure it's an empty string if "Tidak diketahui"
-    except Exception:
-        date_posted = "" # Fallback to empty string on parsing error
+    if date_posted and date_posted != "Tidak diketahui":
+        date_posted = normalize_date(date_posted) or "" # Fallback to empty string on parsing error
+    else:
+        date_posted = "" # Ensure it's an empty string if "Tidak diketahui"
     
     excerpt = it.get("excerpt","") or ""
     full = it.get("fullContent","") or ""
     organizer = it.get("organizer","") or ""
     location = it.get("location","") or ""
     
-    # extract level keywords (S1,S2,undergraduate,master)
-    level = []
+    # degree levels (S1, S2, ...) and funding types from the keyword tables
     txt = (title + " " + excerpt + " " + full).lower()
-    if re.search(r"\b(smp|mts|kelas 7|kelas 8|kelas 9)\b", txt): level.append("SMP")
-    if re.search(r"\b(sma|smk|sederajat|kelas 10|kelas 11|kelas 12)\b", txt): level.append("SMA")
-    if re.search(r"\b(d2|diploma 2)\b", txt): level.append("D2")
-    if re.search(r"\b(d3|diploma 3)\b", txt): level.append("D3")
-    if re.search(r"\b(d4|diploma 4)\b", txt): level.append("D4")
-    if re.search(r"\b(s1|sarjana|undergraduate|bachelor)\b", txt): level.append("S1")
-    if re.search(r"\b(s2|master|postgraduate|magister)\b", txt): level.append("S2")
-    if re.search(r"\b(s3|phd|doctor|doktor)\b", txt): level.append("S3")
-    if re.search(r"\b(non-degree|kursus|pelatihan singkat)\b", txt): level.append("Non-Degree")
-    if re.search(r"\b(gap year)\b", txt): level.append("Gap Year")
-    if re.search(r"\b(profesi|guru|dokter|akuntan)\b", txt): level.append("Profesi")
-    
-    if not level:
-        level = ["All"] # Default if no specific level found
-
-    # type detection
-    types = []
-    if re.search(r"fully funded|fully-funded|full[- ]?scholarship|dibiayai penuh|beasiswa penuh|100%", txt): types.append("Fully Funded")
-    if re.search(r"partially funded|sebagian|potongan biaya|bantuan dana", txt): types.append("Partially Funded")
-    if re.search(r"mentoring|pembinaan|bimbingan", txt): types.append("Mentoring")
-    if re.search(r"riset|penelitian", txt): types.append("Riset")
-    if re.search(r"exchange|pertukaran pelajar", txt): types.append("Exchange")
-    if re.search(r"pelatihan|studi singkat|kursus|program singkat", txt): types.append("Pelatihan/Studi Singkat")
-    if re.search(r"self funded|dana mandiri", txt): types.append("Self Funded")
-    if re.search(r"pendanaan proyek|dana proyek", txt): types.append("Pendanaan Project")
-    if re.search(r"magang|internship", txt): types.append("Internship")
-
-    if not types:
-        types = ["Other"] # Default if no specific type found
+    level, types = classify_text(txt)
 
     return {
         "id": it.get("id") or make_id(source, title, link), # Use make_id if id is missing
@@ -68,35 +52,168 @@ def normalize_item(it):
         "fullContent": full,
         "organizer": organizer,
         "location": location,
-        "degreeLevels": list(set(level)), # Ensure unique levels
-        "fundingTypes": list(set(types)), # Ensure unique types
+        "degreeLevels": level,
+        "fundingTypes": types,
+        # when this content was first normalized; stays put while the content does
         "scraped_at": datetime.utcnow().isoformat()
     }
 
-def main():
-    if not os.path.exists(RAW):
-        print(f"No raw file found at {RAW}. Run scraper first.")
+def normalizer(cache):
+    """normalize_item() that reuses the record built last time for unchanged raw items."""
+    def normalize(it):
+        if not it.get("id"):
+            return normalize_item(it)
+        fingerprint = record_fingerprint(it, ignore=VOLATILE_FIELDS)
+        return cache.reuse("normalize", it["id"], fingerprint, lambda: normalize_item(it))
+    return normalize
+
+def close_cache(cache):
+    cache.close()
+    print(f"Normalize: {cache.hits} unchanged items reused, {cache.misses} normalized")
+
+# Sort by date_posted descending, placing items with valid dates first
+def keyfn(x):
+    return date_key(x.get("date_posted"))
+
+def date_key(date_str):
+    if date_str:
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    return datetime.min # Treat invalid/missing dates as very old for sorting
+
+def dedup_text(x):
+    return x.get("title", "") + "\n" + x.get("fullContent", "")
+
+def near_duplicates(items):
+    """Ids of items that repeat another item from a different source (the more complete one is kept)."""
+    clusters = find_clusters(items, dedup_text, rank_fn=lambda x: len(x.get("fullContent") or ""))
+    os.makedirs(os.path.dirname(CLUSTERS_OUT), exist_ok=True)
+    with open(CLUSTERS_OUT, "w", encoding="utf-8") as f:
+        json.dump(cluster_report(clusters), f, ensure_ascii=False, indent=2)
+    dups = duplicate_ids(clusters)
+    print(f"Near-duplicates: {len(dups)} items dropped from {len(clusters)} clusters (see {CLUSTERS_OUT})")
+    return dups
+
+def new_search_index():
+    return SearchIndexBuilder(
+        lambda x: " ".join([x.get("title", ""), x.get("excerpt", ""), x.get("fullContent", ""),
+                            x.get("organizer", ""), x.get("location", "")]),
+        facets={
+            "degreeLevels": lambda x: x.get("degreeLevels"),
+            "fundingTypes": lambda x: x.get("fundingTypes"),
+            "location": lambda x: x.get("location"),
+            "month": month_of,
+        })
+
+def new_side_outputs():
+    """Search index and static export, fed every item written to OUT in the same order."""
+    return new_search_index(), StaticExport("scholarships", STATIC_LIST_FIELDS)
+
+def feed(outputs):
+    def tap(x):
+        for out in outputs:
+            out.add(x)
+    return tap
+
+def finish_side_outputs(outputs):
+    index, export = outputs
+    tokens = index.write(INDEX_OUT)
+    print(f"Search index: {tokens} tokens over {index.count} items written to {INDEX_OUT}")
+    manifest = export.close()
+    print(f"Static export: list manifest {manifest} and detail shards in {export.folder}")
+
+def combine_from_store(cache=None):
+    """Normalize only the raw items changed since the last run, drop the removed ones, then export if anything changed.
+
+    `cache` is a FingerprintCache the caller keeps open (the scheduler
+    daemon); by default one is opened and closed for this run.
+    """
+    if not os.path.exists(STORE_PATH):
+        print(f"No item store found at {STORE_PATH}. Run scraper first.")
         return
     os.makedirs(os.path.dirname(OUT), exist_ok=True)
-    with open(RAW, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-    normalized = [normalize_item(it) for it in raw]
-    
-    # Sort by date_posted descending, placing items with valid dates first
-    def keyfn(x):
-        date_str = x.get("date_posted")
-        if date_str:
-            try:
-                return datetime.fromisoformat(date_str)
-            except ValueError:
-                pass
-        return datetime.min # Treat invalid/missing dates as very old for sorting
-        
-    normalized_sorted = sorted(normalized, key=keyfn, reverse=True)
-    
-    with open(OUT, "w", encoding="utf-8") as f:
-        json.dump(normalized_sorted, f, ensure_ascii=False, indent=2)
-    print(f"Wrote {len(normalized_sorted)} normalized items to {OUT}")
+    store = ItemStore(STORE_PATH)
+    own_cache = cache is None
+    cache = cache or FingerprintCache(FINGERPRINT_PATH)
+    try:
+        raw, removed, rev = store.changes("combine_scholarships", "scholarship_raw")
+        changed = store.upsert_many("scholarship", map(normalizer(cache), raw))
+        removed = store.remove("scholarship", removed)
+        store.mark_exported("combine_scholarships", rev)
+        exported = None
+        if store.pending("scrapedScholarships", "scholarship") or not os.path.exists(OUT):
+            dups = near_duplicates(store.iter_items("scholarship"))
+            outputs = new_side_outputs()
+            exported = store.export_json("scrapedScholarships", "scholarship", OUT, force=True,
+                                         keep=lambda x: x["id"] not in dups, tap=feed(outputs))
+            finish_side_outputs(outputs)
+        total = store.count("scholarship")
+    finally:
+        store.close()
+        if own_cache:
+            close_cache(cache)
+        else:
+            cache.flush()
+    print(f"Normalized {len(raw)} new or changed raw items ({changed} changed after normalizing), "
+          f"removed {removed} items no longer scraped")
+    if exported is None:
+        print(f"{OUT} is up to date ({total} items in the store)")
+    else:
+        print(f"Wrote {total - len(dups)} normalized items to {OUT}")
+    print(f"Dates: {date_normalize.stats()}")
+
+def main(ndjson=False):
+    raw_path = RAW_NDJSON if ndjson else RAW
+    if not os.path.exists(raw_path):
+        print(f"No raw file found at {raw_path}. Run scraper first.")
+        return
+    os.makedirs(os.path.dirname(OUT), exist_ok=True)
+    cache = FingerprintCache(FINGERPRINT_PATH)
+    normalize = normalizer(cache)
+    if ndjson:
+        # one item in memory at a time; the sort only keeps (date, offset) pairs
+        tmp = OUT + ".jsonl"
+        with NdjsonWriter(tmp) as w:
+            for it in iter_items(raw_path):
+                w.write(normalize(it))
+        dups = near_duplicates(iter_items(tmp))
+        outputs = new_side_outputs()
+        count = write_sorted(tmp, OUT, keyfn, reverse=True, as_json_array=True,
+                             keep=lambda x: x["id"] not in dups, tap=feed(outputs))
+        os.remove(tmp)
+    else:
+        with open(raw_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        # compact records while sorting and deduplicating; dicts only to write them out
+        normalized = [Scholarship.from_dict(normalize(it)) for it in raw]
+        del raw
+        dups = near_duplicates(x.to_dict() for x in normalized)
+        normalized = [x for x in normalized if x.id not in dups]
+        normalized_sorted = sorted(normalized, key=lambda x: date_key(x.date_posted), reverse=True)
+        outputs = new_side_outputs()
+        tap = feed(outputs)
+
+        def written():
+            for x in normalized_sorted:
+                item = x.to_dict()
+                tap(item)
+                yield item
+
+        write_json_array(written(), OUT)
+        count = len(normalized_sorted)
+    close_cache(cache)
+    finish_side_outputs(outputs)
+    print(f"Wrote {count} normalized items to {OUT}")
+    print(f"Dates: {date_normalize.stats()}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ap = argparse.ArgumentParser(description=f"Normalize scraped scholarships into {OUT}")
+    ap.add_argument("--json", action="store_true", help=f"read everything from {RAW} instead of the item store")
+    ap.add_argument("--ndjson", action="store_true", help=f"stream everything from {RAW_NDJSON}")
+    args = ap.parse_args()
+    if args.json or args.ndjson:
+        main(ndjson=args.ndjson)
+    else:
+        combine_from_store()
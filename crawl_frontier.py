@@ -0,0 +1,131 @@
+"""Persistent crawl frontier for paginated, resumable crawls.
+
+Every listing and detail page of a crawl is recorded in SQLite as
+pending, done or failed, together with the item parsed from it. When a
+run is interrupted, the next run of the same source picks up the pending
+pages and reuses the finished ones instead of starting over.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+# -------- CONFIG ----------
+FRONTIER_PATH = "data/crawl_frontier.db"
+MAX_ATTEMPTS = 3  # failed pages are retried on resume until they failed this often
+# ---------------------------
+
+
+class CrawlFrontier:
+    def __init__(self, path=FRONTIER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS crawls (
+            source TEXT PRIMARY KEY,
+            status TEXT,
+            started_at TEXT,
+            finished_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT,
+            url TEXT,
+            kind TEXT,
+            status TEXT DEFAULT 'pending',
+            title TEXT,
+            attempts INTEGER DEFAULT 0,
+            error TEXT,
+            result TEXT,
+            updated_at TEXT,
+            UNIQUE (source, url)
+        );
+        CREATE INDEX IF NOT EXISTS idx_pages_status ON pages (source, kind, status);
+        ''')
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cur = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cur
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def begin(self, source, seeds):
+        """Start a crawl of `source`, or resume its unfinished one. Returns True when resuming."""
+        row = self._query("SELECT status FROM crawls WHERE source = ?", (source,))
+        if row and row[0][0] == "running":
+            self._execute('''UPDATE pages SET status = 'pending'
+                             WHERE source = ? AND status = 'failed' AND attempts < ?''',
+                          (source, MAX_ATTEMPTS))
+            return True
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE source = ?", (source,))
+            self._conn.execute('''INSERT OR REPLACE INTO crawls (source, status, started_at, finished_at)
+                                  VALUES (?, 'running', ?, NULL)''', (source, now))
+            self._conn.commit()
+        for url in seeds:
+            self.add(source, url, "listing")
+        return False
+
+    def finish(self, source):
+        self._execute("UPDATE crawls SET status = 'finished', finished_at = ? WHERE source = ?",
+                      (datetime.utcnow().isoformat(), source))
+
+    def add(self, source, url, kind, title=None):
+        """Queue a page; pages already known to this crawl are ignored."""
+        self._execute('''INSERT OR IGNORE INTO pages (source, url, kind, title, updated_at)
+                         VALUES (?, ?, ?, ?, ?)''',
+                      (source, url, kind, title, datetime.utcnow().isoformat()))
+
+    def next_pending(self, source, kind):
+        """Oldest pending page of `kind` as (url, title), or None."""
+        rows = self._query('''SELECT url, title FROM pages
+                              WHERE source = ? AND kind = ? AND status = 'pending'
+                              ORDER BY seq LIMIT 1''', (source, kind))
+        return rows[0] if rows else None
+
+    def mark_done(self, source, url, result=None):
+        self._execute('''UPDATE pages SET status = 'done', attempts = attempts + 1, error = NULL,
+                         result = ?, updated_at = ? WHERE source = ? AND url = ?''',
+                      (json.dumps(result, ensure_ascii=False) if result is not None else None,
+                       datetime.utcnow().isoformat(), source, url))
+
+    def mark_failed(self, source, url, error=""):
+        self._execute('''UPDATE pages SET status = 'failed', attempts = attempts + 1, error = ?,
+                         updated_at = ? WHERE source = ? AND url = ?''',
+                      (str(error)[:500], datetime.utcnow().isoformat(), source, url))
+
+    def count(self, source, kind, status):
+        return self._query("SELECT COUNT(*) FROM pages WHERE source = ? AND kind = ? AND status = ?",
+                           (source, kind, status))[0][0]
+
+    def results(self, source):
+        """Items stored with finished pages of `source`, in crawl order."""
+        rows = self._query('''SELECT result FROM pages
+                              WHERE source = ? AND status = 'done' AND result IS NOT NULL
+                              ORDER BY seq''', (source,))
+        return [json.loads(r[0]) for r in rows]
+
+    def iter_results(self, source, batch=500):
+        """Like results(), but reads the stored items in batches."""
+        last = 0
+        while True:
+            rows = self._query('''SELECT seq, result FROM pages
+                                  WHERE source = ? AND status = 'done' AND result IS NOT NULL AND seq > ?
+                                  ORDER BY seq LIMIT ?''', (source, last, batch))
+            if not rows:
+                return
+            for seq, result in rows:
+                yield json.loads(result)
+            last = rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
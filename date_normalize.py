@@ -0,0 +1,97 @@
+"""Date normalisation for scraped deadline/post dates.
+
+Exact forms are parsed directly: ISO dates (optionally with a time), day-first
+numeric dates such as 31/12/2024, and month-name dates in Indonesian or
+English ("12 Mei 2025", "Senin, 3 Agustus 2025", "May 12, 2025"). Anything
+else goes to dateutil's fuzzy parser behind a bounded LRU memo, since the
+same deadline strings repeat across items and runs.
+"""
+import functools
+import re
+import threading
+from datetime import date
+
+from dateutil import parser as dateparser
+
+# -------- CONFIG ----------
+MEMO_SIZE = 4096  # distinct strings remembered by the fuzzy fallback
+# ---------------------------
+
+MONTHS = {
+    # Indonesian
+    "januari": 1, "februari": 2, "pebruari": 2, "maret": 3, "april": 4, "mei": 5, "juni": 6,
+    "juli": 7, "agustus": 8, "september": 9, "oktober": 10, "november": 11, "nopember": 11,
+    "desember": 12, "agu": 8, "agt": 8, "ags": 8, "okt": 10, "des": 12,
+    # English
+    "january": 1, "february": 2, "march": 3, "may": 5, "june": 6, "july": 7, "august": 8,
+    "october": 10, "december": 12, "aug": 8, "oct": 10, "dec": 12,
+    # abbreviations shared by both
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "sep": 9, "sept": 9, "nov": 11,
+}
+
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?")
+_DMY = re.compile(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})")
+_DAY_MONTH = re.compile(r"(?:[A-Za-z']+,?\s+)?(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})")
+_MONTH_DAY = re.compile(r"([A-Za-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})")
+
+_lock = threading.Lock()
+_counters = {"fast": 0, "fuzzy": 0, "failed": 0}
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def _make_date(year, month, day):
+    try:
+        return date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_exact(text):
+    """date for the exact forms above, or None. Never guesses."""
+    text = (text or "").strip()
+    m = _ISO.fullmatch(text)
+    if m:
+        return _make_date(m.group(1), m.group(2), m.group(3))
+    m = _DMY.fullmatch(text)
+    if m:
+        return _make_date(m.group(3), m.group(2), m.group(1))
+    m = _DAY_MONTH.fullmatch(text)
+    if m:
+        return _make_date(m.group(3), MONTHS.get(m.group(2).lower()), m.group(1))
+    m = _MONTH_DAY.fullmatch(text)
+    if m:
+        return _make_date(m.group(3), MONTHS.get(m.group(1).lower()), m.group(2))
+    return None
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _fuzzy_iso(text):
+    try:
+        return dateparser.parse(text, fuzzy=True).date().isoformat()
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def normalize_date(text):
+    """ISO date (YYYY-MM-DD) for `text`, or None if it cannot be parsed."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    parsed = parse_exact(text)
+    if parsed:
+        _count("fast")
+        return parsed.isoformat()
+    iso = _fuzzy_iso(text)
+    _count("fuzzy" if iso else "failed")
+    return iso
+
+
+def stats():
+    info = _fuzzy_iso.cache_info()
+    with _lock:
+        return {**_counters, "memo_hits": info.hits, "memo_misses": info.misses,
+                "memo_size": info.currsize}
@@ -1,9 +1,10 @@
 import sqlite3
-import json
 from datetime import datetime
+from item_store import ItemStore
+from records import Job
 
 DB_PATH = "jobs.db"
-OUTPUT_PATH = "src/data/jobs_from_db.json" # Changed output path to an intermediate file
+STORE_PATH = "data/items.db"  # unified item store; combine_scraped_jobs.py exports from it
 
 conn = sqlite3.connect(DB_PATH)
 cur = conn.cursor()
@@ -23,17 +24,19 @@ for row in rows:
     # If company/location are not in your DB yet, they will be None or cause an error.
     # Adjust this unpacking if your DB schema is different.
     job_id, source, title, company, location, link, published, fetched_at = row
-    jobs.append({
-        "id": job_id,
-        "source": source,
-        "title": title,
-        "company": company if company else "",  # Use company from DB, default to empty string
-        "location": location if location else "", # Use location from DB, default to empty string
-        "link": link,
-        "date_posted": published or fetched_at
-    })
+    jobs.append(Job(
+        id=job_id,
+        source=source,
+        title=title,
+        company=company if company else "",  # Use company from DB, default to empty string
+        location=location if location else "", # Use location from DB, default to empty string
+        link=link,
+        date_posted=published or fetched_at
+    ))
 
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(jobs, f, ensure_ascii=False, indent=2)
+store = ItemStore(STORE_PATH)
+# jobs no longer in DB_PATH are removed from the store too
+changed, removed = store.sync("job", DB_PATH, (job.to_dict() for job in jobs))
+store.close()
 
-print(f"✅ {len(jobs)} jobs exported to {OUTPUT_PATH} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+print(f"✅ {len(jobs)} jobs synced to {STORE_PATH} ({changed} new or changed, {removed} removed) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
@@ -1,31 +1,40 @@
 import sqlite3
-import json
 from datetime import datetime
+from item_store import ItemStore
+from records import Job
 
 DB_PATH = "jobs_lokerid.db"
-OUTPUT_PATH = "src/data/jobs_from_lokerid.json"
+STORE_PATH = "data/items.db"  # unified item store; combine_scraped_jobs.py exports from it
 
-conn = sqlite3.connect(DB_PATH)
-cur = conn.cursor()
+def main():
+    """Sync the Loker.id jobs from DB_PATH into the item store; returns the number new, changed or removed."""
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
 
-cur.execute("SELECT id, title, company, location, link, date_posted, fetched_at FROM jobs ORDER BY id DESC")
-rows = cur.fetchall()
-conn.close()
+    cur.execute("SELECT id, title, company, location, link, date_posted, fetched_at FROM jobs ORDER BY id DESC")
+    rows = cur.fetchall()
+    conn.close()
 
-jobs = []
-for row in rows:
-    job_id, title, company, location, link, date_posted, fetched_at = row
-    jobs.append({
-        "id": f"job_lokerid_{job_id}", # Prefix ID to ensure uniqueness across sources
-        "source": "lokerid",
-        "title": title,
-        "company": company if company else "",
-        "location": location if location else "",
-        "link": link,
-        "date_posted": date_posted or fetched_at
-    })
+    jobs = []
+    for row in rows:
+        job_id, title, company, location, link, date_posted, fetched_at = row
+        jobs.append(Job(
+            id=f"job_lokerid_{job_id}", # Prefix ID to ensure uniqueness across sources
+            source="lokerid",
+            title=title,
+            company=company if company else "",
+            location=location if location else "",
+            link=link,
+            date_posted=date_posted or fetched_at
+        ))
 
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(jobs, f, ensure_ascii=False, indent=2)
+    store = ItemStore(STORE_PATH)
+    # jobs no longer in DB_PATH are removed from the store too
+    changed, removed = store.sync("job", DB_PATH, (job.to_dict() for job in jobs))
+    store.close()
 
-print(f"✅ {len(jobs)} jobs exported from Loker.id to {OUTPUT_PATH} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+    print(f"✅ {len(jobs)} jobs synced from Loker.id to {STORE_PATH} ({changed} new or changed, {removed} removed) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return changed + removed
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 import requests
-from bs4 import BeautifulSoup
 import sqlite3
 import hashlib
-import time
-import random
 from urllib.parse import urljoin
 import logging
+import os
+import threading
+import http_client
+import rate_limiter
+import run_metrics
+from html_parsing import make_soup
+from crawl_frontier import CrawlFrontier
 
 # --------- CONFIG ---------
 BASE_URL = "https://www.loker.id"
@@ -13,8 +17,13 @@ LISTING_URL = "https://www.loker.id/cari-lowongan-kerja"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115 Safari/537.36"
 }
-DELAY = 1.0  # jeda antar request (detik)
+DELAY = 1.0  # jeda minimum antar request (detik), batas atas untuk rate_limiter
 DB_PATH = "jobs_lokerid.db"
+SOURCE = "loker.id"
+MAX_PAGES = 10  # listing pages followed through pagination
+FRONTIER_PATH = "data/crawl_frontier.db"  # crawl progress, so interrupted runs resume
+BATCH_SIZE = 50  # jobs written per transaction
+REPORT_PATH = "data/lokerid.report.json"  # timings and per-host counters of the last run
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s - %(funcName)s')
@@ -43,37 +52,119 @@ def make_hash(title, company, location):
     s = "".join(ch for ch in s.lower() if ch.isalnum() or ch.isspace())
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
-def upsert_job(job):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    try:
-        cur.execute('''
-            INSERT INTO jobs (canonical_hash, title, company, location, link, date_posted)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            job["canonical_hash"], job["title"], job.get("company"),
-            job.get("location"), job["link"], job.get("date_posted")
-        ))
-        conn.commit()
-        logging.debug(f"Upserted job: {job['title']}")
-    except sqlite3.IntegrityError:
-        logging.debug(f"Job already exists, skipping: {job['title']}")
-    except Exception as e:
-        logging.error(f"Error upserting job {job.get('title', 'N/A')}: {e}")
-    finally:
-        conn.close()
+class JobWriter:
+    """Buffers jobs and upserts them into DB_PATH in one transaction per batch.
 
-# --------- Scrape daftar lowongan ---------
-def scrape_listings(max_items=50):
-    logging.info(f"Starting to scrape listings from {LISTING_URL}")
+    Keeps a single connection open. A job whose canonical_hash is already
+    stored refreshes that row (and its fetched_at) instead of being skipped.
+    A batch that cannot be written raises, leaving the crawl unfinished.
+    """
+
+    def __init__(self, path=DB_PATH, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.written = 0
+        self._rows = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def add(self, job):
+        with self._lock:
+            self._rows.append((
+                job["canonical_hash"], job["title"], job.get("company"),
+                job.get("location"), job["link"], job.get("date_posted")
+            ))
+            if len(self._rows) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        try:
+            with run_metrics.timer("write"), self._conn:
+                self._conn.executemany('''
+                    INSERT INTO jobs (canonical_hash, title, company, location, link, date_posted)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(canonical_hash) DO UPDATE SET
+                        title = excluded.title, company = excluded.company,
+                        location = excluded.location, link = excluded.link,
+                        date_posted = COALESCE(excluded.date_posted, jobs.date_posted),
+                        fetched_at = CURRENT_TIMESTAMP
+                ''', rows)
+        except sqlite3.Error as e:
+            # the crawl stops unfinished, so the next run re-adds these jobs from the frontier
+            logging.error(f"Error upserting {len(rows)} jobs: {e}")
+            raise
+        self.written += len(rows)
+        logging.debug(f"Upserted {len(rows)} jobs")
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --------- Scrape detail lowongan ---------
+def scrape_job_detail(title, full_link):
+    company = None
+    location = None
+    date_posted = None
+
+    # Fetch detail halaman untuk info lebih lanjut
     try:
-        resp = requests.get(LISTING_URL, headers=HEADERS, timeout=15)
-        resp.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+        r2 = http_client.get(full_link, headers=HEADERS, timeout=15)
+        r2.raise_for_status()
+        s2 = make_soup(r2.text)
+        
+        # Extract company using more specific selectors
+        comp_el = s2.select_one(".company, .employer, [data-qa='job-company-name'], .job-detail-company-name") 
+        if comp_el:
+            company = comp_el.get_text(strip=True)
+        
+        # Extract location using more specific selectors
+        loc_el = s2.select_one(".location, [data-qa='job-location'], .job-detail-location") 
+        if loc_el:
+            location = loc_el.get_text(strip=True)
+        
+        # Extract date posted using more specific selectors and datetime attribute
+        time_el = s2.select_one("time[datetime], .job-posted-date, .job-date") 
+        if time_el and time_el.has_attr("datetime"):
+            date_posted = time_el["datetime"]
+        elif time_el: # If no datetime attribute, try to parse text
+            date_posted = time_el.get_text(strip=True)
+
     except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to fetch listing page: {e}")
-        return
+        logging.warning(f"Error fetching detail page for {full_link}: {e}")
+    except Exception as e:
+        logging.error(f"Unexpected error during detail page parsing for {full_link}: {e}")
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    job = {
+        "title": title,
+        "company": company,
+        "location": location,
+        "link": full_link,
+        "date_posted": date_posted,
+    }
+    job["canonical_hash"] = make_hash(job["title"], job["company"], job["location"])
+    return job
+
+# --------- Scrape daftar lowongan ---------
+def parse_listing(html, page_url):
+    """(title, link) pairs of one listing page and the URL of the next page, if any."""
+    soup = make_soup(html)
     
     # More specific selectors for job posts.
     # These selectors are based on common patterns and might need adjustment
@@ -83,7 +174,7 @@ def scrape_listings(max_items=50):
         logging.warning("No specific job listing elements found. Falling back to generic 'div.card, article'.")
         posts = soup.select("div.card, article") # Fallback to generic if specific fails
 
-    count = 0
+    entries = []
     for p in posts:
         link = None
         title = None
@@ -103,58 +194,77 @@ def scrape_listings(max_items=50):
         if not link or not title:
             logging.debug("Skipping post due to missing link or title.")
             continue
+        entries.append((title, urljoin(BASE_URL, link)))
 
-        full_link = urljoin(BASE_URL, link)
-        
-        company = None
-        location = None
-        date_posted = None
+    next_el = soup.select_one("link[rel='next'], a[rel='next'], .pagination a.next, a.next")
+    next_url = urljoin(page_url, next_el["href"]) if next_el and next_el.get("href") else None
+    return entries, next_url
 
-        # Fetch detail halaman untuk info lebih lanjut
-        try:
-            time.sleep(random.uniform(DELAY, DELAY + 1.0))
-            r2 = requests.get(full_link, headers=HEADERS, timeout=15)
-            r2.raise_for_status()
-            s2 = BeautifulSoup(r2.text, "html.parser")
-            
-            # Extract company using more specific selectors
-            comp_el = s2.select_one(".company, .employer, [data-qa='job-company-name'], .job-detail-company-name") 
-            if comp_el:
-                company = comp_el.get_text(strip=True)
-            
-            # Extract location using more specific selectors
-            loc_el = s2.select_one(".location, [data-qa='job-location'], .job-detail-location") 
-            if loc_el:
-                location = loc_el.get_text(strip=True)
-            
-            # Extract date posted using more specific selectors and datetime attribute
-            time_el = s2.select_one("time[datetime], .job-posted-date, .job-date") 
-            if time_el and time_el.has_attr("datetime"):
-                date_posted = time_el["datetime"]
-            elif time_el: # If no datetime attribute, try to parse text
-                date_posted = time_el.get_text(strip=True)
+def scrape_listings(max_items=50, max_pages=MAX_PAGES):
+    """Crawl the listing pages (following pagination) and save every job found.
 
-        except requests.exceptions.RequestException as e:
-            logging.warning(f"Error fetching detail page for {full_link}: {e}")
-        except Exception as e:
-            logging.error(f"Unexpected error during detail page parsing for {full_link}: {e}")
-
-        job = {
-            "title": title,
-            "company": company,
-            "location": location,
-            "link": full_link,
-            "date_posted": date_posted,
-        }
-        job["canonical_hash"] = make_hash(job["title"], job["company"], job["location"])
-        upsert_job(job)
-
-        count += 1
-        if count >= max_items:
+    Progress is kept in the crawl frontier, so an interrupted run resumes
+    with the pages it had not finished yet. Jobs are written in batches.
+    """
+    run_metrics.reset()
+    rate_limiter.set_max_rate(BASE_URL, 1 / DELAY)
+    frontier = CrawlFrontier(FRONTIER_PATH)
+    try:
+        with JobWriter() as writer:
+            _crawl(frontier, writer, max_items, max_pages)
+    finally:
+        frontier.close()
+    logging.info(f"Saved {writer.written} jobs from Loker.id to {DB_PATH}")
+    http_client.log_stats()
+    run_metrics.count("items", writer.written)
+    run_metrics.write_report(REPORT_PATH, "lokerid", output=DB_PATH)
+
+def _crawl(frontier, writer, max_items, max_pages):
+    if frontier.begin(SOURCE, [LISTING_URL]):
+        logging.info(f"Resuming interrupted crawl of {SOURCE}")
+        # jobs of an unflushed batch were lost with the interrupted run; the frontier kept them
+        for job in frontier.iter_results(SOURCE):
+            writer.add(job)
+    logging.info(f"Starting to scrape listings from {LISTING_URL}")
+
+    def crawl_details():
+        while frontier.count(SOURCE, "detail", "done") < max_items:
+            page = frontier.next_pending(SOURCE, "detail")
+            if page is None:
+                return
+            full_link, title = page
+            job = scrape_job_detail(title, full_link)
+            frontier.mark_done(SOURCE, full_link, job)
+            writer.add(job)
+
+    crawl_details()
+    while (frontier.count(SOURCE, "listing", "done") < max_pages
+           and frontier.count(SOURCE, "detail", "done") < max_items):
+        page = frontier.next_pending(SOURCE, "listing")
+        if page is None:
             break
+        page_url = page[0]
+        try:
+            resp = http_client.get(page_url, headers=HEADERS, timeout=15)
+            resp.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch listing page {page_url}: {e}")
+            frontier.mark_failed(SOURCE, page_url, e)
+            continue
+
+        entries, next_url = parse_listing(resp.text, page_url)
+        for title, full_link in entries:
+            frontier.add(SOURCE, full_link, "detail", title)
+        if next_url:
+            frontier.add(SOURCE, next_url, "listing")
+        frontier.mark_done(SOURCE, page_url)
+        crawl_details()
 
-    logging.info(f"Scraped and saved {count} jobs from Loker.id")
+    count = frontier.count(SOURCE, "detail", "done")
+    frontier.finish(SOURCE)
+    logging.info(f"Scraped {count} jobs from Loker.id")
 
 if __name__ == "__main__":
+    os.makedirs(os.path.dirname(FRONTIER_PATH), exist_ok=True)
     init_db()
     scrape_listings(max_items=100)
\ No newline at end of file
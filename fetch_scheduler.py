@@ -0,0 +1,57 @@
+"""Concurrent fetch scheduling shared by the scraping scripts.
+
+Every source lives on its own host, so sources can run side by side while
+requests to the same host are spaced out by rate_limiter (in http_client).
+On Ctrl-C the running sources stop before their next request (see
+stopping()) and the sources not started yet are cancelled.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# -------- CONFIG ----------
+MAX_WORKERS = 5  # number of sources scraped at the same time
+# ---------------------------
+
+_stop = threading.Event()
+
+
+def stopping():
+    """Whether the run was interrupted; crawl loops check this before each request."""
+    return _stop.is_set()
+
+
+def run_sources(sources, max_workers=MAX_WORKERS):
+    """Run `(name, callable)` pairs in a bounded thread pool.
+
+    Returns `(results, timings)`: the items of each source in the order the
+    sources were given, and per-source wall-clock seconds, item counts and errors.
+    """
+    def run_one(name, fn):
+        started = time.perf_counter()
+        error = None
+        items = []
+        try:
+            items = fn() or []
+        except Exception as e:
+            logging.exception(f"Error scraping {name}")
+            error = str(e)
+        elapsed = time.perf_counter() - started
+        logging.info(f"[{name}] finished in {elapsed:.1f}s with {len(items)} items")
+        return items, {"seconds": round(elapsed, 3), "items": len(items), "error": error}
+
+    _stop.clear()
+    results, timings = {}, {}
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="source")
+    try:
+        futures = [(name, pool.submit(run_one, name, fn)) for name, fn in sources]
+        for name, fut in futures:
+            results[name], timings[name] = fut.result()
+    except KeyboardInterrupt:
+        logging.warning("Interrupted, stopping the sources after their current request")
+        _stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results, timings
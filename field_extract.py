@@ -0,0 +1,97 @@
+"""Organizer / deadline / location extraction from article text.
+
+Shared by scrape_scholarships_to_json.py and the standalone scrapers. All
+patterns are compiled once. Labelled fields ("Penyelenggara: ...",
+"Deadline: ...", "Lokasi: ...") are found in a single pass over the colons
+of the text instead of one full regex scan per field, and the location
+keywords are checked against one lowercased copy.
+"""
+import re
+
+from date_normalize import parse_exact
+
+ORGANIZER_LABELS = ("penyelenggara", "organized by", "oleh")
+DEADLINE_LABELS = ("deadline", "batas waktu pendaftaran", "pendaftaran hingga", "sampai dengan")
+LOCATION_LABELS = ("lokasi", "tempat", "negara", "kota", "wilayah")
+
+CITIES = ["Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Makassar", "Semarang", "Denpasar"]
+# checked in order, the first location with a keyword in the text wins
+LOCATION_KEYWORDS = [
+    ("Online", ("online", "daring", "virtual")),
+    ("Remote", ("remote", "dari rumah")),
+    ("Indonesia", ("indonesia", "dalam negeri")),
+    ("Internasional", ("luar negeri", "internasional")),
+] + [(city, (city.lower(),)) for city in CITIES]
+
+_LABELS = ([(label, "organizer") for label in ORGANIZER_LABELS]
+           + [(label, "deadline") for label in DEADLINE_LABELS]
+           + [(label, "location") for label in LOCATION_LABELS])
+_MAX_LABEL_LEN = max(len(label) for label, _ in _LABELS)
+
+# value after "<label>:" -- the rest of the line (skipping leading whitespace and blank lines)
+_LINE_VALUE = re.compile(r"\s*([^\n]*)")
+_DEADLINE_VALUE = re.compile(r"\s*(\d{1,2}\s+\w+\s+\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})")
+
+# any date-like string, tried in this order when no deadline label is present
+DATE_PATTERNS = [
+    re.compile(r'\b(\d{1,2}\s+(?:Januari|Februari|Maret|April|Mei|Juni|Juli|Agustus|September|Oktober|November|Desember)\s+\d{4})\b', re.IGNORECASE),
+    re.compile(r'\b(\d{4}-\d{2}-\d{2})\b'),
+    re.compile(r'\b(\d{1,2}/\d{1,2}/\d{4})\b'),
+]
+
+
+def scan_labels(text, organizer_labels=ORGANIZER_LABELS):
+    """First value of each labelled field, e.g. {"organizer": ..., "deadline": "12 Mei 2025"}.
+
+    A "Deadline:" label only counts when a date follows it; otherwise the
+    next deadline label is tried. Labels are matched case-insensitively.
+    """
+    found = {}
+    pos = text.find(":")
+    while pos != -1 and len(found) < 3:
+        tail = text[max(0, pos - _MAX_LABEL_LEN):pos].lower()
+        for label, field in _LABELS:
+            if field in found or not tail.endswith(label):
+                continue
+            if field == "organizer" and label not in organizer_labels:
+                continue
+            m = (_DEADLINE_VALUE if field == "deadline" else _LINE_VALUE).match(text, pos + 1)
+            if m:
+                found[field] = m.group(1).strip()
+                break
+        pos = text.find(":", pos + 1)
+    return found
+
+
+def guess_location(text):
+    """Location implied by keywords in `text` (online, a city, ...), or None."""
+    lower = text.lower()
+    for location, keywords in LOCATION_KEYWORDS:
+        for keyword in keywords:
+            if keyword in lower:
+                return location
+    return None
+
+
+def extract_fields(text, organizer_labels=ORGANIZER_LABELS):
+    """Organizer, raw deadline string and location of an article; None when absent."""
+    found = scan_labels(text, organizer_labels)
+    location = found.get("location")
+    if location is None:
+        location = guess_location(text)
+    return {
+        "organizer": found.get("organizer"),
+        "deadline": found.get("deadline"),
+        "location": location,
+    }
+
+
+def find_date(text):
+    """First date-like string in `text` that parses as an exact date, as a date."""
+    for pattern in DATE_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            parsed = parse_exact(m.group(1))
+            if parsed:
+                return parsed
+    return None
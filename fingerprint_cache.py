@@ -0,0 +1,116 @@
+"""Fingerprint cache: reuse derived records whose input did not change.
+
+For every (stage, item id) it keeps a hash of the input the record was
+derived from (a detail page body, a raw item) together with the record
+itself. When the next run sees the same hash, the stored record is reused
+instead of parsing or normalizing again, so the record - including
+timestamps taken when it was built, like scraped_at - stays byte-identical
+and outputs only change when content does. When an item was last seen is
+tracked here (`last_seen`), not in the outputs.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# -------- CONFIG ----------
+FINGERPRINT_PATH = "data/fingerprints.db"
+SCHEMA_VERSION = 2  # bump after changing a parser or normalize_item(), so stored records are rebuilt
+# ---------------------------
+
+# parts of a page that change on every request without changing its content
+_BOILERPLATE = re.compile(r"<script\b.*?</script>|<style\b.*?</style>|<noscript\b.*?</noscript>|<!--.*?-->",
+                          re.S | re.I)
+_SPACE = re.compile(r"\s+")
+
+
+def body_fingerprint(html):
+    """Hash of a page body with scripts, styles, comments and whitespace runs stripped."""
+    text = _SPACE.sub(" ", _BOILERPLATE.sub("", html or ""))
+    return hashlib.sha1(f"{SCHEMA_VERSION}|{text}".encode("utf-8")).hexdigest()
+
+
+def record_fingerprint(item, ignore=()):
+    """Hash of a dict's content, leaving out the keys in `ignore`."""
+    stable = {k: v for k, v in item.items() if k not in ignore}
+    body = json.dumps(stable, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(f"{SCHEMA_VERSION}|{body}".encode("utf-8")).hexdigest()
+
+
+class FingerprintCache:
+    def __init__(self, path=FINGERPRINT_PATH):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._seen = {}  # (stage, id) -> last_seen, written on flush()/close()
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            stage TEXT,
+            id TEXT,
+            hash TEXT,
+            record TEXT,
+            first_seen TEXT,
+            last_seen TEXT,
+            PRIMARY KEY (stage, id)
+        )''')
+        self._conn.commit()
+
+    def lookup(self, stage, item_id, fingerprint):
+        """The record stored for `item_id` if it was derived from input with this fingerprint, else None."""
+        with self._lock:
+            row = self._conn.execute("SELECT hash, record FROM fingerprints WHERE stage = ? AND id = ?",
+                                     (stage, item_id)).fetchone()
+            if row and row[0] == fingerprint:
+                self.hits += 1
+                self._seen[(stage, item_id)] = datetime.utcnow().isoformat()
+                return json.loads(row[1])
+            self.misses += 1
+            return None
+
+    def store(self, stage, item_id, fingerprint, record):
+        now = datetime.utcnow().isoformat()
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO fingerprints (stage, id, hash, record, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(stage, id) DO UPDATE SET
+                    hash = excluded.hash, record = excluded.record, last_seen = excluded.last_seen''',
+                (stage, item_id, fingerprint, json.dumps(record, ensure_ascii=False), now, now))
+            self._seen.pop((stage, item_id), None)
+        return record
+
+    def reuse(self, stage, item_id, fingerprint, build):
+        """The stored record for this fingerprint, or `build()` stored under it."""
+        record = self.lookup(stage, item_id, fingerprint)
+        if record is None:
+            record = self.store(stage, item_id, fingerprint, build())
+        return record
+
+    def last_seen(self, stage, item_id):
+        with self._lock:
+            if (stage, item_id) in self._seen:
+                return self._seen[(stage, item_id)]
+            row = self._conn.execute("SELECT last_seen FROM fingerprints WHERE stage = ? AND id = ?",
+                                     (stage, item_id)).fetchone()
+        return row[0] if row else None
+
+    def flush(self):
+        """Write the last_seen times of the records reused since the last flush."""
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE fingerprints SET last_seen = ? WHERE stage = ? AND id = ?",
+                                   [(seen, stage, item_id) for (stage, item_id), seen in self._seen.items()])
+            self._seen.clear()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
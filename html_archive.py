@@ -0,0 +1,188 @@
+"""Append-only archive of fetched pages, for re-parsing without fetching again.
+
+Archiving is opt-in, as the file is never rotated or pruned: run the scraper
+or scheduler_daemon.py with --archive, or set SCRAPER_ARCHIVE=1 for any
+script. Every response http_client then gets from the network (not the
+bodies it takes from its cache after a 304) is appended to ARCHIVE_PATH as a WARC/1.0
+"response" record: URL, fetch time, HTTP status line and headers, body.
+Each record is a gzip member of its own, so the file is an ordinary
+.warc.gz that WARC tools can read, and a single record can be read from its
+offset without decompressing the rest. The SQLite index at INDEX_PATH maps
+URLs to the offset and length of their records. A body identical to the
+last one archived for its URL is not stored again.
+
+Bodies are stored decoded: Content-Encoding and Transfer-Encoding are
+dropped from the stored headers and Content-Length is the decoded size.
+reparse.py streams the archive through the current parsers.
+"""
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+from requests.utils import get_encoding_from_headers
+
+# -------- CONFIG ----------
+ARCHIVE_ENABLED = os.environ.get("SCRAPER_ARCHIVE") == "1"  # http_client archives every page it downloads
+ARCHIVE_PATH = "data/archive/pages.warc.gz"
+INDEX_PATH = "data/archive/index.db"
+COMPRESS_LEVEL = 6  # gzip level per record; 9 is ~2x slower for a few % smaller
+# ---------------------------
+
+# describe the transfer, not the decoded body we store
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def payload_digest(body):
+    return "sha1:" + base64.b32encode(hashlib.sha1(body).digest()).decode("ascii")
+
+
+def _warc_record(url, status, reason, headers, body, fetched_at, digest):
+    http_head = f"HTTP/1.1 {status} {reason or ''}".rstrip() + "\r\n"
+    http_head += "".join(f"{k}: {v}\r\n" for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS)
+    http_head += f"Content-Length: {len(body)}\r\n\r\n"
+    block = http_head.encode("iso-8859-1", "replace") + body
+    warc_head = ("WARC/1.0\r\n"
+                 "WARC-Type: response\r\n"
+                 f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+                 f"WARC-Date: {fetched_at}\r\n"
+                 f"WARC-Target-URI: {url}\r\n"
+                 f"WARC-Payload-Digest: {digest}\r\n"
+                 "Content-Type: application/http; msgtype=response\r\n"
+                 f"Content-Length: {len(block)}\r\n\r\n")
+    return warc_head.encode("utf-8") + block + b"\r\n\r\n"
+
+
+def _header_lines(lines):
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip()] = value.strip()
+    return headers
+
+
+def parse_record(data):
+    """{"url", "fetched_at", "status", "headers", "body"} of one decompressed WARC record."""
+    head, _, rest = data.partition(b"\r\n\r\n")
+    warc = {k.lower(): v for k, v in _header_lines(head.decode("utf-8").split("\r\n")[1:]).items()}
+    block = rest[:int(warc["content-length"])]
+    http_head, _, body = block.partition(b"\r\n\r\n")
+    lines = http_head.decode("iso-8859-1").split("\r\n")
+    return {
+        "url": warc["warc-target-uri"],
+        "fetched_at": warc["warc-date"],
+        "status": int(lines[0].split(" ", 2)[1]),
+        "headers": _header_lines(lines[1:]),
+        "body": body,
+    }
+
+
+def read_record(offset, length, path=None):
+    """The record stored at `offset` (see parse_record())."""
+    with open(path or ARCHIVE_PATH, "rb") as f:
+        f.seek(offset)
+        return parse_record(gzip.decompress(f.read(length)))
+
+
+def record_text(record):
+    """The body of a record as text, decoded like requests' `response.text`."""
+    encoding = get_encoding_from_headers(record["headers"]) or "utf-8"
+    try:
+        return record["body"].decode(encoding, errors="replace")
+    except LookupError:
+        return record["body"].decode("utf-8", errors="replace")
+
+
+class PageArchive:
+    def __init__(self, path=None, index_path=None):
+        self.path = path or ARCHIVE_PATH
+        index_path = index_path or INDEX_PATH
+        for p in (self.path, index_path):
+            if os.path.dirname(p):
+                os.makedirs(os.path.dirname(p), exist_ok=True)
+        self.stored = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        # autocommit mode: append() takes the write lock itself with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(index_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS pages (
+            id INTEGER PRIMARY KEY,
+            url TEXT,
+            status INTEGER,
+            fetched_at TEXT,
+            offset INTEGER,
+            length INTEGER,
+            digest TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, id);
+        ''')
+
+    def append(self, url, status, reason, headers, body, fetched_at=None):
+        """Archive one response; returns False when its body equals the URL's last archived one."""
+        digest = payload_digest(body)
+        fetched_at = fetched_at or datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self._lock:
+            # the index transaction also serializes appends of other processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT digest FROM pages WHERE url = ? ORDER BY id DESC LIMIT 1",
+                                         (url,)).fetchone()
+                if row and row[0] == digest:
+                    self._conn.execute("COMMIT")
+                    self.skipped += 1
+                    return False
+                data = gzip.compress(_warc_record(url, status, reason, headers, body, fetched_at, digest),
+                                     COMPRESS_LEVEL)
+                with open(self.path, "ab") as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(data)
+                self._conn.execute('''INSERT INTO pages (url, status, fetched_at, offset, length, digest)
+                                      VALUES (?, ?, ?, ?, ?, ?)''',
+                                   (url, status, fetched_at, offset, len(data), digest))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stored += 1
+            return True
+
+    def latest(self, url, status=200):
+        """(offset, length) of the newest record of `url` with `status`, or None."""
+        with self._lock:
+            return self._conn.execute('''SELECT offset, length FROM pages WHERE url = ? AND status = ?
+                                         ORDER BY id DESC LIMIT 1''', (url, status)).fetchone()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
+
+
+def record(url, response):
+    """Archive a requests response fetched for `url`; never raises."""
+    try:
+        get_archive().append(url, response.status_code, response.reason, response.headers, response.content)
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Could not archive {url}: {e}")
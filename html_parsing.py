@@ -0,0 +1,78 @@
+"""HTML parsing helpers: fastest available tree builder and a parse process pool.
+
+lxml builds BeautifulSoup trees several times faster than the pure-Python
+"html.parser" backend; it is used when installed. Detail pages can also be
+parsed in a process pool so CPU-bound parsing does not hold the GIL while
+the fetch threads wait on the network.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+import run_metrics
+
+try:
+    import lxml  # noqa: F401  (optional, see requirements.txt)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# -------- CONFIG ----------
+PARSE_WORKERS = min(4, os.cpu_count() or 1)  # 0 parses inline in the calling thread
+# ---------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def make_soup(html, parser=None):
+    with run_metrics.timer("parse"):
+        return BeautifulSoup(html, parser or HTML_PARSER)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs fetch threads can deadlock
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(shutdown_pool)
+        return _pool
+
+
+def parse_in_pool(fn, *args):
+    """Run `fn(*args)` in the parse process pool and wait for the result.
+
+    `fn` must be a module-level function. Falls back to an inline call when
+    the pool is disabled or broken.
+    """
+    if PARSE_WORKERS <= 0:
+        return fn(*args)
+    try:
+        future = _get_pool().submit(_run_measured, fn, *args)
+    except Exception as e:
+        logging.warning(f"Parse pool unavailable, parsing inline: {e}")
+        return fn(*args)
+    result, stages = future.result()
+    run_metrics.merge_stages(stages)
+    return result
+
+
+def _run_measured(fn, *args):
+    """Worker side of parse_in_pool(): the result plus the stage timings it took."""
+    run_metrics.reset()
+    return fn(*args), run_metrics.stage_totals()
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
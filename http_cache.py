@@ -0,0 +1,163 @@
+"""On-disk HTTP cache with conditional revalidation.
+
+Responses that carry an ETag or Last-Modified header are stored per URL.
+The next request for that URL sends If-None-Match / If-Modified-Since and,
+when the server answers 304 Not Modified, the stored body is used instead
+of downloading the page again. Old entries are evicted by age and by total
+cache size.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+# -------- CONFIG ----------
+CACHE_DIR = "cache/http"
+MAX_AGE_DAYS = 30  # entries not revalidated for this long are dropped
+MAX_CACHE_BYTES = 200 * 1024 * 1024  # total size budget for stored bodies
+# ---------------------------
+
+_lock = threading.Lock()
+_evicted = False
+_counters = {"revalidated": 0, "stored": 0, "misses": 0}
+
+
+def _paths(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    folder = os.path.join(CACHE_DIR, key[:2])
+    return folder, os.path.join(folder, key + ".json"), os.path.join(folder, key + ".body")
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def lookup(url):
+    """Return the stored metadata for `url`, or None."""
+    _maybe_evict()
+    _, meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        _count("misses")
+        return None
+    if not os.path.exists(body_path):
+        _count("misses")
+        return None
+    return meta
+
+
+def conditional_headers(meta):
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def load_body(url):
+    _, _, body_path = _paths(url)
+    with open(body_path, "rb") as f:
+        return f.read()
+
+
+def store(url, response):
+    """Store a 200 response if it has validators. Returns True when stored."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.status_code != 200 or not (etag or last_modified):
+        return False
+    folder, meta_path, body_path = _paths(url)
+    os.makedirs(folder, exist_ok=True)
+    now = time.time()
+    meta = {
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "encoding": response.encoding,
+        "content_type": response.headers.get("Content-Type", ""),
+        "size": len(response.content),
+        "stored_at": now,
+        "validated_at": now,
+    }
+    _write_atomic(body_path, response.content)
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    _count("stored")
+    return True
+
+
+def mark_revalidated(url, meta):
+    """Record a 304 for `url` so age-based eviction keeps the entry."""
+    _, meta_path, _ = _paths(url)
+    meta["validated_at"] = time.time()
+    try:
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError as e:
+        logging.warning(f"Could not update cache entry for {url}: {e}")
+    _count("revalidated")
+
+
+def evict(max_age_days=MAX_AGE_DAYS, max_bytes=MAX_CACHE_BYTES):
+    """Drop entries older than `max_age_days`, then the least recently validated
+    entries until the cache fits in `max_bytes`. Returns the number removed."""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    entries = []
+    for folder, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(folder, name)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            entries.append((meta.get("validated_at", 0), meta.get("size", 0), meta_path))
+
+    removed = 0
+    total = sum(size for _, size, _ in entries)
+    for validated_at, size, meta_path in sorted(entries):
+        if validated_at >= cutoff and total <= max_bytes:
+            break
+        for path in (meta_path, meta_path[:-len(".json")] + ".body"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    if removed:
+        logging.info(f"HTTP cache: evicted {removed} entries")
+    return removed
+
+
+def _maybe_evict():
+    """Run one eviction sweep per process, on first use of the cache."""
+    global _evicted
+    with _lock:
+        if _evicted:
+            return
+        _evicted = True
+    try:
+        evict()
+    except Exception as e:
+        logging.warning(f"HTTP cache eviction failed: {e}")
+
+
+def stats():
+    with _lock:
+        return dict(_counters)
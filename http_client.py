@@ -0,0 +1,149 @@
+"""Shared HTTP client for the scraping scripts.
+
+All scripts go through one `requests.Session`, which keeps a keep-alive
+connection pool per host. Listing and detail pages on the same site then
+reuse one TCP/TLS connection instead of handshaking for every request.
+GET requests are revalidated against the on-disk cache in http_cache.
+Every request waits for its host's slot in rate_limiter, which also decides
+how long to back off before a retry. Requests are timed and counted per host
+in run_metrics, and downloaded pages are appended to html_archive when
+archiving is enabled.
+"""
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING  # includes "br" when brotli is installed
+
+import html_archive
+import http_cache
+import rate_limiter
+import run_metrics
+
+# -------- CONFIG ----------
+POOL_CONNECTIONS = 10  # number of hosts that keep a pool
+POOL_MAXSIZE = 5  # idle keep-alive connections kept per host
+DEFAULT_TIMEOUT = 15
+USE_CACHE = True  # revalidate with ETag/Last-Modified instead of re-downloading
+RETRIES = 2  # extra attempts after a 429, a 5xx or a connection error
+# ---------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session(pool_connections, pool_maxsize):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    return session
+
+
+def configure(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """(Re)create the shared session with the given pool sizes."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = _build_session(pool_connections, pool_maxsize)
+    return _session
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session(POOL_CONNECTIONS, POOL_MAXSIZE)
+        return _session
+
+
+def _send(url, headers, timeout, retries, **kwargs):
+    """One rate-limited GET, retried on throttling, server errors and connection errors."""
+    for attempt in range(retries + 1):
+        if attempt:
+            run_metrics.record_retry(url)
+        rate_limiter.wait(url)
+        try:
+            with run_metrics.timer("fetch"):
+                r = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            run_metrics.record_error(url)
+            rate_limiter.feedback(url, None)
+            if attempt == retries:
+                raise
+            logging.warning(f"GET {url} failed, retrying: {e}")
+            continue
+        run_metrics.record_response(url, r.status_code, len(r.content), cached=r.status_code == 304)
+        rate_limiter.feedback(url, r.status_code, r.headers.get("Retry-After"))
+        if attempt == retries or not rate_limiter.should_retry(r.status_code):
+            return r
+        logging.warning(f"GET {url} returned status {r.status_code}, retrying")
+
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, use_cache=None, retries=None, **kwargs):
+    """GET `url` through the shared session. Same arguments as `requests.get`.
+
+    With the cache enabled, a 304 answer is turned into a 200 response that
+    carries the stored body; `response.from_cache` tells the two apart.
+    A 429, a 5xx or a connection error is retried up to `retries` times
+    (default RETRIES) after the host's backoff.
+    """
+    if use_cache is None:
+        use_cache = USE_CACHE
+    if retries is None:
+        retries = RETRIES
+    meta = http_cache.lookup(url) if use_cache else None
+    send_headers = {**(headers or {}), **http_cache.conditional_headers(meta)} if meta else headers
+    r = _send(url, send_headers, timeout, retries, **kwargs)
+    r.from_cache = False
+    if meta and r.status_code == 304:
+        try:
+            r._content = http_cache.load_body(url)
+        except OSError as e:
+            logging.warning(f"Cached body for {url} is unreadable, refetching: {e}")
+            return get(url, headers=headers, timeout=timeout, use_cache=False, retries=retries, **kwargs)
+        r.status_code = 200
+        r.encoding = meta.get("encoding") or r.encoding
+        r.from_cache = True
+        http_cache.mark_revalidated(url, meta)
+    elif use_cache and r.status_code == 200:
+        try:
+            http_cache.store(url, r)
+        except OSError as e:
+            logging.warning(f"Could not cache {url}: {e}")
+    if html_archive.ARCHIVE_ENABLED and not r.from_cache:
+        html_archive.record(url, r)
+    return r
+
+
+def stats():
+    """Connection reuse per host: requests sent, connections opened, requests that reused one."""
+    per_host = {}
+    session = _session
+    if session is None:
+        return {"requests": 0, "connections": 0, "reused": 0, "hosts": per_host}
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = per_host.setdefault(pool.host, {"requests": 0, "connections": 0})
+            host["requests"] += pool.num_requests
+            host["connections"] += pool.num_connections
+    for host in per_host.values():
+        host["reused"] = max(0, host["requests"] - host["connections"])
+    total = {k: sum(h[k] for h in per_host.values()) for k in ("requests", "connections", "reused")}
+    return {**total, "hosts": per_host}
+
+
+def log_stats():
+    s = stats()
+    c = http_cache.stats()
+    logging.info(f"HTTP: {s['requests']} requests over {s['connections']} connections "
+                 f"({s['reused']} reused); cache: {c['revalidated']} not modified, "
+                 f"{c['stored']} stored, {c['misses']} misses")
+    return {**s, "cache": c}
@@ -0,0 +1,240 @@
+"""Unified SQLite store for scraped scholarships and jobs.
+
+Every stage upserts its items here instead of handing whole JSON files to
+the next one. Each row keeps a hash of its content; an upsert that does not
+change the content leaves the row alone, and one that does gives the row a
+new revision number. Exports remember the last revision they wrote, so
+`changes()` returns only the rows changed since then: a stage does work
+only for those rows, and skips its export when there are none. The JSON
+files themselves are still written whole, since the app loads each as one
+sorted array.
+
+Stages that mirror a whole input (a database, a JSON file) sync() it under
+an origin name: rows of that origin missing from the input are removed.
+Removed rows stay behind as tombstones with a new revision, so exports
+still see that something changed.
+"""
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from ndjson_io import write_json_array
+
+# -------- CONFIG ----------
+STORE_PATH = "data/items.db"
+VOLATILE_FIELDS = ("scraped_at", "fetched_at")  # not part of the content hash
+# ---------------------------
+
+
+def content_hash(item):
+    stable = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(stable, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ItemStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS items (
+            kind TEXT,
+            id TEXT,
+            source TEXT,
+            date_posted TEXT,
+            hash TEXT,
+            data TEXT,
+            rev INTEGER,
+            updated_at TEXT,
+            PRIMARY KEY (kind, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_items_id ON items (id);
+        CREATE INDEX IF NOT EXISTS idx_items_source ON items (kind, source);
+        CREATE INDEX IF NOT EXISTS idx_items_date ON items (kind, date_posted);
+        CREATE INDEX IF NOT EXISTS idx_items_rev ON items (kind, rev);
+        CREATE INDEX IF NOT EXISTS idx_items_page ON items (kind, date_posted DESC, rev, id);
+        CREATE TABLE IF NOT EXISTS exports (
+            name TEXT PRIMARY KEY,
+            rev INTEGER,
+            exported_at TEXT
+        );
+        ''')
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+        if "origin" not in columns:
+            self._conn.execute("ALTER TABLE items ADD COLUMN origin TEXT")
+        if "deleted" not in columns:
+            self._conn.execute("ALTER TABLE items ADD COLUMN deleted INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_items_origin ON items (kind, origin)")
+        self._conn.commit()
+
+    def upsert_many(self, kind, items, batch=500, origin=None):
+        """Insert or update `items` (dicts with an "id"; any iterable) in transactions of `batch` rows.
+
+        Rows whose content is unchanged keep their revision. Returns the
+        number of rows inserted or changed.
+        """
+        items = iter(items)
+        changed = 0
+        with self._lock:
+            rev = self._conn.execute("SELECT COALESCE(MAX(rev), 0) + 1 FROM items").fetchone()[0]
+            while True:
+                chunk = list(itertools.islice(items, batch))
+                if not chunk:
+                    return changed
+                now = datetime.utcnow().isoformat()
+                rows = [(it["id"], kind, it.get("source"), it.get("date_posted") or "", content_hash(it),
+                         json.dumps(it, ensure_ascii=False), rev, now, origin)
+                        for it in chunk if it.get("id")]
+                before = self._conn.total_changes
+                with self._conn:
+                    self._conn.executemany('''
+                        INSERT INTO items (id, kind, source, date_posted, hash, data, rev, updated_at, origin)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(kind, id) DO UPDATE SET
+                            source = excluded.source, date_posted = excluded.date_posted,
+                            hash = excluded.hash, data = excluded.data,
+                            rev = excluded.rev, updated_at = excluded.updated_at,
+                            origin = excluded.origin, deleted = 0
+                        WHERE items.hash != excluded.hash OR items.deleted
+                            OR items.origin IS NOT excluded.origin''', rows)
+                changed += self._conn.total_changes - before
+
+    def sync(self, kind, origin, items, batch=500):
+        """Make the items of `kind` from `origin` exactly `items`: upsert them and remove the others.
+
+        Returns (rows inserted or changed, rows removed).
+        """
+        seen = set()
+
+        def tracked():
+            for it in items:
+                if it.get("id"):
+                    seen.add(it["id"])
+                yield it
+
+        changed = self.upsert_many(kind, tracked(), batch, origin)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM seen")
+            self._conn.executemany("INSERT OR IGNORE INTO seen (id) VALUES (?)", ((i,) for i in seen))
+            rev = self._conn.execute("SELECT COALESCE(MAX(rev), 0) + 1 FROM items").fetchone()[0]
+            removed = self._conn.execute('''UPDATE items SET deleted = 1, rev = ?, updated_at = ?
+                                            WHERE kind = ? AND origin = ? AND NOT deleted
+                                                AND id NOT IN (SELECT id FROM seen)''',
+                                         (rev, datetime.utcnow().isoformat(), kind, origin)).rowcount
+            self._conn.execute("DELETE FROM seen")
+        return changed, removed
+
+    def remove(self, kind, ids):
+        """Remove the items `ids` of `kind` (as tombstones, see sync()); returns the number removed."""
+        ids = list(ids)
+        if not ids:
+            return 0
+        with self._lock, self._conn:
+            rev = self._conn.execute("SELECT COALESCE(MAX(rev), 0) + 1 FROM items").fetchone()[0]
+            now = datetime.utcnow().isoformat()
+            before = self._conn.total_changes
+            self._conn.executemany('''UPDATE items SET deleted = 1, rev = ?, updated_at = ?
+                                      WHERE kind = ? AND id = ? AND NOT deleted''',
+                                   ((rev, now, kind, item_id) for item_id in ids))
+            return self._conn.total_changes - before
+
+    def get(self, kind, item_id, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM items WHERE kind = ? AND id = ? AND NOT deleted",
+                                     (kind, item_id)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def count(self, kind):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items WHERE kind = ? AND NOT deleted",
+                                      (kind,)).fetchone()[0]
+
+    def iter_items(self, kind, batch=500):
+        """Items of `kind`, newest date_posted first, read in batches."""
+        with self._lock:
+            rows = self._conn.execute('''SELECT date_posted, rev, id, data FROM items
+                                         WHERE kind = ? AND NOT deleted
+                                         ORDER BY date_posted DESC, rev, id LIMIT ?''',
+                                      (kind, batch)).fetchall()
+        while rows:
+            for row in rows:
+                yield json.loads(row[3])
+            # keyset paging: continue after the last row instead of counting an OFFSET
+            date_posted, rev, item_id = rows[-1][:3]
+            with self._lock:
+                rows = self._conn.execute('''SELECT date_posted, rev, id, data FROM items
+                                             WHERE kind = ? AND NOT deleted
+                                                 AND (date_posted < ? OR (date_posted = ? AND
+                                                      (rev > ? OR (rev = ? AND id > ?))))
+                                             ORDER BY date_posted DESC, rev, id LIMIT ?''',
+                                          (kind, date_posted, date_posted, rev, rev, item_id, batch)).fetchall()
+
+    def changes(self, name, kind):
+        """(items of `kind` changed since export `name` last ran, ids of the items removed since then,
+        revision to pass to mark_exported).
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT rev FROM exports WHERE name = ?", (name,)).fetchone()
+            since = row[0] if row else 0
+            rows = self._conn.execute('''SELECT rev, deleted, data FROM items WHERE kind = ? AND rev > ?
+                                         ORDER BY rev''', (kind, since)).fetchall()
+        rev = rows[-1][0] if rows else since
+        changed, removed = [], []
+        for _, deleted, data in rows:
+            item = json.loads(data)
+            if deleted:
+                removed.append(item["id"])
+            else:
+                changed.append(item)
+        return changed, removed, rev
+
+    def pending(self, name, kind):
+        """Number of items of `kind` changed or removed since export `name` last ran."""
+        with self._lock:
+            row = self._conn.execute("SELECT rev FROM exports WHERE name = ?", (name,)).fetchone()
+            return self._conn.execute("SELECT COUNT(*) FROM items WHERE kind = ? AND rev > ?",
+                                      (kind, row[0] if row else 0)).fetchone()[0]
+
+    def mark_exported(self, name, rev):
+        with self._lock, self._conn:
+            self._conn.execute('''INSERT OR REPLACE INTO exports (name, rev, exported_at)
+                                  VALUES (?, ?, ?)''', (name, rev, datetime.utcnow().isoformat()))
+
+    def export_json(self, name, kind, path, force=False, keep=None, tap=None):
+        """Write all items of `kind` to `path` as a JSON array, if any changed or were removed since the last export.
+
+        The file is rewritten whole, not patched: it is one array sorted by
+        date, and the search index and static export taps need every item.
+        Items for which `keep(item)` is false are left out; `tap(item)` is
+        called for every item written, in order. Returns the number of
+        changed items, or None when nothing changed and the file was left as
+        it is.
+        """
+        changed, removed, rev = self.changes(name, kind)
+        if not changed and not removed and not force:
+            return None
+
+        def exported():
+            for item in self.iter_items(kind):
+                if keep is None or keep(item):
+                    if tap:
+                        tap(item)
+                    yield item
+
+        write_json_array(exported(), path)
+        self.mark_exported(name, rev)
+        return len(changed)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
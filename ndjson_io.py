@@ -0,0 +1,155 @@
+"""NDJSON (JSON Lines) reading and writing for the scraping pipeline.
+
+Items are written one per line as soon as they exist, so a crashed run keeps
+everything it wrote, and readers stream the file instead of loading it whole.
+Sorting uses a small in-memory index of (sort key, byte offset) per line;
+the items themselves stay on disk.
+"""
+import json
+import logging
+import os
+import textwrap
+import threading
+
+
+class NdjsonWriter:
+    """Thread-safe line writer. Every line is flushed right away."""
+
+    def __init__(self, path, append=False):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._f = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, item):
+        line = json.dumps(item, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_lines(path):
+    """(byte offset, item) for every complete, valid line of `path`."""
+    with open(path, "rb") as f:
+        offset = 0
+        for raw in f:
+            start, offset = offset, offset + len(raw)
+            if not raw.endswith(b"\n"):
+                logging.warning(f"{path}: ignoring truncated last line at byte {start}")
+                break
+            if not raw.strip():
+                continue
+            try:
+                yield start, json.loads(raw)
+            except ValueError:
+                logging.warning(f"{path}: skipping malformed line at byte {start}")
+
+
+def iter_items(path):
+    for _, item in iter_lines(path):
+        yield item
+
+
+def read_at(path, offset):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+class NdjsonIndex:
+    """id -> offset index over an NDJSON file, readable like a dict of items.
+
+    Only the offsets and the `fields` named at construction stay in memory;
+    `get()` reads the item from disk.
+    """
+
+    def __init__(self, path, key="id", fields=()):
+        self.path = path
+        self._index = {}
+        if os.path.exists(path):
+            for offset, item in iter_lines(path):
+                if item.get(key):
+                    self._index[item[key]] = (offset, {f: item.get(f) for f in fields})
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, item_id):
+        return item_id in self._index
+
+    def fields(self, item_id):
+        entry = self._index.get(item_id)
+        return entry[1] if entry else None
+
+    def get(self, item_id, default=None):
+        entry = self._index.get(item_id)
+        return read_at(self.path, entry[0]) if entry else default
+
+    def values(self):
+        return iter_items(self.path) if self._index else iter([])
+
+
+def _json_array_lines(items):
+    # same layout as json.dump(items, f, ensure_ascii=False, indent=2)
+    first = True
+    yield "["
+    for item in items:
+        body = textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), "  ")
+        yield ("\n" if first else ",\n") + body
+        first = False
+    yield "\n]" if not first else "]"
+
+
+def write_json_array(items, path):
+    """Stream `items` into a JSON array file (written to a temp file, then renamed)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for chunk in _json_array_lines(items):
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def write_sorted(src, dst, keyfn, reverse=False, as_json_array=False, keep=None, tap=None):
+    """Copy the items of NDJSON file `src` to `dst` sorted by `keyfn(item)`.
+
+    Only (key, offset) pairs are held in memory. The sort is stable, like
+    sorted(). Items for which `keep(item)` is false are left out; `tap(item)`
+    is called for every item written, in output order. `dst` is NDJSON
+    unless `as_json_array` is set. Returns the item count.
+    """
+    index = [(keyfn(item), offset) for offset, item in iter_lines(src) if keep is None or keep(item)]
+    index.sort(key=lambda entry: entry[0], reverse=reverse)
+
+    def sorted_items():
+        with open(src, "rb") as f:
+            for _, offset in index:
+                f.seek(offset)
+                item = json.loads(f.readline())
+                if tap:
+                    tap(item)
+                yield item
+
+    if as_json_array:
+        write_json_array(sorted_items(), dst)
+    else:
+        tmp = dst + ".tmp"
+        with NdjsonWriter(tmp) as w:
+            for item in sorted_items():
+                w.write(item)
+        os.replace(tmp, dst)
+    return len(index)
@@ -0,0 +1,150 @@
+"""Near-duplicate detection across sources with MinHash and LSH buckets.
+
+The same scholarship is often syndicated by several sites with a slightly
+different title or intro, so exact ids do not catch it. Each item gets a
+MinHash signature of its word shingles (one-permutation hashing: every
+shingle is hashed once and kept if it is the smallest in its bin). The
+signature is split into bands; items sharing a band land in the same bucket,
+and only bucket mates are compared. That keeps the work roughly linear in
+the number of items instead of comparing every pair.
+"""
+import re
+import zlib
+
+# -------- CONFIG ----------
+THRESHOLD = 0.7  # estimated Jaccard similarity from which two items are duplicates
+NUM_BINS = 64  # signature length
+BANDS = 16  # NUM_BINS / BANDS bins per band; more bands find less similar pairs
+SHINGLE_WORDS = 3  # word shingles for normal text
+SHORT_TEXT_WORDS = 12  # shorter texts (job titles, ...) use character shingles instead
+SHINGLE_CHARS = 4
+# ---------------------------
+
+_WORD = re.compile(r"\w+")
+_ROWS = NUM_BINS // BANDS
+
+
+def shingles(text):
+    words = _WORD.findall(text.lower())
+    if len(words) >= SHORT_TEXT_WORDS:
+        return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    joined = " ".join(words)
+    if len(joined) <= SHINGLE_CHARS:
+        return {joined} if joined else set()
+    return {joined[i:i + SHINGLE_CHARS] for i in range(len(joined) - SHINGLE_CHARS + 1)}
+
+
+def signature(text):
+    """MinHash signature of `text`: a tuple of NUM_BINS values (None for empty bins)."""
+    bins = [None] * NUM_BINS
+    for sh in shingles(text):
+        h = zlib.crc32(sh.encode("utf-8"))
+        b, value = h % NUM_BINS, h // NUM_BINS
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    return tuple(bins)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    same = total = 0
+    for a, b in zip(sig_a, sig_b):
+        if a is None and b is None:
+            continue
+        total += 1
+        same += a == b
+    return same / total if total else 0.0
+
+
+class NearDuplicateIndex:
+    """Collects signatures and groups the items whose similarity reaches `threshold`.
+
+    Call add() for every item, then clusters(). Only the key, signature,
+    rank and source of each item are kept, so items can be streamed in.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self._keys = []
+        self._sigs = []
+        self._ranks = []
+        self._sources = []
+        self._parent = []
+        self._buckets = {}
+        self.comparisons = 0
+
+    def _root(self, i):
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def add(self, key, text, rank=0, source=None, block=None):
+        """Index `text` under `key`. Within a cluster the highest `rank` (then the first added) is canonical.
+
+        Only items with equal `block` are compared. `source` is where the
+        item was scraped; see clusters().
+        """
+        i = len(self._keys)
+        sig = signature(text)
+        self._keys.append(key)
+        self._sigs.append(sig)
+        self._ranks.append(rank)
+        self._sources.append(source)
+        self._parent.append(i)
+        for band in range(BANDS):
+            part = sig[band * _ROWS:(band + 1) * _ROWS]
+            if all(v is None for v in part):
+                continue
+            mates = self._buckets.setdefault((block, band, part), [])
+            for j in mates:
+                ri, rj = self._root(i), self._root(j)
+                if ri == rj:
+                    continue
+                self.comparisons += 1
+                if similarity(sig, self._sigs[j]) >= self.threshold:
+                    self._parent[max(ri, rj)] = min(ri, rj)
+            mates.append(i)
+
+    def clusters(self):
+        """[(canonical key, [duplicate keys])] for every group of two or more items.
+
+        An item from the same source as the canonical one is a separate
+        posting on that site, not a repost, so it is not a duplicate.
+        """
+        groups = {}
+        for i in range(len(self._keys)):
+            groups.setdefault(self._root(i), []).append(i)
+        out = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            best = max(members, key=lambda i: (self._ranks[i], -i))
+            dups = [self._keys[i] for i in members
+                    if i != best and (self._sources[i] is None or self._sources[i] != self._sources[best])]
+            if dups:
+                out.append((self._keys[best], dups))
+        return out
+
+
+def find_clusters(items, text_fn, rank_fn=None, threshold=THRESHOLD, block_fn=None):
+    """Near-duplicate clusters of `items` (dicts with an "id" and a "source"), keyed by id.
+
+    With `block_fn`, only items with equal block_fn(item) are compared.
+    """
+    index = NearDuplicateIndex(threshold)
+    for it in items:
+        index.add(it["id"], text_fn(it), rank_fn(it) if rank_fn else 0, it.get("source"),
+                  block_fn(it) if block_fn else None)
+    return index.clusters()
+
+
+def duplicate_ids(clusters):
+    return {key for _, dups in clusters for key in dups}
+
+
+def cluster_report(clusters):
+    """Clusters as JSON-ready dicts, largest first."""
+    report = [{"canonical": canonical, "duplicates": dups} for canonical, dups in clusters]
+    report.sort(key=lambda c: len(c["duplicates"]), reverse=True)
+    return report
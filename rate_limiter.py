@@ -0,0 +1,153 @@
+"""Adaptive per-host rate limiting for every request made through http_client.
+
+Each host gets a token bucket refilled at `rate` requests per second. The
+rate adapts to the server: a 429, a 5xx or a connection error slows it down and
+blocks the host for an exponentially growing, jittered backoff (or for the
+server's Retry-After, when it sends one); a run of healthy responses raises
+it again, never above the host's ceiling (MAX_RATE, lowered further by the
+robots.txt Crawl-delay set through set_max_rate()).
+"""
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import run_metrics
+
+# -------- CONFIG ----------
+START_RATE = 0.8  # requests per second to a host we know nothing about
+MAX_RATE = 0.8  # ceiling per host; START_RATE must not exceed it
+MIN_RATE = 0.05
+BURST = 1  # requests that may go out back to back after an idle period
+SLOWDOWN = 0.7  # rate factor after a throttled or failed response
+SPEEDUP = 1.5  # rate factor after RECOVER_AFTER healthy responses in a row
+RECOVER_AFTER = 3
+BACKOFF_BASE = 1.0  # first backoff in seconds, doubled for every failure in a row
+BACKOFF_MAX = 60.0
+RETRY_AFTER_MAX = 300.0  # longest Retry-After we are willing to honour
+# ---------------------------
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_registry_lock = threading.Lock()
+_limiters = {}
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def should_retry(status):
+    """Whether a response with `status` (None: no response at all) is worth retrying."""
+    return status is None or status in RETRY_STATUSES
+
+
+class HostLimiter:
+    """Token bucket for one host, adapted by feedback() on every response."""
+
+    def __init__(self, rate=START_RATE, max_rate=MAX_RATE):
+        self.max_rate = max_rate
+        self.rate = min(rate, max_rate)
+        self.failures = 0  # throttled/failed responses in a row
+        self._healthy = 0
+        self._tokens = float(BURST)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(BURST), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate)
+            # may go negative: callers arriving meanwhile queue up behind this one
+            self._tokens -= 1
+            return wait
+
+    def feedback(self, status, retry_after=None):
+        """Adapt to a response status (None for a connection error); returns the backoff in seconds."""
+        with self._lock:
+            if not should_retry(status):
+                self.failures = 0
+                self._healthy += 1
+                if self._healthy >= RECOVER_AFTER and self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate * SPEEDUP)
+                    self._healthy = 0
+                return 0.0
+            self.failures += 1
+            self._healthy = 0
+            self.rate = max(MIN_RATE, self.rate * SLOWDOWN)
+            if retry_after is not None:
+                delay = min(retry_after, RETRY_AFTER_MAX)
+            else:
+                backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.failures - 1))
+                delay = backoff / 2 + random.uniform(0, backoff / 2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            return delay
+
+    def set_max_rate(self, max_rate):
+        with self._lock:
+            self.max_rate = max(MIN_RATE, min(MAX_RATE, max_rate))
+            self.rate = min(self.rate, self.max_rate)
+
+
+def limiter_for(url):
+    host = _host(url)
+    with _registry_lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter()
+        return _limiters[host]
+
+
+def set_max_rate(url, max_rate):
+    """Cap the request rate for the host of `url`, e.g. to 1 / its Crawl-delay (never above MAX_RATE)."""
+    limiter_for(url).set_max_rate(max_rate)
+
+
+def wait(url):
+    """Block until the host of `url` may be requested; returns the seconds slept."""
+    waited = limiter_for(url).reserve()
+    if waited:
+        time.sleep(waited)
+        run_metrics.record_sleep(url, waited)
+    return waited
+
+
+def feedback(url, status, retry_after_header=None):
+    """Report the outcome of a request to the host's limiter; returns the backoff in seconds."""
+    delay = limiter_for(url).feedback(status, parse_retry_after(retry_after_header))
+    if delay:
+        logging.info(f"Backing off {_host(url)} for {delay:.1f}s after "
+                     f"{'a connection error' if status is None else f'status {status}'}")
+    return delay
+
+
+def stats():
+    """Current rate, ceiling and failure streak per host."""
+    with _registry_lock:
+        limiters = dict(_limiters)
+    return {host: {"rate": round(lim.rate, 3), "max_rate": round(lim.max_rate, 3), "failures": lim.failures}
+            for host, lim in sorted(limiters.items())}
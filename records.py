@@ -0,0 +1,126 @@
+"""Compact in-memory records for scraped items.
+
+Long runs hold thousands of items at once (the previous output, merge,
+dedupe, sort). As plain dicts every item carries a hash table, its own
+copy of strings repeated across items ("Tidak diketahui", the source
+name, ...) and an excerpt that mostly duplicates the start of its
+fullContent. The records here are slotted dataclasses that intern those
+low-cardinality fields and keep the excerpt only when it is not simply the
+first EXCERPT_CHARS of fullContent.
+
+Dicts remain the format at the edges: JSON files, the item store, the
+fingerprint cache and the parse workers. from_dict()/to_dict() convert
+losslessly - to_dict() gives the same keys in the same order as the
+scrapers write them, plus any unknown keys the dict had.
+"""
+import sys
+from dataclasses import dataclass
+from typing import ClassVar, Optional
+
+# -------- CONFIG ----------
+EXCERPT_CHARS = 600  # excerpt length the scraper cuts from fullContent
+# ---------------------------
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [sys.intern(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+class _Record:
+    __slots__ = ()
+    KEYS: ClassVar[tuple] = ()  # dict keys, in output order
+    INTERNED: ClassVar[tuple] = ()
+
+    def __post_init__(self):
+        for name in self.INTERNED:
+            setattr(self, name, _intern(getattr(self, name)))
+
+    @classmethod
+    def from_dict(cls, item):
+        """Record of a dict; missing keys become "", unknown ones are kept in `extra`."""
+        values = {k: item.get(k, "") for k in cls.KEYS if k != "excerpt"}
+        if "excerpt" in cls.KEYS:
+            excerpt = item.get("excerpt", "")
+            if excerpt != (values["fullContent"] or "")[:EXCERPT_CHARS]:
+                values["own_excerpt"] = excerpt
+        extra = {k: v for k, v in item.items() if k not in cls.KEYS}
+        return cls(**values, extra=extra or None)
+
+    def to_dict(self):
+        item = {k: getattr(self, k) for k in self.KEYS}
+        if self.extra:
+            item.update(self.extra)
+        return item
+
+
+class _Excerpted(_Record):
+    __slots__ = ()
+
+    @property
+    def excerpt(self):
+        """The stored excerpt, or the start of fullContent when it was just that."""
+        if self.own_excerpt is not None:
+            return self.own_excerpt
+        return (self.fullContent or "")[:EXCERPT_CHARS]
+
+
+@dataclass(slots=True)
+class RawScholarship(_Excerpted):
+    """A scraped scholarship, as built by scrape_scholarships_to_json.build_item()."""
+    id: str
+    source: str
+    title: str
+    link: str
+    date_posted: str
+    fullContent: str
+    organizer: str
+    location: str
+    fetched_at: str
+    own_excerpt: Optional[str] = None  # None: the excerpt is the start of fullContent
+    extra: Optional[dict] = None
+
+    KEYS: ClassVar[tuple] = ("id", "source", "title", "link", "date_posted", "excerpt", "fullContent",
+                             "organizer", "location", "fetched_at")
+    INTERNED: ClassVar[tuple] = ("source", "date_posted", "organizer", "location")
+
+
+@dataclass(slots=True)
+class Scholarship(_Excerpted):
+    """A normalized scholarship, as built by combine_scraped_scholarships.normalize_item()."""
+    id: str
+    title: str
+    source: str
+    link: str
+    date_posted: str
+    fullContent: str
+    organizer: str
+    location: str
+    degreeLevels: list
+    fundingTypes: list
+    scraped_at: str
+    own_excerpt: Optional[str] = None
+    extra: Optional[dict] = None
+
+    KEYS: ClassVar[tuple] = ("id", "title", "source", "link", "date_posted", "excerpt", "fullContent",
+                             "organizer", "location", "degreeLevels", "fundingTypes", "scraped_at")
+    INTERNED: ClassVar[tuple] = ("source", "date_posted", "organizer", "location", "degreeLevels", "fundingTypes")
+
+
+@dataclass(slots=True)
+class Job(_Record):
+    """A job posting in the schema of the item store and scrapedJobsFromDB.json."""
+    id: str
+    source: str
+    title: str
+    company: str
+    location: str
+    link: str
+    date_posted: str
+    extra: Optional[dict] = None
+
+    KEYS: ClassVar[tuple] = ("id", "source", "title", "company", "location", "link", "date_posted")
+    INTERNED: ClassVar[tuple] = ("source", "company", "location", "date_posted")
@@ -0,0 +1,126 @@
+"""Re-extract saved items from archived pages with the current parsers, without fetching.
+
+After changing a selector or extraction rule in parse_detail_page_generic()
+(scrape_scholarships_to_json.py) or site_adapters.parse_detail(), run
+
+    python reparse.py                                # data/beasiswa_all.json + the item store
+    python reparse.py --targets beasiswa_id indbeasiswa
+
+Every item whose detail page is in the page archive (html_archive, filled by
+scrapes run with --archive or SCRAPER_ARCHIVE=1) gets its
+detail fields extracted again from the newest archived copy; the pages are
+read and parsed in a process pool. Items without an archived page (those
+taken from a feed's content:encoded, or scraped before the archive existed)
+keep their fields. Run combine_scraped_scholarships.py afterwards as usual.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import html_archive
+import scrape_beasiswa_id
+import scrape_indbeasiswa
+import scrape_scholarships_to_json as scholarships
+import site_adapters
+from fingerprint_cache import FingerprintCache, body_fingerprint
+from html_parsing import PARSE_WORKERS
+from ndjson_io import write_json_array
+
+# -------- CONFIG ----------
+CHUNK = 8  # pages handed to a worker at a time
+# ---------------------------
+
+# target -> (items file, site of its items; None: each item names its "source")
+TARGETS = {
+    "scholarships": (scholarships.OUTPUT_RAW, None),
+    "beasiswa_id": (scrape_beasiswa_id.OUTPUT_FILE, scrape_beasiswa_id.SITE),
+    "indbeasiswa": (scrape_indbeasiswa.OUTPUT_FILE, scrape_indbeasiswa.SITE),
+}
+
+
+def parse_archived(task):
+    """Worker: (fields, body fingerprint) of one archived page, or None if it could not be parsed."""
+    target, site_name, link, archive_path, offset, length = task
+    try:
+        html = html_archive.record_text(html_archive.read_record(offset, length, archive_path))
+        if target == "scholarships":
+            fields = scholarships.parse_detail_page_generic(html, link, site_name)
+        else:
+            fields = site_adapters.parse_detail(site_adapters.get_site(site_name), html)
+    except Exception as e:
+        logging.warning(f"Could not re-parse {link}: {e}")
+        return None
+    return fields, body_fingerprint(html)
+
+
+def parse_all(tasks, workers=PARSE_WORKERS):
+    if workers <= 0 or len(tasks) < 2:
+        return [parse_archived(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(parse_archived, tasks, chunksize=CHUNK))
+
+
+def reparse(target, archive, workers=PARSE_WORKERS):
+    """Re-extract the items of `target` from `archive` and save them; returns the number changed."""
+    path, site_name = TARGETS[target]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+    except FileNotFoundError:
+        print(f"{target}: no items at {path}, nothing to re-parse")
+        return 0
+    tasks, positions = [], []
+    for i, it in enumerate(items):
+        found = archive.latest(it.get("link") or "")
+        if found:
+            tasks.append((target, site_name or it.get("source"), it["link"], archive.path, *found))
+            positions.append(i)
+
+    started = time.perf_counter()
+    results = parse_all(tasks, workers)
+    cache = FingerprintCache(scholarships.FINGERPRINT_PATH) if target == "scholarships" else None
+    changed = failed = 0
+    for i, result in zip(positions, results):
+        if result is None:
+            failed += 1
+            continue
+        fields, fingerprint = result
+        it = items[i]
+        before = dict(it)
+        if cache:
+            it.update(fields)
+            # the next crawl then reuses these fields for an unchanged page instead of the old ones
+            cache.store("detail", it["id"], fingerprint, fields)
+        else:
+            site_adapters.apply_detail(it, fields)
+        changed += it != before
+    if cache:
+        cache.close()
+    if changed:
+        write_json_array(items, path)
+        if target == "scholarships":
+            scholarships.save_to_store(items)
+    print(f"{target}: {len(tasks)} of {len(items)} items re-parsed from the archive in "
+          f"{time.perf_counter() - started:.1f}s, {changed} changed, {failed} failed"
+          f"{f', saved to {path}' if changed else ''}")
+    return changed
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Re-extract saved items from the page archive with the current parsers")
+    ap.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=["scholarships"])
+    ap.add_argument("--workers", type=int, default=PARSE_WORKERS, help="parse processes (0 = inline)")
+    ap.add_argument("--archive", default=html_archive.ARCHIVE_PATH, help="WARC file written by html_archive")
+    ap.add_argument("--index", default=html_archive.INDEX_PATH)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, force=True, format="%(asctime)s %(levelname)s: %(message)s")
+    archive = html_archive.PageArchive(args.archive, args.index)
+    print(f"Page archive {args.archive}: {archive.count()} records")
+    try:
+        for target in args.targets:
+            reparse(target, archive, args.workers)
+    finally:
+        archive.close()
@@ -0,0 +1,134 @@
+"""Per-host robots.txt registry.
+
+robots.txt is downloaded once per host and reused for ROBOTS_TTL seconds,
+with an optional on-disk copy so consecutive runs do not download it again.
+The parsed rules also expose `Crawl-delay`, which the fetchers use as the
+per-host politeness delay.
+"""
+import logging
+import os
+import threading
+import time
+import urllib.robotparser
+from urllib.parse import urlparse
+
+import http_client
+
+# -------- CONFIG ----------
+ROBOTS_TTL = 24 * 3600  # seconds a robots.txt stays valid
+ROBOTS_DIR = "cache/robots"  # set to None to keep robots.txt in memory only
+FAILURE_TTL = 10 * 60  # retry hosts whose robots.txt could not be read after this long
+# ---------------------------
+
+_lock = threading.Lock()
+_host_locks = {}
+_parsers = {}  # "scheme://host" -> (expires_at, RobotFileParser or None)
+
+
+def _host_key(url):
+    p = urlparse(url)
+    return f"{p.scheme}://{p.netloc}"
+
+
+def _disk_path(host_key):
+    return os.path.join(ROBOTS_DIR, host_key.replace("://", "_").replace(":", "_") + ".txt")
+
+
+def _parse(lines, robots_url, disallow_all=False, allow_all=False):
+    rp = urllib.robotparser.RobotFileParser()
+    rp.set_url(robots_url)
+    rp.disallow_all = disallow_all
+    rp.allow_all = allow_all
+    if lines:
+        rp.parse(lines)
+    rp.modified()
+    return rp
+
+
+def _load_from_disk(host_key):
+    if not ROBOTS_DIR:
+        return None
+    path = _disk_path(host_key)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if age > ROBOTS_TTL:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    # the first line records how the file was obtained: "#status <code>"
+    status, _, body = text.partition("\n")
+    code = int(status.split()[-1]) if status.startswith("#status") else 200
+    return _from_status(code, body.splitlines(), host_key + "/robots.txt"), ROBOTS_TTL - age
+
+
+def _from_status(code, lines, robots_url):
+    # same rules as RobotFileParser.read()
+    if code in (401, 403):
+        return _parse(None, robots_url, disallow_all=True)
+    if 400 <= code < 500:
+        return _parse(None, robots_url, allow_all=True)
+    return _parse(lines, robots_url)
+
+
+def _download(host_key, user_agent):
+    robots_url = host_key + "/robots.txt"
+    r = http_client.get(robots_url, headers={"User-Agent": user_agent}, use_cache=False)
+    if r.status_code >= 500:
+        raise IOError(f"robots.txt returned status {r.status_code}")
+    body = r.text if r.status_code < 400 else ""
+    if ROBOTS_DIR:
+        try:
+            os.makedirs(ROBOTS_DIR, exist_ok=True)
+            with open(_disk_path(host_key), "w", encoding="utf-8") as f:
+                f.write(f"#status {r.status_code}\n{body}")
+        except OSError as e:
+            logging.warning(f"Could not save robots.txt for {host_key}: {e}")
+    return _from_status(r.status_code, body.splitlines(), robots_url)
+
+
+def get_parser(url, user_agent):
+    """Return the RobotFileParser for the host of `url`, or None if robots.txt
+    could not be read (callers treat that as permissive)."""
+    host_key = _host_key(url)
+    with _lock:
+        cached = _parsers.get(host_key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        host_lock = _host_locks.setdefault(host_key, threading.Lock())
+    with host_lock:
+        # another thread may have loaded it while we waited
+        cached = _parsers.get(host_key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+        rp, ttl = None, FAILURE_TTL
+        loaded = _load_from_disk(host_key)
+        if loaded:
+            rp, ttl = loaded
+        else:
+            try:
+                rp, ttl = _download(host_key, user_agent), ROBOTS_TTL
+            except Exception as e:
+                logging.warning(f"robots.txt fetch failed for {host_key}: {e}")
+        with _lock:
+            _parsers[host_key] = (time.time() + ttl, rp)
+        return rp
+
+
+def can_fetch(url, user_agent):
+    rp = get_parser(url, user_agent)
+    return True if rp is None else rp.can_fetch(user_agent, url)
+
+
+def crawl_delay(url, user_agent):
+    """Crawl-delay (or the interval implied by Request-rate) for `url`'s host, or None."""
+    rp = get_parser(url, user_agent)
+    if rp is None:
+        return None
+    delay = rp.crawl_delay(user_agent)
+    if delay is None:
+        rate = rp.request_rate(user_agent)
+        if rate and rate.requests:
+            delay = rate.seconds / rate.requests
+    return float(delay) if delay is not None else None
@@ -0,0 +1,201 @@
+"""Lightweight timers and counters for a scraper run, plus the run report.
+
+Stages (fetch, robots, parse, extract, dedupe, write, ...) are timed with
+`with timer("parse"):`; the totals are wall-clock seconds per call site and
+may nest (a robots check that downloads robots.txt also counts as a fetch).
+Per host the HTTP client records requests, bytes, status codes and cache
+hits; the fetchers add retries and the seconds spent in politeness sleeps.
+At the end of a run `write_report()` saves everything as JSON and, when
+PROM_TEXTFILE_DIR is set, as a Prometheus textfile for node_exporter.
+
+Work done in the parse process pool is measured in the worker and merged
+back by html_parsing.parse_in_pool().
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# -------- CONFIG ----------
+PROM_TEXTFILE_DIR = None  # e.g. "/var/lib/node_exporter/textfile"; None writes no textfile
+# ---------------------------
+
+_lock = threading.Lock()
+_started = time.time()
+_stages = {}  # stage -> [calls, seconds]
+_counters = {}
+_hosts = {}
+
+
+def reset():
+    """Forget everything recorded so far and restart the run clock."""
+    global _started
+    with _lock:
+        _started = time.time()
+        _stages.clear()
+        _counters.clear()
+        _hosts.clear()
+
+
+def _host(url):
+    return urlparse(url).netloc.lower() or url
+
+
+def _host_entry(host):
+    entry = _hosts.get(host)
+    if entry is None:
+        entry = _hosts[host] = {"requests": 0, "bytes": 0, "cached": 0, "errors": 0,
+                                "retries": 0, "sleep_s": 0.0, "status": {}}
+    return entry
+
+
+def add_time(stage, seconds, calls=1):
+    with _lock:
+        entry = _stages.setdefault(stage, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+
+
+@contextmanager
+def timer(stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(stage, time.perf_counter() - started)
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def record_response(url, status, nbytes=0, cached=False):
+    with _lock:
+        entry = _host_entry(_host(url))
+        entry["requests"] += 1
+        entry["bytes"] += nbytes
+        entry["cached"] += bool(cached)
+        entry["status"][str(status)] = entry["status"].get(str(status), 0) + 1
+
+
+def record_error(url):
+    """A request that got no HTTP answer (timeout, connection error, ...)."""
+    with _lock:
+        entry = _host_entry(_host(url))
+        entry["requests"] += 1
+        entry["errors"] += 1
+
+
+def record_retry(url):
+    with _lock:
+        _host_entry(_host(url))["retries"] += 1
+
+
+def record_sleep(url, seconds):
+    if seconds <= 0:
+        return
+    with _lock:
+        _host_entry(_host(url))["sleep_s"] += seconds
+        entry = _stages.setdefault("sleep", [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+
+def stage_totals():
+    with _lock:
+        return {stage: (calls, seconds) for stage, (calls, seconds) in _stages.items()}
+
+
+def merge_stages(totals):
+    """Add stage totals measured elsewhere (a parse worker) to this process."""
+    for stage, (calls, seconds) in totals.items():
+        add_time(stage, seconds, calls)
+
+
+def snapshot():
+    with _lock:
+        return {
+            "seconds": round(time.time() - _started, 3),
+            "stages": {stage: {"calls": calls, "seconds": round(seconds, 3)}
+                       for stage, (calls, seconds) in sorted(_stages.items())},
+            "counters": dict(sorted(_counters.items())),
+            "hosts": {host: {**entry, "sleep_s": round(entry["sleep_s"], 3), "status": dict(entry["status"])}
+                      for host, entry in sorted(_hosts.items())},
+        }
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text(job, report):
+    """The report in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name, help_text, kind, samples):
+        lines.append(f"# HELP scraper_{name} {help_text}")
+        lines.append(f"# TYPE scraper_{name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_label(v)}"' for k, v in [("job", job), *labels])
+            lines.append(f"scraper_{name}{{{label_text}}} {value}")
+
+    metric("run_seconds", "Wall-clock duration of the last run.", "gauge", [((), report["seconds"])])
+    metric("run_finished_timestamp_seconds", "Unix time the last run finished.", "gauge",
+           [((), round(report["finished_ts"], 3))])
+    stages = report["stages"].items()
+    metric("stage_seconds", "Seconds spent per stage in the last run.", "gauge",
+           [((("stage", s),), v["seconds"]) for s, v in stages])
+    metric("stage_calls", "Timed calls per stage in the last run.", "gauge",
+           [((("stage", s),), v["calls"]) for s, v in stages])
+    metric("counter", "Run counters (items, pages, ...).", "gauge",
+           [((("name", k),), v) for k, v in report["counters"].items()])
+    hosts = report["hosts"].items()
+    metric("host_requests", "HTTP requests per host and status in the last run.", "gauge",
+           [((("host", h), ("status", s)), n) for h, e in hosts for s, n in sorted(e["status"].items())]
+           + [((("host", h), ("status", "error")), e["errors"]) for h, e in hosts if e["errors"]])
+    for field, help_text in (("bytes", "Response body bytes per host."),
+                             ("cached", "Responses served from the HTTP cache per host."),
+                             ("retries", "Retried requests per host."),
+                             ("sleep_s", "Seconds slept for politeness or backoff per host.")):
+        name = "host_sleep_seconds" if field == "sleep_s" else f"host_{field}"
+        metric(name, help_text, "gauge", [((("host", h),), e[field]) for h, e in hosts])
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path, job, prom_dir=None, **extra):
+    """Save the run report as JSON to `path` and return it.
+
+    `extra` is stored as-is (items saved, per-source timings, ...). With
+    `prom_dir` (default PROM_TEXTFILE_DIR) also writes `<prom_dir>/<job>.prom`.
+    """
+    report = {"job": job, "finished_at": datetime.utcnow().isoformat(), **snapshot(), **extra}
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+    prom_dir = prom_dir or PROM_TEXTFILE_DIR
+    if prom_dir:
+        # node_exporter reads every *.prom file, so write under another name and rename
+        os.makedirs(prom_dir, exist_ok=True)
+        prom_path = os.path.join(prom_dir, f"{job}.prom")
+        with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(prometheus_text(job, {**report, "finished_ts": time.time()}))
+        os.replace(prom_path + ".tmp", prom_path)
+    log_summary(report)
+    return report
+
+
+def log_summary(report):
+    stages = ", ".join(f"{s} {v['seconds']:.1f}s" for s, v in report["stages"].items())
+    hosts = report["hosts"].values()
+    logging.info(f"Run {report['job']}: {report['seconds']:.1f}s; stages: {stages or 'none'}; "
+                 f"{sum(h['requests'] for h in hosts)} requests, "
+                 f"{sum(h['bytes'] for h in hosts) / 1e6:.1f} MB, "
+                 f"{sum(h['retries'] for h in hosts)} retries")
@@ -0,0 +1,248 @@
+"""Resident scheduler: keeps the scrapers warm and refreshes each source on its own interval.
+
+One process replaces the hand-chained one-shot scripts. The HTTP session
+(connection pools, ETag cache), robots rules, rate limiters, the parse
+pool, the fingerprint cache and the previous scholarship output live as
+long as the daemon, so a refresh only pays for the requests it makes.
+
+Every scholarship source in site_adapters.SITES and Loker.id is a job with
+its own refresh interval. A refresh that finds new or changed items
+shortens the source's interval (down to MIN_INTERVAL); one that finds
+nothing lengthens it (up to MAX_INTERVAL), so busy sources are visited
+often and quiet ones rarely. The downstream stages run only when their
+inputs changed:
+
+    scholarship sources  -> combine_scraped_scholarships (raw items changed in the store)
+    loker.id             -> export_lokerid_to_json (jobs_lokerid.db modified)
+                         -> combine_scraped_jobs (jobs changed in the store, or its INPUT_FILES modified)
+
+Intervals and due times are kept in STATE_PATH, so a restarted daemon
+continues the schedule. Stop it with SIGINT/SIGTERM; the running refresh
+is finished first.
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+import combine_scraped_jobs
+import combine_scraped_scholarships
+import export_lokerid_to_json
+import fetch_lokerid_jobs
+import html_archive
+import scrape_scholarships_to_json as scholarships
+import site_adapters
+from html_parsing import shutdown_pool
+from item_store import ItemStore, content_hash
+
+# -------- CONFIG ----------
+STATE_PATH = "data/scheduler_state.json"
+LOG_FILE = "logs/scheduler.log"
+START_INTERVAL = 2 * 3600  # seconds between refreshes of a source we know nothing about
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 3600
+FASTER = 0.5  # interval factor after a refresh that found new or changed items
+SLOWER = 1.5  # ...after one that found nothing (or failed)
+REFRESH_PAGES = 3  # listing pages followed per refresh; new posts are on the first pages
+LOKERID_MAX_ITEMS = 100
+MAX_IDLE = 60  # longest sleep between checks for due jobs, in seconds
+# ---------------------------
+
+LOKERID = "loker.id"
+
+_stop = threading.Event()
+_previous = None  # {id: RawScholarship} of the last scholarship output, read once at startup
+
+
+def load_state(path=None):
+    path = path or STATE_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"sources": {}, "inputs": {}}
+    except ValueError as e:
+        logging.warning(f"Could not read scheduler state from {path}, starting fresh: {e}")
+        return {"sources": {}, "inputs": {}}
+
+
+def save_state(state, path=None):
+    path = path or STATE_PATH
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def job_names():
+    return site_adapters.site_names() + [LOKERID]
+
+
+def source_state(state, name):
+    return state["sources"].setdefault(name, {"interval": START_INTERVAL, "next_run": 0, "last_run": None,
+                                              "last_changed": None, "last_error": None})
+
+
+def adapt(entry, changed, error=None, now=None):
+    """Set the next interval and due time of a source after a refresh that found `changed` items."""
+    now = now or time.time()
+    factor = FASTER if changed and not error else SLOWER
+    entry["interval"] = round(min(MAX_INTERVAL, max(MIN_INTERVAL, entry["interval"] * factor)))
+    entry["next_run"] = now + entry["interval"]
+    entry["last_run"] = datetime.utcnow().isoformat()
+    entry["last_changed"] = changed
+    entry["last_error"] = error
+
+
+def due_jobs(state, now=None):
+    now = now or time.time()
+    return [name for name in job_names() if source_state(state, name)["next_run"] <= now]
+
+
+def inputs_changed(state, stage, paths):
+    """Whether any of `paths` was modified since `stage` last ran (records the new signature)."""
+    signature = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature[path] = [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            signature[path] = None
+    if state["inputs"].get(stage) == signature:
+        return False
+    state["inputs"][stage] = signature
+    return True
+
+
+def _pending(name, kind):
+    store = ItemStore(scholarships.STORE_PATH)
+    try:
+        return store.pending(name, kind)
+    finally:
+        store.close()
+
+
+# -------------------------
+# Jobs
+# -------------------------
+def refresh_scholarships(names):
+    """Scrape the due scholarship sources together; returns {name: (changed items, error)}."""
+    global _previous
+    if _previous is None:
+        _previous = scholarships.load_previous_items(scholarships.OUTPUT_RAW)
+    known = {item_id: content_hash(it.to_dict()) for item_id, it in _previous.items() if it.source in names}
+    timings = {}
+    items = scholarships.scrape_all(timings, incremental=True, sources=names, previous=_previous)
+    _previous = {it.id: it for it in items}
+    changed = dict.fromkeys(names, 0)
+    for it in items:
+        if it.source in changed and known.get(it.id) != content_hash(it.to_dict()):
+            changed[it.source] += 1
+    return {name: (changed[name], timings.get(name, {}).get("error")) for name in names}
+
+
+def refresh_lokerid(state):
+    os.makedirs(os.path.dirname(fetch_lokerid_jobs.FRONTIER_PATH), exist_ok=True)
+    fetch_lokerid_jobs.init_db()
+    fetch_lokerid_jobs.scrape_listings(max_items=LOKERID_MAX_ITEMS, max_pages=REFRESH_PAGES)
+    if not inputs_changed(state, "export_lokerid", [fetch_lokerid_jobs.DB_PATH]):
+        return 0
+    return export_lokerid_to_json.main()
+
+
+def run_stages(state, ran):
+    """Run the combine/export stages whose inputs changed."""
+    if any(name != LOKERID for name in ran):
+        pending = _pending("combine_scholarships", scholarships.STORE_KIND)
+        if pending or not os.path.exists(combine_scraped_scholarships.OUT):
+            logging.info(f"Combining scholarships ({pending} raw items changed)")
+            combine_scraped_scholarships.combine_from_store(scholarships.get_fingerprints())
+        else:
+            logging.info("Scholarships unchanged, combine skipped")
+    pending = _pending("scrapedJobsFromDB", "job")
+    if (inputs_changed(state, "combine_jobs", combine_scraped_jobs.INPUT_FILES) or pending
+            or not os.path.exists(combine_scraped_jobs.OUTPUT_PATH)):
+        logging.info(f"Combining jobs ({pending} jobs changed)")
+        combine_scraped_jobs.main()
+
+
+def run_due(state, names):
+    """Refresh the sources `names`, adapt their intervals and run the stages that became stale."""
+    results = {}
+    sources = [n for n in names if n != LOKERID]
+    if sources:
+        try:
+            results.update(refresh_scholarships(sources))
+        except Exception as e:
+            logging.exception(f"Scholarship refresh failed: {e}")
+            results.update({n: (0, str(e)) for n in sources})
+    if LOKERID in names:
+        try:
+            results[LOKERID] = (refresh_lokerid(state), None)
+        except Exception as e:
+            logging.exception(f"Loker.id refresh failed: {e}")
+            results[LOKERID] = (0, str(e))
+    for name, (changed, error) in results.items():
+        entry = source_state(state, name)
+        adapt(entry, changed, error)
+        logging.info(f"[{name}] {changed} new or changed items{f' (error: {error})' if error else ''}; "
+                     f"next refresh in {entry['interval'] / 60:.0f} min")
+    try:
+        run_stages(state, names)
+    except Exception as e:
+        logging.exception(f"Combine/export failed: {e}")
+    save_state(state)
+
+
+def run_forever(state, once=False):
+    while not _stop.is_set():
+        due = due_jobs(state)
+        if due:
+            logging.info(f"Refreshing {', '.join(due)}")
+            run_due(state, due)
+        if once:
+            return
+        next_run = min(source_state(state, name)["next_run"] for name in job_names())
+        _stop.wait(max(1.0, min(MAX_IDLE, next_run - time.time())))
+
+
+def stop(signum=None, frame=None):
+    logging.info("Stopping after the current refresh")
+    _stop.set()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Refresh every source on its own adaptive interval")
+    ap.add_argument("--once", action="store_true", help="refresh the sources that are due, then exit")
+    ap.add_argument("--max-pages", type=int, default=REFRESH_PAGES,
+                    help="listing pages to follow per source and refresh")
+    ap.add_argument("--state", default=STATE_PATH, help="file keeping the intervals between runs")
+    ap.add_argument("--archive", action="store_true",
+                    help=f"append every downloaded page to {html_archive.ARCHIVE_PATH} for reparse.py")
+    args = ap.parse_args()
+    html_archive.ARCHIVE_ENABLED = html_archive.ARCHIVE_ENABLED or args.archive
+    REFRESH_PAGES = args.max_pages
+    STATE_PATH = args.state
+    scholarships.MAX_PAGES = args.max_pages
+    scholarships.KEEP_FINGERPRINTS_OPEN = True
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    # the scrapers configured logging on import; send everything to the daemon's log instead
+    logging.basicConfig(level=logging.INFO, filename=LOG_FILE, force=True,
+                        format="%(asctime)s %(levelname)s %(threadName)s: %(message)s")
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    state = load_state()
+    logging.info(f"Scheduler started with {len(job_names())} sources")
+    try:
+        run_forever(state, once=args.once)
+    finally:
+        save_state(state)
+        scholarships.close_fingerprints()
+        shutdown_pool()
+        logging.info("Scheduler stopped")
@@ -1,21 +1,42 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import urllib.robotparser
-import time, random, json, hashlib, logging
-from datetime import datetime
-import feedparser
-from dateutil import parser as dateparser
+import functools, json, hashlib, logging, threading, argparse
+from datetime import datetime, timedelta
 import os # Import the os module
+from urllib.parse import urlsplit, urlunsplit
+from fetch_scheduler import run_sources, stopping
+import html_archive
+import http_client
+import rate_limiter
+import robots_cache
+from crawl_frontier import CrawlFrontier
+from fingerprint_cache import FingerprintCache, body_fingerprint
+from html_parsing import make_soup, parse_in_pool
+from field_extract import extract_fields
+import date_normalize
+from date_normalize import normalize_date
+from ndjson_io import NdjsonWriter, NdjsonIndex, iter_items, write_json_array, write_sorted
+from records import RawScholarship
+from item_store import ItemStore
+import site_adapters
+import feed_ingest
+import run_metrics
 
 # -------- CONFIG ----------
 HEADERS = {"User-Agent": "Mozilla/5.0 (EduScraper/1.0; +https://example.com)"}
-DELAY_MIN, DELAY_MAX = 0.8, 1.6
 OUTPUT_RAW = "data/beasiswa_all.json"
+OUTPUT_NDJSON = "data/beasiswa_all.jsonl"  # output of scrape_all_ndjson() / --ndjson
+REPORT_PATH = "data/beasiswa_all.report.json"  # timings and per-host counters of the last run
+STORE_PATH = "data/items.db"  # unified item store read by combine_scraped_scholarships.py
+STORE_KIND = "scholarship_raw"
 LOG_FILE = "logs/scraper.log"
-MAX_PER_SITE = 25  # safety limit per site, increased to get more data
-# List of scrapers to run (functions defined below)
-# You can add/remove functions from this list
+MAX_PER_SITE = 25  # safety limit per listing page (sites may set their own "limit")
+MAX_PAGES = 10  # listing pages followed per site through pagination
+FRONTIER_PATH = "data/crawl_frontier.db"  # crawl progress, so interrupted runs resume
+FINGERPRINT_PATH = "data/fingerprints.db"  # parsed detail fields per page-body hash
+KEEP_FINGERPRINTS_OPEN = False  # keep the cache open between runs (scheduler daemon); close_fingerprints() at exit
+MAX_WORKERS = 5  # sources scraped in parallel (each source is a different host)
+INCREMENTAL = True  # reuse detail fields of items already in OUTPUT_RAW
+REFRESH_AGE_DAYS = 7  # ...unless they were fetched longer ago than this
+# Sources and their selectors are entries in site_adapters.SITES
 # ---------------------------
 
 # Ensure the logs directory exists
@@ -26,64 +47,89 @@ logging.basicConfig(level=logging.INFO, filename=LOG_FILE,
 
 def allowed_by_robots(url):
     try:
-        p = urlparse(url)
-        robots_url = f"{p.scheme}://{p.netloc}/robots.txt"
-        rp = urllib.robotparser.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], url)
+        with run_metrics.timer("robots"):
+            return robots_cache.can_fetch(url, HEADERS["User-Agent"])
     except Exception as e:
         logging.warning(f"robots.txt check failed for {url}: {e}")
         return True  # be permissive if robots can't be read
 
+def apply_crawl_delay(url):
+    """Cap the request rate of `url`'s host to its robots.txt Crawl-delay, if it sets one."""
+    try:
+        with run_metrics.timer("robots"):
+            delay = robots_cache.crawl_delay(url, HEADERS["User-Agent"])
+    except Exception:
+        delay = None
+    if delay:
+        rate_limiter.set_max_rate(url, 1 / delay)
+
 def safe_get(url, timeout=15, allow_redirects=True):
-    """GET with headers and simple retry/backoff"""
-    for attempt in range(3):
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=allow_redirects)
-            if r.status_code == 200:
-                return r.text
-            else:
-                logging.warning(f"GET {url} returned status {r.status_code}")
-                time.sleep(1 + attempt)
-        except Exception as e:
-            logging.warning(f"GET {url} exception: {e}")
-            time.sleep(1 + attempt)
+    """GET with headers; returns "" if the page could not be fetched.
+
+    http_client waits for the host's rate limiter and retries throttled or
+    failed requests with backoff, so callers never sleep themselves.
+    """
+    apply_crawl_delay(url)
+    try:
+        r = http_client.get(url, headers=HEADERS, timeout=timeout, allow_redirects=allow_redirects)
+    except Exception as e:
+        logging.warning(f"GET {url} exception: {e}")
+        return ""
+    if r.status_code == 200:
+        return r.text
+    logging.warning(f"GET {url} returned status {r.status_code}")
     return ""
 
 def make_id(source, title, link):
     s = f"{source}|{title}|{link}"
     return hashlib.sha1(s.encode("utf-8")).hexdigest()
 
+def link_key(source, link):
+    """(source, link) with case of scheme/host, trailing slash and fragment ignored.
+
+    Ids also hash the title, which a feed and a listing may spell differently
+    for the same post; this key is what two copies of one post share.
+    """
+    parts = urlsplit((link or "").strip())
+    path = parts.path.rstrip("/") or "/"
+    return source, urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
 def parse_date_safe(text):
     if not text:
         return ""
-    try:
-        dt = dateparser.parse(text, fuzzy=True)
-        return dt.date().isoformat()
-    except Exception:
-        return text.strip()
+    return normalize_date(text) or text.strip()
 
 def parse_detail_page_generic(html_content, link_url, source_name):
     """Parses common detail page elements like full content, organizer, location, and deadline."""
-    soup = BeautifulSoup(html_content, "html.parser")
-    
-    full_content = ""
-    content_el = soup.select_one(".entry-content, .post-content, .content, .single-content, div[itemprop='articleBody'], .td-post-content")
-    if content_el:
-        full_content = content_el.get_text(separator="\n", strip=True)
-    
+    site = site_adapters.get_site(source_name)
+    soup = make_soup(html_content)
+    return _detail_fields(site, soup, site_adapters.content_text(site, soup))
+
+def parse_export_detail(html_content, link_url, source_name):
+    """site_adapters.parse_detail() of an EXPORT_SITES page, under the item keys; "date_posted" is its "date"."""
+    detail = site_adapters.parse_detail(site_adapters.get_site(source_name), html_content)
+    return {"fullContent": detail["fullContent"], "excerpt": "", "organizer": detail["organizer"],
+            "date_posted": detail["date"], "location": detail["location"]}
+
+def parse_feed_content(html_content, link_url, source_name):
+    """The same fields from a feed entry's content:encoded, which holds just the article body."""
+    site = site_adapters.get_site(source_name)
+    soup = make_soup(html_content)
+    fields = _detail_fields(site, soup, soup.get_text(separator="\n", strip=True))
+    if fields["date_posted"] == "Tidak diketahui":
+        del fields["date_posted"]  # the entry's own date is used instead
+    return fields
+
+def _detail_fields(site, soup, full_content):
     excerpt = full_content[:600] if full_content else ""
 
-    organizer = ""
-    organizer_match = re.search(r"(?:Penyelenggara|Organized by|Oleh):\s*(.*?)(?:\n|$)", full_content, re.IGNORECASE)
-    if organizer_match:
-        organizer = organizer_match.group(1).strip()
+    with run_metrics.timer("extract"):
+        fields = extract_fields(full_content)
+    organizer = fields["organizer"] or ""
 
     deadline = "Tidak diketahui"
-    deadline_match = re.search(r"(?:Deadline|Batas waktu pendaftaran|Pendaftaran hingga|sampai dengan):\s*(\d{1,2}\s+\w+\s+\d{4}|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4})", full_content, re.IGNORECASE)
-    if deadline_match:
-        deadline = parse_date_safe(deadline_match.group(1).strip())
+    if fields["deadline"]:
+        deadline = parse_date_safe(fields["deadline"])
     else:
         time_el = soup.select_one("time[datetime]")
         if time_el and time_el.has_attr("datetime"):
@@ -91,26 +137,7 @@ def parse_detail_page_generic(html_content, link_url, source_name):
         elif time_el:
             deadline = parse_date_safe(time_el.get_text(strip=True))
 
-    location = "Tidak diketahui"
-    location_match = re.search(r"(?:Lokasi|Tempat|Negara|Kota|Wilayah):\s*(.*?)(?:\n|$)", full_content, re.IGNORECASE)
-    if location_match:
-        location = location_match.group(1).strip()
-    else:
-        lower_content = full_content.lower()
-        if "online" in lower_content or "daring" in lower_content or "virtual" in lower_content:
-            location = "Online"
-        elif "remote" in lower_content or "dari rumah" in lower_content:
-            location = "Remote"
-        elif "indonesia" in lower_content or "dalam negeri" in lower_content:
-            location = "Indonesia"
-        elif "luar negeri" in lower_content or "internasional" in lower_content:
-            location = "Internasional"
-        else:
-            cities = ["Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Makassar", "Semarang", "Denpasar"]
-            for city in cities:
-                if city.lower() in lower_content:
-                    location = city
-                    break
+    location = fields["location"] if fields["location"] is not None else "Tidak diketahui"
 
     return {
         "fullContent": full_content,
@@ -120,416 +147,473 @@ def parse_detail_page_generic(html_content, link_url, source_name):
         "location": location
     }
 
-
 # -------------------------
-# SCRAPER: beasiswa.id
+# Incremental mode: items from the previous run, keyed by id
 # -------------------------
-def scrape_beasiswa_id(limit=MAX_PER_SITE):
-    source = "beasiswa.id"
-    base = "https://beasiswa.id/category/beasiswa/" # Changed to category page
-    items = []
-    if not allowed_by_robots(base):
-        logging.info(f"[{source}] blocked in robots.txt")
-        return items
-    html = safe_get(base)
-    if not html:
-        logging.warning(f"[{source}] Failed to fetch listing page: {base}")
-        return items
-    soup = BeautifulSoup(html, "html.parser")
-    # More robust selector for beasiswa.id
-    posts = soup.select("article.jeg_post, div.jeg_post_wrapper, .td_module_wrap, .post-item, .jeg_post") 
-    
-    if not posts:
-        logging.warning(f"[{source}] No specific post containers found on {base}. Trying more generic selectors.")
-        posts = soup.select("article, div.post, .entry-card") # Fallback to more generic
-        if not posts:
-            logging.warning(f"[{source}] No generic post containers found on {base} either.")
-            return items
-
-    for p in posts[:limit]:
-        try:
-            a = p.select_one("h3.jeg_post_title a, h2.entry-title a, h2 a, .td-module-title a, a")
-            if not a:
-                logging.debug(f"[{source}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
-                continue
-            title = a.get_text(strip=True)
-            link = urljoin(base, a.get("href"))
-            
-            if title.upper() == "DAFTAR SEKARANG" or "kirimwa.id" in link.lower() or "whatsapp" in link.lower():
-                logging.debug(f"[{source}] Skipping promotional post: {title} - {link}")
-                continue
-
-            # Fetch detail page for robust fields
-            full_data = {}
-            if allowed_by_robots(link):
-                time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                det_html = safe_get(link)
-                if det_html:
-                    full_data = parse_detail_page_generic(det_html, link, source)
-                else:
-                    logging.warning(f"[{source}] Failed to fetch detail page for {link}")
-            else:
-                logging.info(f"[{source}] Detail page {link} blocked by robots.txt")
-            
-            items.append({
-                "id": make_id(source, title, link),
-                "source": source,
-                "title": title,
-                "link": link,
-                "date_posted": full_data.get("date_posted", ""),
-                "excerpt": full_data.get("excerpt", ""),
-                "fullContent": full_data.get("fullContent", ""),
-                "organizer": full_data.get("organizer", ""),
-                "location": full_data.get("location", "")
-            })
-        except Exception as e:
-            logging.exception(f"[{source}] parse item error for {link}: {e}")
-    logging.info(f"[{source}] scraped {len(items)} items")
+_previous_items = {}
+_refresh_cutoff = ""
+_detail_counts = {"fetched": 0, "reused": 0, "unchanged": 0, "from_feed": 0}
+_counts_lock = threading.Lock()
+_fingerprints = None
+_fingerprints_lock = threading.Lock()
+
+def get_fingerprints():
+    global _fingerprints
+    with _fingerprints_lock:
+        if _fingerprints is None:
+            _fingerprints = FingerprintCache(FINGERPRINT_PATH)
+        return _fingerprints
+
+def close_fingerprints():
+    global _fingerprints
+    with _fingerprints_lock:
+        if _fingerprints is not None:
+            _fingerprints.close()
+            _fingerprints = None
+
+def load_previous_items(path=OUTPUT_RAW, refresh_age_days=REFRESH_AGE_DAYS, ndjson=False):
+    """Load the last output so fresh items can skip their detail fetch.
+
+    Items are kept as RawScholarship records; for NDJSON output only an
+    id -> offset index is kept in memory.
+    """
+    items = {}
+    try:
+        if ndjson:
+            items = NdjsonIndex(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                items = {it["id"]: RawScholarship.from_dict(it) for it in json.load(f) if it.get("id")}
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError, TypeError) as e:
+        logging.warning(f"Could not read previous items from {path}: {e}")
+    logging.info(f"Loaded {len(items)} previous items from {path}")
+    return use_previous_items(items, refresh_age_days)
+
+def use_previous_items(items, refresh_age_days=REFRESH_AGE_DAYS):
+    """Like load_previous_items(), for {id: RawScholarship} the caller already holds."""
+    global _previous_items, _refresh_cutoff
+    _previous_items = items
+    _refresh_cutoff = (datetime.utcnow() - timedelta(days=refresh_age_days)).isoformat()
     return items
 
+def reusable_item(item_id):
+    """The previous copy of `item_id` if its detail page was fetched recently enough."""
+    it = _previous_items.get(item_id)
+    if isinstance(it, dict):  # read from the NDJSON output
+        it = RawScholarship.from_dict(it)
+    if it and (it.fetched_at or "") >= _refresh_cutoff:
+        return it
+    return None
+
+def _parse_cached(item_id, html, parse_fn, link, source):
+    """parse_fn(html, link, source), or the fields parsed from the same body last time."""
+    fingerprint = body_fingerprint(html)
+    full_data = get_fingerprints().lookup("detail", item_id, fingerprint)
+    if full_data is None:
+        # parsed in a worker process so other sources keep fetching meanwhile
+        full_data = parse_in_pool(parse_fn, html, link, source)
+        get_fingerprints().store("detail", item_id, fingerprint, full_data)
+    else:
+        with _counts_lock:
+            _detail_counts["unchanged"] += 1
+    full_data["fetched_at"] = datetime.utcnow().isoformat()
+    return full_data
+
+def fetch_detail(source, title, link, note="", content=""):
+    """Detail-page fields for one listing or feed entry.
+
+    Reuses the previous run's fields for known, fresh items. Otherwise parses
+    `content` (a feed entry's full article) when given, else fetches the
+    detail page (empty dict if blocked or unreachable) and parses it; a body
+    that is unchanged since it was last parsed is not parsed again.
+    """
+    suffix = f" {note}" if note else ""
+    item_id = make_id(source, title, link)
+    previous = reusable_item(item_id)
+    if previous:
+        with _counts_lock:
+            _detail_counts["reused"] += 1
+        return {k: getattr(previous, k) for k in
+                ("date_posted", "excerpt", "fullContent", "organizer", "location", "fetched_at")}
+    if link_key(source, link) in _feed_details:
+        return _feed_details[link_key(source, link)]  # already read from the feed in this run
+    if content:
+        with _counts_lock:
+            _detail_counts["from_feed"] += 1
+        return _parse_cached(item_id, content, parse_feed_content, link, source)
+    full_data = {}
+    if allowed_by_robots(link):
+        det_html = safe_get(link)
+        if det_html:
+            parse_fn = parse_export_detail if site_adapters.get_site(source)["export"] else parse_detail_page_generic
+            full_data = _parse_cached(item_id, det_html, parse_fn, link, source)
+            with _counts_lock:
+                _detail_counts["fetched"] += 1
+        else:
+            logging.warning(f"[{source}] Failed to fetch detail page for {link}{suffix}")
+    else:
+        logging.info(f"[{source}] Detail page {link}{suffix} blocked by robots.txt")
+    return full_data
+
 # -------------------------
-# SCRAPER: indbeasiswa.com
+# NDJSON mode: items are streamed to disk as soon as they are built
 # -------------------------
-def scrape_indbeasiswa(limit=MAX_PER_SITE):
-    source = "indbeasiswa.com"
-    base = "https://indbeasiswa.com/beasiswa-s1/" # Changed to S1 category page
-    items = []
-    if not allowed_by_robots(base):
-        logging.info(f"[{source}] blocked in robots.txt")
-        return items
-    html = safe_get(base)
-    if not html:
-        logging.warning(f"[{source}] Failed to fetch listing page: {base}")
-        return items
-    soup = BeautifulSoup(html, "html.parser")
-    # More robust selector for indbeasiswa.com
-    posts = soup.select("article.post-item, article.jeg_post, .jeg_post_wrapper, .post")
-    
-    if not posts:
-        logging.warning(f"[{source}] No specific post containers found on {base}. Trying more generic selectors.")
-        posts = soup.select("article, div.post, .entry-card") # Fallback to more generic
-        if not posts:
-            logging.warning(f"[{source}] No generic post containers found on {base} either.")
-            return items
-
-    for p in posts[:limit]:
-        try:
-            a = p.select_one("h2.post-title a, h3.jeg_post_title a, .entry-title a, h2 a, a")
-            if not a:
-                logging.debug(f"[{source}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
-                continue
-            title = a.get_text(strip=True)
-            link = urljoin(base, a.get("href"))
-            
-            # Fetch detail page for robust fields
-            full_data = {}
-            if allowed_by_robots(link):
-                time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                det_html = safe_get(link)
-                if det_html:
-                    full_data = parse_detail_page_generic(det_html, link, source)
-                else:
-                    logging.warning(f"[{source}] Failed to fetch detail page for {link}")
-            else:
-                logging.info(f"[{source}] Detail page {link} blocked by robots.txt")
-            
-            items.append({
-                "id": make_id(source, title, link),
-                "source": source,
-                "title": title,
-                "link": link,
-                "date_posted": full_data.get("date_posted", ""),
-                "excerpt": full_data.get("excerpt", ""),
-                "fullContent": full_data.get("fullContent", ""),
-                "organizer": full_data.get("organizer", ""),
-                "location": full_data.get("location", "")
-            })
-        except Exception as e:
-            logging.exception(f"[{source}] parse item error for {link}: {e}")
-    logging.info(f"[{source}] scraped {len(items)} items")
-    return items
+_sink = None
+_sink_seen = set()
+_sink_counts = {}
+_sink_lock = threading.Lock()
+
+def emit_item(item):
+    """Write `item` to the NDJSON sink (once per id and link). No-op outside NDJSON mode."""
+    if _sink is None:
+        return
+    key = link_key(item["source"], item["link"])
+    with _sink_lock:
+        if item["id"] in _sink_seen or key in _sink_seen:
+            return
+        _sink_seen.update((item["id"], key))
+        _sink_counts[item["source"]] = _sink_counts.get(item["source"], 0) + 1
+    _sink.write(item)
+
 
 # -------------------------
-# SCRAPER: luarkampus.id (category beasiswa)
+# Paginated crawl shared by the HTML scrapers
 # -------------------------
-def scrape_luarkampus(limit=MAX_PER_SITE):
-    source = "luarkampus.id"
-    base = "https://luarkampus.id"
-    start = base + "/beasiswa/" # Confirmed this is a valid category page
-    items = []
-    if not allowed_by_robots(start):
-        logging.info(f"[{source}] blocked in robots.txt")
-        return items
-    html = safe_get(start)
-    if not html:
-        logging.warning(f"[{source}] Failed to fetch listing page: {start}")
-        return items
-    soup = BeautifulSoup(html, "html.parser")
-    # More robust selector for luarkampus.id
-    posts = soup.select("div.elementor-posts-container article.elementor-post, article.post, .jeg_post_wrapper, .post-item") 
-    
-    if not posts:
-        logging.warning(f"[{source}] No specific post containers found on {start}. Trying more generic selectors.")
-        posts = soup.select("article, div.post, .entry-card") # Fallback to more generic
-        if not posts:
-            logging.warning(f"[{source}] No generic post containers found on {start} either.")
-            return items
-
-    for p in posts[:limit]:
+_frontier = None
+_frontier_lock = threading.Lock()
+
+def get_frontier():
+    global _frontier
+    with _frontier_lock:
+        if _frontier is None:
+            os.makedirs(os.path.dirname(FRONTIER_PATH), exist_ok=True)
+            _frontier = CrawlFrontier(FRONTIER_PATH)
+        return _frontier
+
+def build_item(source, title, link, full_data, defaults=None):
+    defaults = defaults or {}
+    return {
+        "id": make_id(source, title, link),
+        "source": source,
+        "title": title,
+        "link": link,
+        "date_posted": full_data.get("date_posted", defaults.get("date_posted", "")),
+        "excerpt": full_data.get("excerpt", defaults.get("excerpt", "")),
+        "fullContent": full_data.get("fullContent", ""),
+        "organizer": full_data.get("organizer", ""),
+        "location": full_data.get("location", ""),
+        "fetched_at": full_data.get("fetched_at", "")
+    }
+
+def crawl_details(source, note=""):
+    """Fetch every pending detail page of `source` and store its item in the frontier."""
+    frontier = get_frontier()
+    while not stopping():
+        page = frontier.next_pending(source, "detail")
+        if page is None:
+            return
+        link, title = page
         try:
-            a = p.select_one("h3.elementor-post__title a, h2.entry-title a, h2 a, a")
-            if not a:
-                logging.debug(f"[{source}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
-                continue
-            title = a.get_text(strip=True)
-            link = urljoin(base, a.get("href"))
-            
-            # Fetch detail page for robust fields
-            full_data = {}
-            if allowed_by_robots(link):
-                time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                det_html = safe_get(link)
-                if det_html:
-                    full_data = parse_detail_page_generic(det_html, link, source)
-                else:
-                    logging.warning(f"[{source}] Failed to fetch detail page for {link}")
-            else:
-                logging.info(f"[{source}] Detail page {link} blocked by robots.txt")
-            
-            items.append({
-                "id": make_id(source, title, link),
-                "source": source,
-                "title": title,
-                "link": link,
-                "date_posted": full_data.get("date_posted", ""),
-                "excerpt": full_data.get("excerpt", ""),
-                "fullContent": full_data.get("fullContent", ""),
-                "organizer": full_data.get("organizer", ""),
-                "location": full_data.get("location", "")
-            })
+            full_data = fetch_detail(source, title, link, note)
+            item = build_item(source, title, link, full_data)
+            frontier.mark_done(source, link, item)
+            emit_item(item)
         except Exception as e:
             logging.exception(f"[{source}] parse item error for {link}: {e}")
-    logging.info(f"[{source}] scraped {len(items)} items")
+            frontier.mark_failed(source, link, e)
+
+def crawl_source(site, limit, max_pages, note=""):
+    """Crawl the listing pages of `site` (a site_adapters entry), following pagination, and return its items.
+
+    At most `limit` entries are used per listing page. Progress is kept in
+    the crawl frontier, so an interrupted crawl resumes where it stopped.
+    """
+    source = site["name"]
+    suffix = f" {note}" if note else ""
+    frontier = get_frontier()
+    if frontier.begin(source, [site["start_url"]]):
+        logging.info(f"[{source}] resuming interrupted crawl "
+                     f"({frontier.count(source, 'listing', 'done')} listing pages already done)")
+    crawl_details(source, note)  # details queued before an interruption
+    while frontier.count(source, "listing", "done") < max_pages and not stopping():
+        page = frontier.next_pending(source, "listing")
+        if page is None:
+            break
+        page_url = page[0]
+        if not allowed_by_robots(page_url):
+            logging.info(f"[{source}] {page_url} blocked in robots.txt")
+            frontier.mark_failed(source, page_url, "blocked by robots.txt")
+            continue
+        html = safe_get(page_url)
+        if not html:
+            logging.warning(f"[{source}] Failed to fetch listing page: {page_url}{suffix}")
+            frontier.mark_failed(source, page_url, "fetch failed")
+            continue
+        soup = make_soup(html)
+        for title, link in site_adapters.list_entries(site, soup, page_url)[:limit]:
+            if link_key(source, link) not in _feed_details:  # else already an item from the feed
+                frontier.add(source, link, "detail", title)
+        next_url = site_adapters.next_page_url(site, soup, page_url)
+        if next_url:
+            frontier.add(source, next_url, "listing")
+        frontier.mark_done(source, page_url)
+        crawl_details(source, note)
+    if stopping():
+        # not finished: the next run resumes from the frontier
+        logging.info(f"[{source}] crawl interrupted after "
+                     f"{frontier.count(source, 'listing', 'done')} listing pages{suffix}")
+        return []
+    if _sink is not None:
+        # stream instead of collecting; also covers items finished before an interruption
+        for item in frontier.iter_results(source):
+            emit_item(item)
+        items = []
+    else:
+        items = frontier.results(source)
+    frontier.finish(source)
+    logging.info(f"[{source}] scraped {len(items) or _sink_counts.get(source, 0)} items from "
+                 f"{frontier.count(source, 'listing', 'done')} listing pages{suffix}")
     return items
 
+
 # -------------------------
-# SCRAPER: schoters (schoters.com) - aggregator indonesia
+# One engine for every source in site_adapters.SITES
 # -------------------------
-def scrape_schoters(limit=MAX_PER_SITE):
-    source = "schoters.com"
-    base = "https://www.schoters.com/id/beasiswa/"
+_feeds = {}  # source -> future of its feed_ingest.fetch_feed() result in this run
+_feed_details = {}  # link_key() -> detail fields of the feed entries read in this run
+
+def poll_feeds(names):
+    """Start fetching the feeds of the sources `names` that have one; the sources wait for theirs in read_feed()."""
+    feeds = {}
+    for name in names:
+        url = site_adapters.get_site(name)["rss"]
+        if url and allowed_by_robots(url):
+            feeds[name] = url
+    _feeds.clear()
+    _feed_details.clear()
+    _feeds.update(feed_ingest.submit_feeds(feeds, HEADERS))
+
+def read_feed(site, limit):
+    """Items from the site's polled feed; empty if it has none or it was unusable.
+
+    Entries with their full article in the feed are parsed from it, the
+    others get their detail page fetched as usual.
+    """
+    source = site["name"]
     items = []
-    if not allowed_by_robots(base):
-        logging.info(f"[{source}] blocked in robots.txt")
-        return items
-    html = safe_get(base)
-    if not html:
-        logging.warning(f"[{source}] Failed to fetch listing page: {base}")
-        return items
-    soup = BeautifulSoup(html, "html.parser")
-    # More robust selector for schoters.com
-    cards = soup.select(".jeg_post_wrapper, .post-item, article.post, .card, .elementor-post")
-    
-    if not cards:
-        logging.warning(f"[{source}] No specific post containers found on {base}. Trying more generic selectors.")
-        cards = soup.select("article, div.post, .entry-card") # Fallback to more generic
-        if not cards:
-            logging.warning(f"[{source}] No generic post containers found on {base} either.")
-            return items
-
-    for p in cards[:limit]:
+    feed = _feeds[source].result() if source in _feeds else {"entries": []}
+    for e in feed["entries"][:limit]:
+        title = e["title"][:240]
+        link = e["link"]
         try:
-            a = p.select_one("h2 a, h3 a, .title a, a")
-            if not a or not a.get("href"):
-                logging.debug(f"[{source}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
-                continue
-            title = a.get_text(" ", strip=True)[:240] or a.get("title","").strip()
-            link = urljoin(base, a.get("href"))
-            
-            # Fetch detail page for robust fields
-            full_data = {}
-            if allowed_by_robots(link):
-                time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                det_html = safe_get(link)
-                if det_html:
-                    full_data = parse_detail_page_generic(det_html, link, source)
-                else:
-                    logging.warning(f"[{source}] Failed to fetch detail page for {link}")
-            else:
-                logging.info(f"[{source}] Detail page {link} blocked by robots.txt")
-            
-            items.append({
-                "id": make_id(source, title, link),
-                "source": source,
-                "title": title,
-                "link": link,
-                "date_posted": full_data.get("date_posted", ""),
-                "excerpt": full_data.get("excerpt", ""),
-                "fullContent": full_data.get("fullContent", ""),
-                "organizer": full_data.get("organizer", ""),
-                "location": full_data.get("location", "")
-            })
-        except Exception as e:
-            logging.exception(f"[{source}] parse item error for {link}: {e}")
-    logging.info(f"[{source}] scraped {len(items)} items")
+            full_data = fetch_detail(source, title, link, "(from RSS)", e["content"])
+        except Exception as ex:
+            logging.exception(f"[{source}] feed entry error for {link}: {ex}")
+            continue
+        _feed_details[link_key(source, link)] = full_data
+        # Prefer detail page date, fallback to RSS date
+        item = build_item(source, title, link, full_data,
+                          {"date_posted": parse_date_safe(e["published"]),
+                           "excerpt": e["summary"][:site["rss_excerpt"]]})
+        items.append(item)
+        emit_item(item)
+    if items:
+        logging.info(f"[{source}] scraped {len(items)} items via RSS")
     return items
 
-# -------------------------
-# SCRAPER: scholarshipportal (international aggregator) - uses search RSS where possible
-# -------------------------
-def scrape_scholarshipportal(limit=MAX_PER_SITE):
-    source = "scholarshipportal.com"
-    base = "https://www.scholarshipportal.com/"
-    items = []
-    
-    # Try RSS feed first
-    feed_url = "https://www.scholarshipportal.com/rss"
-    try:
-        f = feedparser.parse(feed_url)
-        if f and f.entries:
-            for e in f.entries[:limit]:
-                title = e.get("title", "")[:240]
-                link = e.get("link", "")
-                date = parse_date_safe(e.get("published", e.get("updated", "")))
-                
-                # Attempt to fetch detail page for RSS items too
-                full_data = {}
-                if allowed_by_robots(link):
-                    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                    det_html = safe_get(link)
-                    if det_html:
-                        full_data = parse_detail_page_generic(det_html, link, source)
-                    else:
-                        logging.warning(f"[{source}] Failed to fetch detail page for {link} (from RSS)")
-                else:
-                    logging.info(f"[{source}] Detail page {link} (from RSS) blocked by robots.txt")
-
-                items.append({
-                    "id": make_id(source, title, link),
-                    "source": source,
-                    "title": title,
-                    "link": link,
-                    "date_posted": full_data.get("date_posted", date), # Prefer detail page date, fallback to RSS date
-                    "excerpt": full_data.get("excerpt", e.get("summary","")[:400]),
-                    "fullContent": full_data.get("fullContent", ""),
-                    "organizer": full_data.get("organizer", ""),
-                    "location": full_data.get("location", "")
-                })
-            logging.info(f"[{source}] scraped {len(items)} items via RSS")
-            return items
-    except Exception as e:
-        logging.warning(f"[{source}] feed error: {e}")
+def scrape_site(name, limit=None, max_pages=None):
+    """Scrape one source: its feed when it has a usable one, else its HTML listing pages.
 
-    # Fallback: do basic GET and try some selectors (best-effort)
-    html = safe_get(base)
-    if not html:
-        logging.warning(f"[{source}] Failed to fetch listing page: {base} (fallback)")
+    The feed only lists the newest posts, so the listing pages are crawled
+    as well when none of its items was known from the previous run (first
+    run, --full, or more new posts than the feed holds).
+    """
+    site = site_adapters.get_site(name)
+    limit = limit or site["limit"] or MAX_PER_SITE
+    max_pages = max_pages or site["max_pages"] or MAX_PAGES
+    if not site["rss"]:
+        return crawl_source(site, limit, max_pages)
+    items = read_feed(site, limit)
+    if items and any(it["id"] in _previous_items for it in items):
         return items
-    soup = BeautifulSoup(html, "html.parser")
-    # More robust selector for scholarshipportal.com
-    posts = soup.select(".search-result-item, .card, article, .item, .listing-item")
-    
-    if not posts:
-        logging.warning(f"[{source}] No specific post containers found on {base} (fallback). Trying more generic selectors.")
-        posts = soup.select("article, div.post, .entry-card") # Fallback to more generic
-        if not posts:
-            logging.warning(f"[{source}] No generic post containers found on {base} (fallback) either.")
-            return items
-
-    for p in posts[:limit]:
-        try:
-            a = p.select_one("h2 a, h3 a, .title a, a")
-            if not a or not a.get("href"):
-                logging.debug(f"[{source}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
-                continue
-            title = a.get_text(" ", strip=True)[:240]
-            link = urljoin(base, a.get("href"))
-            
-            # Fetch detail page for robust fields
-            full_data = {}
-            if allowed_by_robots(link):
-                time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-                det_html = safe_get(link)
-                if det_html:
-                    full_data = parse_detail_page_generic(det_html, link, source)
-                else:
-                    logging.warning(f"[{source}] Failed to fetch detail page for {link} (fallback)")
-            else:
-                logging.info(f"[{source}] Detail page {link} (fallback) blocked by robots.txt")
-
-            items.append({
-                "id": make_id(source, title, link),
-                "source": source,
-                "title": title,
-                "link": link,
-                "date_posted": full_data.get("date_posted", ""),
-                "excerpt": full_data.get("excerpt", ""),
-                "fullContent": full_data.get("fullContent", ""),
-                "organizer": full_data.get("organizer", ""),
-                "location": full_data.get("location", "")
-            })
-        except Exception as e:
-            logging.exception(f"[{source}] fallback error for {link}: {e}")
-    logging.info(f"[{source}] scraped {len(items)} items (fallback)")
-    return items
+    note = "(feed does not reach the previous run)" if items else "(fallback)"
+    return items + crawl_source(site, limit, max_pages, note)
 
 # -------------------------
 # Merge, dedupe, save
 # -------------------------
 def dedupe(items):
+    """First item of each id and of each link within a source (see link_key())."""
     seen = set()
     out = []
     for it in items:
-        if it["id"] in seen:
+        key = link_key(it.source, it.link)
+        if it.id in seen or key in seen:
             continue
-        seen.add(it["id"])
+        seen.update((it.id, key))
         out.append(it)
     return out
 
-def scrape_all():
-    all_items = []
-    try:
-        all_items.extend(scrape_beasiswa_id())
-    except Exception:
-        logging.exception("Error scraping beasiswa.id")
-    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-    try:
-        all_items.extend(scrape_indbeasiswa())
-    except Exception:
-        logging.exception("Error scraping indbeasiswa")
-    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-    try:
-        all_items.extend(scrape_luarkampus())
-    except Exception:
-        logging.exception("Error scraping luarkampus")
-    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
+# Scrapers run by scrape_all(), in output order
+SCRAPERS = [(name, functools.partial(scrape_site, name)) for name in site_adapters.site_names()]
+
+def sort_key(x):
+    # best-effort sort by date_posted (descending), else keep as scraped
+    return x.get("date_posted") or ""
+
+def _run_scrapers(timings, previous, sources=None):
+    global _previous_items
+    _previous_items = previous
+    _detail_counts.update(fetched=0, reused=0, unchanged=0, from_feed=0)
+    scrapers = SCRAPERS if sources is None else [(name, functools.partial(scrape_site, name)) for name in sources]
     try:
-        all_items.extend(scrape_schoters())
-    except Exception:
-        logging.exception("Error scraping schoters")
-    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
+        poll_feeds([name for name, _ in scrapers])
+        results, source_timings = run_sources(scrapers, max_workers=MAX_WORKERS)
+    finally:
+        if KEEP_FINGERPRINTS_OPEN:
+            get_fingerprints().flush()
+        else:
+            close_fingerprints()
+    timings.update(source_timings)
+    logging.info(f"Detail pages: {_detail_counts['fetched']} fetched, "
+                 f"{_detail_counts['from_feed']} taken from feeds "
+                 f"({_detail_counts['unchanged']} of these unchanged, not parsed again), "
+                 f"{_detail_counts['reused']} reused from previous run")
+    return results
+
+def scrape_sources(names, timings=None):
+    """Crawl just the sources `names` (also EXPORT_SITES entries) and return {name: items}; nothing is saved."""
+    return _run_scrapers({} if timings is None else timings, {}, names)
+
+def finish_run(count, output, timings):
+    """Log the HTTP and date stats and write the run report to REPORT_PATH."""
+    http = http_client.log_stats()
+    logging.info(f"Dates: {date_normalize.stats()}")
+    run_metrics.count("items", count)
+    run_metrics.count("details_fetched", _detail_counts["fetched"])
+    run_metrics.count("details_reused", _detail_counts["reused"])
+    run_metrics.count("details_unchanged", _detail_counts["unchanged"])
+    run_metrics.count("details_from_feed", _detail_counts["from_feed"])
+    run_metrics.write_report(REPORT_PATH, "scholarships", output=output, sources=timings,
+                             http={k: http[k] for k in ("requests", "connections", "reused", "cache")},
+                             rate_limits=rate_limiter.stats())
+
+def save_to_store(items):
+    """Sync the full raw output into the store; items it no longer has are removed there too."""
+    store = ItemStore(STORE_PATH)
     try:
-        all_items.extend(scrape_scholarshipportal())
-    except Exception:
-        logging.exception("Error scraping scholarshipportal")
-    # add other scrapers similarly...
+        changed, removed = store.sync(STORE_KIND, OUTPUT_RAW, items)
+    finally:
+        store.close()
+    logging.info(f"Item store: {changed} items new or changed, {removed} removed")
+    return changed
 
-    merged = dedupe(all_items)
-    # best-effort sort by date_posted (descending), else keep as scraped
-    def sort_key(x):
-        return x.get("date_posted") or ""
-    merged_sorted = sorted(merged, key=sort_key, reverse=True)
+def scrape_all(timings=None, incremental=INCREMENTAL, refresh_age_days=REFRESH_AGE_DAYS, sources=None,
+               previous=None):
+    """Run every scraper in parallel and save the merged result.
+
+    Pass a dict as `timings` to receive per-source wall-clock seconds. In
+    incremental mode only new or stale items have their detail page fetched,
+    and items from the previous output that were not listed this time are kept.
+    `sources` limits the run to those source names; with incremental mode
+    the other sources' items are carried over from the previous output.
+    A caller that keeps the returned items between runs passes them back as
+    `previous` ({id: RawScholarship}) instead of having OUTPUT_RAW read again.
+    Returns the saved items as RawScholarship records.
+    """
+    run_metrics.reset()
+    timings = {} if timings is None else timings
+    if not incremental:
+        previous = {}
+    elif previous is None:
+        previous = load_previous_items(OUTPUT_RAW, refresh_age_days)
+    else:
+        previous = use_previous_items(previous, refresh_age_days)
+    results = _run_scrapers(timings, previous, sources)
+    all_items = []
+    for name, _ in SCRAPERS:
+        all_items.extend(map(RawScholarship.from_dict, results.get(name, [])))
+    if incremental:
+        all_items.extend(previous.values())
+
+    with run_metrics.timer("dedupe"):
+        merged = dedupe(all_items)
+        merged_sorted = sorted(merged, key=lambda x: x.date_posted or "", reverse=True)  # as sort_key()
     # ensure data folder exists
-    import os
     os.makedirs("data", exist_ok=True)
-    with open(OUTPUT_RAW, "w", encoding="utf-8") as f:
-        json.dump(merged_sorted, f, ensure_ascii=False, indent=2)
-    logging.info(f"Saved total {len(merged_sorted)} items to {OUTPUT_RAW}")
+    with run_metrics.timer("write"):
+        write_json_array((it.to_dict() for it in merged_sorted), OUTPUT_RAW)
+        logging.info(f"Saved total {len(merged_sorted)} items to {OUTPUT_RAW}")
+        save_to_store(it.to_dict() for it in merged_sorted)
+    finish_run(len(merged_sorted), OUTPUT_RAW, timings)
     return merged_sorted
 
+def scrape_all_ndjson(timings=None, incremental=INCREMENTAL, refresh_age_days=REFRESH_AGE_DAYS):
+    """Like scrape_all(), but streams items to disk instead of holding them in memory.
+
+    Each item is appended to OUTPUT_NDJSON + ".part" as soon as it is parsed;
+    after a crash the next run continues that file. At the end, previous
+    items are merged in and the file is sorted into OUTPUT_NDJSON using a
+    (date, offset) index. Returns the number of items saved.
+    """
+    global _sink
+    run_metrics.reset()
+    timings = {} if timings is None else timings
+    part = OUTPUT_NDJSON + ".part"
+    previous = load_previous_items(OUTPUT_NDJSON, refresh_age_days, ndjson=True) if incremental else {}
+    _sink_seen.clear()
+    _sink_counts.clear()
+    if os.path.exists(part):
+        for it in iter_items(part):
+            _sink_seen.update((it.get("id"), link_key(it.get("source"), it.get("link"))))
+        logging.info(f"Continuing {part} with {len(_sink_seen)} items from an interrupted run")
+    _sink = NdjsonWriter(part, append=True)
+    try:
+        _run_scrapers(timings, previous)
+        if incremental:
+            for it in previous.values():
+                emit_item(it)
+    finally:
+        _sink.close()
+        _sink = None
+    for name, t in timings.items():
+        t["items"] = max(t["items"], _sink_counts.get(name, 0))
+    with run_metrics.timer("write"):
+        count = write_sorted(part, OUTPUT_NDJSON, sort_key, reverse=True)
+        os.remove(part)
+        logging.info(f"Saved total {count} items to {OUTPUT_NDJSON}")
+        save_to_store(iter_items(OUTPUT_NDJSON))
+    finish_run(count, OUTPUT_NDJSON, timings)
+    return count
+
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Scrape scholarship sites into " + OUTPUT_RAW)
+    ap.add_argument("--full", action="store_true", help="refetch every detail page (no incremental reuse)")
+    ap.add_argument("--refresh-days", type=float, default=REFRESH_AGE_DAYS,
+                    help="refetch known items older than this many days")
+    ap.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                    help="listing pages to follow per site")
+    ap.add_argument("--ndjson", action="store_true",
+                    help=f"stream items to {OUTPUT_NDJSON} instead of writing {OUTPUT_RAW}")
+    ap.add_argument("--prom-dir", default=run_metrics.PROM_TEXTFILE_DIR,
+                    help="also write the run report as a Prometheus textfile into this directory")
+    ap.add_argument("--archive", action="store_true",
+                    help=f"append every downloaded page to {html_archive.ARCHIVE_PATH} for reparse.py")
+    args = ap.parse_args()
+    MAX_PAGES = args.max_pages
+    html_archive.ARCHIVE_ENABLED = html_archive.ARCHIVE_ENABLED or args.archive
+    run_metrics.PROM_TEXTFILE_DIR = args.prom_dir
     start = datetime.utcnow().isoformat()
     logging.info("Scraper started")
-    items = scrape_all()
-    logging.info(f"Scraper finished, {len(items)} items")
-    print(f"Done. {len(items)} items saved to {OUTPUT_RAW}")
\ No newline at end of file
+    timings = {}
+    if args.ndjson:
+        count, output = scrape_all_ndjson(timings, not args.full, args.refresh_days), OUTPUT_NDJSON
+    else:
+        count, output = len(scrape_all(timings, not args.full, args.refresh_days)), OUTPUT_RAW
+    logging.info(f"Scraper finished, {count} items")
+    for name, t in timings.items():
+        status = f" (error: {t['error']})" if t["error"] else ""
+        print(f"  {name:<24} {t['items']:>4} items in {t['seconds']:>7.1f}s{status}")
+    print(f"Done. {count} items saved to {output} (run report: {REPORT_PATH})")
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Inverted search index and facet bitmaps for the exported JSON assets.
+
+Built by the combiners while they write scrapedScholarships.json /
+scrapedJobsFromDB.json and saved next to them, so the frontend can look up
+search terms and filter by facet instead of lowercasing every item's text on
+each render. Items are referred to by ordinal, their position in the
+exported array.
+
+Layout of the written file:
+
+    {"version": 1, "count": <items>,
+     "tokens": {"<token>": [first ordinal, gap, gap, ...], ...},   # sorted by token
+     "facets": {"<facet>": {"<value>": "<base64 bitmap>", ...}, ...}}
+
+Bit i of a bitmap (byte i // 8, bit i % 8, least significant first) is set
+when item i has that facet value.
+"""
+import base64
+import json
+import os
+import re
+
+# -------- CONFIG ----------
+MIN_TOKEN_LEN = 2
+STOPWORDS = frozenset("""
+dan di ke dari yang untuk dengan pada ini itu atau juga akan dalam adalah oleh sebagai bagi
+the and of to in for on with at by an is are be or as from this that
+""".split())
+# ---------------------------
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Distinct normalised search tokens of `text`."""
+    return {tok for tok in _TOKEN.findall((text or "").lower())
+            if len(tok) >= MIN_TOKEN_LEN and tok not in STOPWORDS}
+
+
+def _gaps(ordinals):
+    out, prev = [], 0
+    for n in ordinals:
+        out.append(n - prev)
+        prev = n
+    return out
+
+
+def _bitmap(ordinals, count):
+    bits = bytearray((count + 7) // 8)
+    for n in ordinals:
+        bits[n >> 3] |= 1 << (n & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+class SearchIndexBuilder:
+    """Feed items in export order with add(), then write().
+
+    `text_fn(item)` gives the searchable text; `facets` maps a facet name to
+    a function returning the item's value or list of values.
+    """
+
+    def __init__(self, text_fn, facets=None):
+        self.text_fn = text_fn
+        self.facets = facets or {}
+        self.count = 0
+        self._postings = {}
+        self._facets = {name: {} for name in self.facets}
+
+    def add(self, item):
+        n = self.count
+        self.count += 1
+        for tok in tokenize(self.text_fn(item)):
+            self._postings.setdefault(tok, []).append(n)
+        for name, fn in self.facets.items():
+            values = fn(item)
+            if isinstance(values, str):
+                values = [values]
+            for value in values or ():
+                if value:
+                    self._facets[name].setdefault(value, []).append(n)
+
+    def to_dict(self):
+        return {
+            "version": 1,
+            "count": self.count,
+            "tokens": {tok: _gaps(self._postings[tok]) for tok in sorted(self._postings)},
+            "facets": {name: {value: _bitmap(ordinals, self.count) for value, ordinals in sorted(values.items())}
+                       for name, values in self._facets.items()},
+        }
+
+    def write(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        return len(self._postings)
+
+
+def month_of(item):
+    """"YYYY-MM" of an ISO date_posted, or None."""
+    date = item.get("date_posted") or ""
+    return date[:7] if len(date) >= 7 and date[4] == "-" else None
@@ -0,0 +1,264 @@
+"""Site adapters: one declarative entry per scholarship source.
+
+Every source is described by its listing URL, CSS selectors and limits in
+SITES; the functions below turn a listing or detail page of any source into
+entries and text. scrape_scholarships_to_json.py crawls all of them through
+one engine (frontier, robots rules, shared HTTP client, parse pool). The
+standalone scrape_beasiswa_id.py / scrape_indbeasiswa.py crawl their own
+entries in EXPORT_SITES, which keep the selectors those scripts always had,
+through the same engine with export_site(). Adding a source means adding
+an entry.
+
+Keys of an entry (missing keys take the value from DEFAULTS):
+
+    name            source name, stored in every item
+    start_url       first listing page
+    posts           selector of the post containers on a listing page
+    fallback_posts  tried when `posts` matches nothing (None: no fallback)
+    link            selector of the title link inside a post
+    fallback_link   tried when `link` matches nothing in a post (None: no fallback)
+    require_href    skip posts whose link has no href
+    title_sep       separator for the link's text parts; title_max cuts the title
+    skip_titles     titles (case-insensitive) of promotional posts to drop
+    skip_links      substrings of links to drop
+    next            selector of the next listing page link
+    content         selector of the article body on a detail page
+    organizer       organizer used when the detail page names none (standalone export only)
+    rss             RSS/Atom feed, polled before the listing is crawled (see feed_ingest);
+                    rss_excerpt cuts an entry's summary
+    limit           entries used per listing page (None: the scraper's MAX_PER_SITE)
+    max_pages       listing pages followed (None: the scraper's MAX_PAGES)
+    export          detail pages are parsed with parse_detail() into frontend fields (EXPORT_SITES)
+"""
+import json
+import logging
+from urllib.parse import urljoin
+
+import http_client
+import run_metrics
+from date_normalize import parse_exact
+from field_extract import extract_fields, find_date
+from html_parsing import make_soup
+
+# -------- CONFIG ----------
+DEFAULTS = {
+    "start_url": None,
+    "posts": "article",
+    "fallback_posts": "article, div.post, .entry-card",
+    "link": "h2 a, h3 a, .entry-title a, .post-title a, a",
+    "fallback_link": None,
+    "require_href": False,
+    "title_sep": "",
+    "title_max": None,
+    "skip_titles": (),
+    "skip_links": (),
+    "next": "link[rel='next'], a[rel='next'], a.next.page-numbers, .pagination a.next, .nav-previous a",
+    "content": (".entry-content, .post-content, .content, .single-content, "
+                "div[itemprop='articleBody'], .td-post-content"),
+    "organizer": None,
+    "rss": None,
+    "rss_excerpt": 400,
+    "limit": None,
+    "max_pages": None,
+    "export": False,
+}
+
+SITES = [  # scrape_all() output order
+    {
+        "name": "beasiswa.id",
+        "start_url": "https://beasiswa.id/category/beasiswa/",
+        "rss": "https://beasiswa.id/category/beasiswa/feed/",
+        "posts": "article.jeg_post, div.jeg_post_wrapper, .td_module_wrap, .post-item, .jeg_post",
+        "link": "h3.jeg_post_title a, h2.entry-title a, h2 a, .td-module-title a, a",
+        "skip_titles": ("DAFTAR SEKARANG",),
+        "skip_links": ("kirimwa.id", "whatsapp"),
+    },
+    {
+        "name": "indbeasiswa.com",
+        "start_url": "https://indbeasiswa.com/beasiswa-s1/",
+        "rss": "https://indbeasiswa.com/beasiswa-s1/feed/",
+        "posts": "article.post-item, article.jeg_post, .jeg_post_wrapper, .post",
+        "link": "h2.post-title a, h3.jeg_post_title a, .entry-title a, h2 a, a",
+        "organizer": "Indbeasiswa.com",
+    },
+    {
+        "name": "luarkampus.id",
+        "start_url": "https://luarkampus.id/beasiswa/",
+        "posts": "div.elementor-posts-container article.elementor-post, article.post, .jeg_post_wrapper, .post-item",
+        "link": "h3.elementor-post__title a, h2.entry-title a, h2 a, a",
+    },
+    {
+        "name": "schoters.com",
+        "start_url": "https://www.schoters.com/id/beasiswa/",
+        "posts": ".jeg_post_wrapper, .post-item, article.post, .card, .elementor-post",
+        "link": "h2 a, h3 a, .title a, a",
+        "require_href": True,
+        "title_sep": " ",
+        "title_max": 240,
+    },
+    {
+        "name": "scholarshipportal.com",
+        "start_url": "https://www.scholarshipportal.com/",
+        "rss": "https://www.scholarshipportal.com/rss",
+        "posts": ".search-result-item, .card, article, .item, .listing-item",
+        "link": "h2 a, h3 a, .title a, a",
+        "require_href": True,
+        "title_sep": " ",
+        "title_max": 240,
+    },
+]
+
+EXPORT_SITES = [  # export_site() only; not crawled by scrape_all()
+    {
+        "name": "beasiswa_id",
+        "start_url": "https://beasiswa.id/category/beasiswa/",
+        "posts": "article.jeg_post, div.jeg_post_wrapper, div.jeg_postblock_content, .post, .listing, article",
+        "fallback_posts": None,
+        "link": "h2 a, h3 a, .entry-title a, .post-title a",
+        "fallback_link": "a",
+        "content": ".entry-content, .post-content, .content",
+        "limit": 100,  # every post of the first listing page
+        "max_pages": 1,
+        "export": True,
+    },
+    {
+        "name": "indbeasiswa",
+        "start_url": "https://indbeasiswa.com/beasiswa-s1/",
+        "posts": "article, .post, .loop-post, div.jeg_post, article.post-item, div.entry-card",
+        "fallback_posts": None,
+        "link": "h2 a, .jeg_post_title a, .entry-title a, .post-title a",
+        "fallback_link": "a",
+        "content": ".entry-content, .single-content, .post-content",
+        "organizer": "Indbeasiswa.com",
+        "limit": 50,  # to avoid excessive requests
+        "max_pages": 1,
+        "export": True,
+    },
+]
+# ---------------------------
+
+_SITES = {s["name"]: {**DEFAULTS, **s} for s in SITES + EXPORT_SITES}
+
+
+def site_names():
+    return [s["name"] for s in SITES]
+
+
+def get_site(name):
+    """The entry of source `name` with defaults filled in."""
+    return _SITES[name]
+
+
+def select_posts(site, soup, page_url):
+    posts = soup.select(site["posts"])
+    if not posts and site["fallback_posts"]:
+        logging.warning(f"[{site['name']}] No specific post containers found on {page_url}. Trying more generic selectors.")
+        posts = soup.select(site["fallback_posts"])
+        if not posts:
+            logging.warning(f"[{site['name']}] No generic post containers found on {page_url} either.")
+    return posts
+
+
+def list_entries(site, soup, page_url):
+    """(title, link) pairs of a listing page of `site`, in page order."""
+    entries = []
+    for p in select_posts(site, soup, page_url):
+        a = p.select_one(site["link"])
+        if not a and site["fallback_link"]:
+            a = p.select_one(site["fallback_link"])
+        if not a or (site["require_href"] and not a.get("href")):
+            logging.debug(f"[{site['name']}] Skipping post due to missing link or title in: {p.prettify()[:200]}")
+            continue
+        title = a.get_text(site["title_sep"], strip=True)[:site["title_max"]] or a.get("title", "").strip()
+        link = urljoin(page_url, a.get("href"))
+        if (title.upper() in {t.upper() for t in site["skip_titles"]}
+                or any(s in link.lower() for s in site["skip_links"])):
+            logging.debug(f"[{site['name']}] Skipping promotional post: {title} - {link}")
+            continue
+        entries.append((title, link))
+    return entries
+
+
+def next_page_url(site, soup, page_url):
+    el = soup.select_one(site["next"])
+    href = el.get("href") if el else None
+    return urljoin(page_url, href) if href else None
+
+
+def content_text(site, soup):
+    """Article body of a detail page as text, one block per line ("" if not found)."""
+    el = soup.select_one(site["content"])
+    return el.get_text(separator="\n", strip=True) if el else ""
+
+
+# -------------------------
+# Single listing page to a frontend JSON file (scrape_beasiswa_id.py, scrape_indbeasiswa.py)
+# -------------------------
+def parse_detail(site, html):
+    """fullContent, organizer, a "DD Month YYYY" date and location of a detail page."""
+    soup = make_soup(html)
+    full_content = content_text(site, soup)
+    with run_metrics.timer("extract"):
+        fields = extract_fields(full_content, organizer_labels=("penyelenggara", "organized by"))
+    organizer = fields["organizer"] if fields["organizer"] is not None else site["organizer"]
+
+    # explicit deadline phrase, else the page's <time datetime>, else any date in the text
+    parsed_date = parse_exact(fields["deadline"]) if fields["deadline"] else None
+    if not parsed_date:
+        time_el = soup.select_one("time[datetime]")
+        if time_el and time_el.has_attr("datetime"):
+            parsed_date = parse_exact(time_el["datetime"])
+    if not parsed_date:
+        parsed_date = find_date(full_content)
+    deadline_date = parsed_date.strftime("%d %B %Y") if parsed_date else "Tidak diketahui"
+
+    location = fields["location"] if fields["location"] is not None else "Tidak diketahui"
+    return {"fullContent": full_content, "organizer": organizer, "date": deadline_date, "location": location}
+
+
+def apply_detail(item, detail):
+    """Set the fields of a frontend item that come from its parse_detail() result."""
+    international = "luar negeri" in item["title"].lower() or "international" in detail["fullContent"].lower()
+    item.update(category="Internasional" if international else "Lokal", date=detail["date"],
+                location=detail["location"], fullContent=detail["fullContent"], organizer=detail["organizer"])
+    return item
+
+
+def export_site(name, output_file, id_prefix, report_path):
+    """Crawl the EXPORT_SITES entry `name` through the scraper's engine into `output_file`.
+
+    Items get ids `<id_prefix>_<n>` in listing order and the fields the
+    frontend reads (category, date, location, ...); entries whose detail
+    page could not be fetched are left out. Returns the number of items saved.
+    """
+    import scrape_scholarships_to_json as engine  # imported here: the engine imports this module
+
+    run_metrics.reset()
+    logging.info(f"Starting scholarship scraping from {name}")
+    crawled = engine.scrape_sources([name])[name]
+    out = []
+    for i, it in enumerate(crawled, 1):
+        if not it["fetched_at"]:
+            continue
+        detail = {"fullContent": it["fullContent"], "organizer": it["organizer"],
+                  "date": it["date_posted"], "location": it["location"]}
+        out.append(apply_detail({
+            "id": f"{id_prefix}_{i}",
+            "title": it["title"],
+            "description": "",
+            "category": "",
+            "date": "",
+            "location": "",
+            "link": it["link"],
+            "fullContent": "",
+            "organizer": None
+        }, detail))
+
+    with run_metrics.timer("write"):
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+    http_client.log_stats()
+    run_metrics.count("items", len(out))
+    run_metrics.write_report(report_path, id_prefix, output=output_file)
+    logging.info(f"✅ Saved {len(out)} scholarships to {output_file}")
+    return len(out)
@@ -0,0 +1,140 @@
+"""Sharded static export: a slim list manifest plus detail shards loaded on demand.
+
+For a collection such as "scholarships" this writes, under public/data/<name>/:
+
+    <name>.manifest.json            tiny pointer, never cached: {"manifest": "<name>.<hash>.json"}
+    <name>.<hash>.json              list manifest: id, the list fields (title, date, source,
+                                    tags, ...) and the shard holding the full record, per item
+    <name>.shard-<n>.<hash>.json    {"items": {"<id>": <full item>, ...}}
+
+Manifest and shards are named after a hash of their content, so they can be
+cached forever; a file only gets a new name when its content changes. Items
+are assigned to shards by a hash of their id, so one new or edited item only
+renames the shard it lands in (and the manifest). Files of the previous
+export are kept for clients that are still loading it; older ones are removed.
+
+    python static_export.py src/data/scrapedNewsAndTips.json news
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+
+# -------- CONFIG ----------
+PUBLIC_DIR = "public/data"
+SHARD_SIZE = 50  # target items per detail shard
+LIST_FIELDS = ("title", "date_posted", "date", "source")  # copied into the manifest when present
+HASH_LEN = 12
+# ---------------------------
+
+
+def shard_count(count, shard_size=SHARD_SIZE):
+    """Power of two, so the shard of most items stays put as the collection grows."""
+    n = 1
+    while n * shard_size < count:
+        n *= 2
+    return n
+
+
+def _write_hashed(folder, prefix, data):
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    name = f"{prefix}.{hashlib.sha256(body).hexdigest()[:HASH_LEN]}.json"
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    return name
+
+
+def _previous_files(folder, name):
+    """Files of the export the pointer currently names; kept so clients mid-load still find them."""
+    try:
+        with open(os.path.join(folder, f"{name}.manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)["manifest"]
+        with open(os.path.join(folder, manifest), "r", encoding="utf-8") as f:
+            return {manifest, *json.load(f)["shards"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return set()
+
+
+class StaticExport:
+    """Feed items in list order with add(), then close() to write the files.
+
+    Full items are spilled to a temporary NDJSON file as they come in, so
+    only the manifest entries stay in memory.
+    """
+
+    def __init__(self, name, list_fields=LIST_FIELDS, out_dir=PUBLIC_DIR, shard_size=SHARD_SIZE):
+        self.name = name
+        self.list_fields = list_fields
+        self.shard_size = shard_size
+        self.folder = os.path.join(out_dir, name)
+        os.makedirs(self.folder, exist_ok=True)
+        self._entries = []
+        self._spill = tempfile.TemporaryFile(dir=self.folder)
+        self._where = []  # (crc32 of id, offset in the spill file) per item
+
+    def add(self, item):
+        entry = {"id": item["id"]}
+        entry.update((k, item[k]) for k in self.list_fields if k in item)
+        self._entries.append(entry)
+        self._where.append((zlib.crc32(str(item["id"]).encode("utf-8")), self._spill.tell()))
+        self._spill.write(json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def close(self):
+        """Write shards, manifest and pointer, remove stale files; returns the manifest file name."""
+        shards = shard_count(len(self._entries), self.shard_size)
+        members = [[] for _ in range(shards)]
+        for entry, (crc, offset) in zip(self._entries, self._where):
+            entry["shard"] = crc % shards
+            members[crc % shards].append(offset)
+        shard_files = []
+        for n, offsets in enumerate(members):
+            records = []
+            for offset in offsets:
+                self._spill.seek(offset)
+                records.append(json.loads(self._spill.readline()))
+            # sorted by id so the file (and its hash) does not depend on list order
+            records.sort(key=lambda it: str(it["id"]))
+            shard_files.append(_write_hashed(self.folder, f"{self.name}.shard-{n}",
+                                             {"items": {it["id"]: it for it in records}}))
+        self._spill.close()
+
+        manifest = _write_hashed(self.folder, self.name, {"version": 1, "count": len(self._entries),
+                                                          "shards": shard_files, "items": self._entries})
+        keep = set(shard_files) | {manifest, f"{self.name}.manifest.json"} | _previous_files(self.folder, self.name)
+        pointer = os.path.join(self.folder, f"{self.name}.manifest.json")
+        with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"manifest": manifest}, f)
+        os.replace(pointer + ".tmp", pointer)
+        for old in os.listdir(self.folder):
+            if old.startswith(self.name + ".") and old.endswith(".json") and old not in keep:
+                os.remove(os.path.join(self.folder, old))
+        logging.info(f"Static export {self.name}: {len(self._entries)} items, {shards} shards, manifest {manifest}")
+        return manifest
+
+
+def export_sharded(items, name, list_fields=LIST_FIELDS, out_dir=PUBLIC_DIR):
+    export = StaticExport(name, list_fields, out_dir)
+    for it in items:
+        export.add(it)
+    return export.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ap = argparse.ArgumentParser(description="Export a JSON array of items as a manifest plus detail shards")
+    ap.add_argument("source", help="JSON file with a list of items that have an id")
+    ap.add_argument("name", help=f"collection name, written to {PUBLIC_DIR}/<name>/")
+    ap.add_argument("--fields", nargs="*", default=list(LIST_FIELDS) + ["category"],
+                    help="item keys to copy into the manifest")
+    args = ap.parse_args()
+    with open(args.source, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    export_sharded(data, args.name, args.fields)
+    print(f"Done. {len(data)} items exported to {os.path.join(PUBLIC_DIR, args.name)}")
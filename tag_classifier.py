@@ -0,0 +1,74 @@
+"""Keyword-table classifier for scholarship degree levels and funding types.
+
+Each tag is defined by a list of literal keywords. A tag matches when one of
+its keywords occurs in the lowercased title + excerpt + content; degree
+levels must also match as whole words (like the old `\\b(...)\\b` patterns).
+Keywords are located with plain substring search and only confirmed with a
+precompiled regex starting at the first occurrence, which is far cheaper on
+long articles than running one regex per tag over the whole text.
+"""
+import re
+
+DEGREE_LEVEL_KEYWORDS = [
+    ("SMP", ["smp", "mts", "kelas 7", "kelas 8", "kelas 9"]),
+    ("SMA", ["sma", "smk", "sederajat", "kelas 10", "kelas 11", "kelas 12"]),
+    ("D2", ["d2", "diploma 2"]),
+    ("D3", ["d3", "diploma 3"]),
+    ("D4", ["d4", "diploma 4"]),
+    ("S1", ["s1", "sarjana", "undergraduate", "bachelor"]),
+    ("S2", ["s2", "master", "postgraduate", "magister"]),
+    ("S3", ["s3", "phd", "doctor", "doktor"]),
+    ("Non-Degree", ["non-degree", "kursus", "pelatihan singkat"]),
+    ("Gap Year", ["gap year"]),
+    ("Profesi", ["profesi", "guru", "dokter", "akuntan"]),
+]
+FUNDING_TYPE_KEYWORDS = [
+    ("Fully Funded", ["fully funded", "fully-funded", "full scholarship", "full-scholarship",
+                      "fullscholarship", "dibiayai penuh", "beasiswa penuh", "100%"]),
+    ("Partially Funded", ["partially funded", "sebagian", "potongan biaya", "bantuan dana"]),
+    ("Mentoring", ["mentoring", "pembinaan", "bimbingan"]),
+    ("Riset", ["riset", "penelitian"]),
+    ("Exchange", ["exchange", "pertukaran pelajar"]),
+    ("Pelatihan/Studi Singkat", ["pelatihan", "studi singkat", "kursus", "program singkat"]),
+    ("Self Funded", ["self funded", "dana mandiri"]),
+    ("Pendanaan Project", ["pendanaan proyek", "dana proyek"]),
+    ("Internship", ["magang", "internship"]),
+]
+DEFAULT_LEVEL = "All"
+DEFAULT_TYPE = "Other"
+
+
+def _compile(table, whole_word):
+    rules = []
+    for tag, keywords in table:
+        pattern = None
+        if whole_word:
+            pattern = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, keywords)))
+        rules.append((tag, keywords, pattern))
+    return rules
+
+
+_LEVEL_RULES = _compile(DEGREE_LEVEL_KEYWORDS, whole_word=True)
+_TYPE_RULES = _compile(FUNDING_TYPE_KEYWORDS, whole_word=False)
+
+
+def _tags(txt, rules):
+    tags = []
+    for tag, keywords, pattern in rules:
+        first = -1
+        for keyword in keywords:
+            pos = txt.find(keyword)
+            if pos != -1 and (first == -1 or pos < first):
+                first = pos
+        if first == -1:
+            continue
+        if pattern is None or pattern.search(txt, first):
+            tags.append(tag)
+    return tags
+
+
+def classify_text(txt):
+    """(degreeLevels, fundingTypes) for already lowercased text."""
+    return (_tags(txt, _LEVEL_RULES) or [DEFAULT_LEVEL],
+            _tags(txt, _TYPE_RULES) or [DEFAULT_TYPE])
+
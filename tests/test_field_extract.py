@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+from field_extract import (DEADLINE_LABELS, LOCATION_LABELS, ORGANIZER_LABELS, extract_fields, find_date,
+                           guess_location, scan_labels)
+
+
+@pytest.mark.parametrize("label", ORGANIZER_LABELS)
+def test_organizer_labels(label):
+    assert extract_fields(f"Info beasiswa\n{label}: Kemendikbud\nLainnya")["organizer"] == "Kemendikbud"
+
+
+@pytest.mark.parametrize("label", DEADLINE_LABELS)
+def test_deadline_labels(label):
+    assert extract_fields(f"Info beasiswa\n{label}: 12 Mei 2025\nLainnya")["deadline"] == "12 Mei 2025"
+
+
+@pytest.mark.parametrize("label", LOCATION_LABELS)
+def test_location_labels(label):
+    assert extract_fields(f"Info beasiswa\n{label}: Malang\nLainnya")["location"] == "Malang"
+
+
+@pytest.mark.parametrize("text", ["PENYELENGGARA: LPDP", "Penyelenggara: LPDP", "ORGANIZED BY: LPDP"])
+def test_labels_are_case_insensitive(text):
+    assert extract_fields(text)["organizer"] == "LPDP"
+
+
+def test_deadline_formats():
+    assert scan_labels("Deadline: 2025-05-12")["deadline"] == "2025-05-12"
+    assert scan_labels("Deadline: 12/05/2025")["deadline"] == "12/05/2025"
+
+
+def test_non_date_deadline_falls_through_to_a_later_label():
+    text = "Deadline: segera, kuota terbatas\nPendaftaran hingga: 30 Juni 2025"
+    assert extract_fields(text)["deadline"] == "30 Juni 2025"
+
+
+def test_non_date_deadline_without_a_later_label():
+    assert extract_fields("Deadline: segera")["deadline"] is None
+
+
+def test_first_label_of_a_field_wins():
+    fields = extract_fields("Penyelenggara: LPDP\nOleh: Admin\nLokasi: Bandung\nKota: Jakarta")
+    assert fields["organizer"] == "LPDP"
+    assert fields["location"] == "Bandung"
+
+
+def test_empty_location_line_takes_the_next_line():
+    # like the original "Lokasi:\s*(.*?)" pattern, whitespace after the colon includes newlines
+    assert extract_fields("Lokasi:\nSurabaya\nLainnya")["location"] == "Surabaya"
+
+
+def test_empty_location_at_the_end_is_empty_not_guessed():
+    fields = extract_fields("Kegiatan online untuk pelajar Jakarta\nLokasi:")
+    assert fields["location"] == ""
+
+
+def test_missing_fields_are_none():
+    assert extract_fields("Tidak ada informasi di sini") == {"organizer": None, "deadline": None, "location": None}
+
+
+def test_organizer_labels_can_be_restricted():
+    assert extract_fields("Oleh: Admin", organizer_labels=("penyelenggara",))["organizer"] is None
+
+
+@pytest.mark.parametrize("text, location", [
+    ("Kelas online dan remote di Indonesia, Jakarta", "Online"),
+    ("Bisa dikerjakan dari rumah di seluruh Indonesia, Jakarta", "Remote"),
+    ("Terbuka untuk pelajar Indonesia di Bandung", "Indonesia"),
+    ("Kuliah di luar negeri, tes di Jakarta", "Internasional"),
+    ("Tes tertulis di Bandung lalu Jakarta", "Jakarta"),
+    ("Tes tertulis di Bandung", "Bandung"),
+    ("Daring melalui Zoom", "Online"),
+    ("Tidak ada petunjuk", None),
+])
+def test_location_fallback_order(text, location):
+    assert guess_location(text) == location
+    assert extract_fields(text)["location"] == location
+
+
+def test_find_date():
+    assert find_date("Ditutup 12 Mei 2025, info: 2025-01-01") == date(2025, 5, 12)
+    assert find_date("Ditutup 2025-01-01") == date(2025, 1, 1)
+    assert find_date("Tanpa tanggal") is None
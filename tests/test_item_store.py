@@ -0,0 +1,65 @@
+from item_store import ItemStore
+
+
+def job(id, date_posted="2025-01-01", title="Backend Engineer"):
+    return {"id": id, "source": "jobstreet", "title": title, "date_posted": date_posted}
+
+
+def test_sync_removes_jobs_missing_from_the_input(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    assert store.sync("job", "jobs.db", [job("1"), job("2")]) == (2, 0)
+    store.export_json("jobs", "job", str(tmp_path / "jobs.json"))
+    assert store.pending("jobs", "job") == 0
+
+    assert store.sync("job", "jobs.db", [job("1")]) == (0, 1)
+    assert store.pending("jobs", "job") == 1
+    assert [j["id"] for j in store.iter_items("job")] == ["1"]
+    assert store.get("job", "2") is None
+    assert store.export_json("jobs", "job", str(tmp_path / "jobs.json")) == 0
+
+
+def test_sync_leaves_other_origins_alone(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    store.sync("job", "jobs.db", [job("1")])
+    store.sync("job", "jobs_lokerid.db", [job("lokerid_1")])
+    assert store.sync("job", "jobs.db", []) == (0, 1)
+    assert [j["id"] for j in store.iter_items("job")] == ["lokerid_1"]
+
+
+def test_removed_job_comes_back_when_seen_again(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    store.sync("job", "jobs.db", [job("1")])
+    store.sync("job", "jobs.db", [])
+    assert store.sync("job", "jobs.db", [job("1")]) == (1, 0)
+    assert store.count("job") == 1
+
+
+def test_iter_items_pages_in_order(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    jobs = [job(f"{i:03d}", f"2025-01-{i % 7 + 1:02d}") for i in range(50)]
+    store.upsert_many("job", jobs)
+    expected = sorted(jobs, key=lambda j: j["id"])
+    expected.sort(key=lambda j: j["date_posted"], reverse=True)
+    assert list(store.iter_items("job", batch=4)) == expected
+
+
+def test_changes_report_removed_ids(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    store.sync("scholarship_raw", "beasiswa_all.json", [job("1"), job("2")])
+    changed, removed, rev = store.changes("combine", "scholarship_raw")
+    assert [j["id"] for j in changed] == ["1", "2"] and removed == []
+    store.mark_exported("combine", rev)
+
+    store.sync("scholarship_raw", "beasiswa_all.json", [job("1", title="Data Engineer")])
+    changed, removed, rev = store.changes("combine", "scholarship_raw")
+    assert [j["title"] for j in changed] == ["Data Engineer"] and removed == ["2"]
+
+
+def test_remove(tmp_path):
+    store = ItemStore(str(tmp_path / "items.db"))
+    store.upsert_many("scholarship", [job("1"), job("2")])
+    store.mark_exported("out", store.changes("out", "scholarship")[2])
+    assert store.remove("scholarship", ["2", "3"]) == 1
+    assert store.remove("scholarship", ["2"]) == 0
+    assert store.pending("out", "scholarship") == 1
+    assert [j["id"] for j in store.iter_items("scholarship")] == ["1"]
@@ -0,0 +1,40 @@
+from combine_scraped_jobs import job_clusters
+from near_duplicates import duplicate_ids
+
+
+def job(id, source, title, company="PT Maju Jaya", location="Jakarta"):
+    return {"id": id, "source": source, "title": title, "company": company, "location": location}
+
+
+def dropped(*jobs):
+    return duplicate_ids(job_clusters(jobs))
+
+
+def test_same_opening_on_two_boards_is_dropped_once():
+    assert dropped(job("a", "jobstreet", "Backend Engineer"),
+                   job("b", "loker.id", "Backend Engineer ")) == {"b"}
+
+
+def test_normalized_company_and_location_still_match():
+    assert dropped(job("a", "jobstreet", "Backend Engineer", "PT. Maju Jaya", "Jakarta"),
+                   job("b", "loker.id", "Backend Engineer", "pt maju jaya", "JAKARTA")) == {"b"}
+
+
+def test_other_district_is_a_separate_opening():
+    assert dropped(job("a", "jobstreet", "Backend Engineer", location="Jakarta Utara"),
+                   job("b", "loker.id", "Backend Engineer", location="Jakarta Selatan")) == set()
+
+
+def test_other_city_is_a_separate_opening():
+    assert dropped(job("a", "jobstreet", "Backend Engineer", location="Jakarta"),
+                   job("b", "loker.id", "Backend Engineer", location="Bandung")) == set()
+
+
+def test_other_seniority_is_a_separate_opening():
+    assert dropped(job("a", "jobstreet", "Senior Backend Engineer"),
+                   job("b", "loker.id", "Junior Backend Engineer")) == set()
+
+
+def test_same_source_postings_are_kept():
+    assert dropped(job("a", "jobstreet", "Backend Engineer"),
+                   job("b", "jobstreet", "Backend Engineer")) == set()
@@ -0,0 +1,25 @@
+from records import RawScholarship
+from scrape_scholarships_to_json import dedupe, link_key, make_id
+
+
+def item(title, link, source="beasiswa.id"):
+    return RawScholarship.from_dict({"id": make_id(source, title, link), "source": source,
+                                     "title": title, "link": link})
+
+
+def test_link_key_ignores_host_case_trailing_slash_and_fragment():
+    assert (link_key("beasiswa.id", "https://Beasiswa.ID/post-1/#respond")
+            == link_key("beasiswa.id", " https://beasiswa.id/post-1"))
+    assert link_key("beasiswa.id", "https://beasiswa.id/post-1?p=2") != link_key("beasiswa.id", "https://beasiswa.id/post-1")
+
+
+def test_feed_and_listing_copies_of_a_post_are_merged():
+    feed = item("Beasiswa LPDP 2025 &amp; Syaratnya", "https://beasiswa.id/lpdp/")
+    listing = item("Beasiswa LPDP 2025 & Syaratnya", "https://beasiswa.id/lpdp")
+    assert dedupe([feed, listing]) == [feed]
+
+
+def test_same_link_on_another_source_is_kept():
+    a = item("Beasiswa LPDP", "https://example.com/lpdp", source="beasiswa.id")
+    b = item("Beasiswa LPDP", "https://example.com/lpdp", source="indbeasiswa.com")
+    assert dedupe([a, b]) == [a, b]